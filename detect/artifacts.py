@@ -0,0 +1,185 @@
+import hashlib
+import os
+import threading
+import pandas as pd
+from detect.batching import MicroBatcher
+
+MODEL_PATH = './detect/res/best_model.h5'
+TOKENIZER_PATH = './detect/res/tokenizer.pkl'
+ENCODER_PATH = './detect/res/label_encoder.pkl'
+NUMPY_MODEL_PATH = './detect/res/header_classifier.npz'
+NGRAM_MODEL_PATH = './detect/res/ngram_classifier.npz'
+
+MAX_LEN = 20
+
+# Реестр загруженных артефактов на весь процесс: {ключ: artifacts}
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _artifact_key(backend, *paths):
+    """Ключ реестра: бэкенд, абсолютные пути файлов и время их изменения"""
+    return (backend,) + tuple((os.path.abspath(path), os.path.getmtime(path)) for path in paths)
+
+
+def _get_or_load(key, loader):
+    """Возвращает артефакты из реестра, при необходимости загружая их"""
+    artifacts = _registry.get(key)
+    if artifacts is not None:
+        return artifacts
+
+    with _registry_lock:
+        artifacts = _registry.get(key)
+        if artifacts is None:
+            artifacts = loader()
+            # Заголовки параллельных запросов объединяются в общие вызовы модели
+            artifacts['batcher'] = MicroBatcher(artifacts['predict_proba'])
+
+            # Убираем устаревшие версии артефактов с теми же путями
+            paths = [path for path, _ in key[1:]]
+            for old_key in [k for k in _registry if k[0] == key[0] and [path for path, _ in k[1:]] == paths]:
+                del _registry[old_key]
+
+            _registry[key] = artifacts
+
+    return artifacts
+
+
+def _load_keras_artifacts(model_path, tokenizer_path, encoder_path):
+    """Загрузка артефактов Keras-модели с диска"""
+    from tensorflow.keras.models import load_model
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+    model = load_model(model_path)
+    tokenizer = pd.read_pickle(tokenizer_path)
+    encoder = pd.read_pickle(encoder_path)
+
+    def predict_proba(names):
+        seq = tokenizer.texts_to_sequences(names)
+        pad = pad_sequences(seq, maxlen=MAX_LEN)
+        return model.predict(pad, batch_size=max(len(names), 32), verbose=0)
+
+    return {
+        'backend': 'keras',
+        'model': model,
+        'tokenizer': tokenizer,
+        'encoder': encoder,
+        'classes': encoder.classes_,
+        'predict_proba': predict_proba
+    }
+
+
+def _load_numpy_artifacts(numpy_path):
+    """Загрузка NumPy-версии модели, выгруженной detect.numpy_model"""
+    from detect.numpy_model import NumpyHeaderClassifier
+
+    engine = NumpyHeaderClassifier.load(numpy_path)
+    return {
+        'backend': 'numpy',
+        'engine': engine,
+        'classes': engine.classes_,
+        'predict_proba': engine.predict_proba
+    }
+
+
+def _load_ngram_artifacts(ngram_path):
+    """Загрузка классификатора на символьных n-граммах (detect.ngram_model)"""
+    from detect.ngram_model import NgramHeaderClassifier
+
+    engine = NgramHeaderClassifier.load(ngram_path)
+    return {
+        'backend': 'ngram',
+        'engine': engine,
+        'classes': engine.classes_,
+        'predict_proba': engine.predict_proba
+    }
+
+
+def _numpy_export_is_fresh(numpy_path, model_path, tokenizer_path=TOKENIZER_PATH, encoder_path=ENCODER_PATH):
+    """
+    Выгрузка .npz есть и сделана из текущих модели, токенизатора и кодировщика меток.
+
+    Сравнивается отпечаток содержимого, записанный при выгрузке: время изменения
+    файлов после git clone или COPY в образ ничего не говорит о порядке их создания.
+    У выгрузок без отпечатка сравнивается время изменения со всеми тремя файлами.
+    """
+    if not os.path.exists(numpy_path):
+        return False
+    sources = [path for path in (model_path, tokenizer_path, encoder_path) if os.path.exists(path)]
+    if len(sources) < 3:
+        return True
+
+    from detect.numpy_model import source_digest, stored_digest
+
+    digest = stored_digest(numpy_path)
+    if digest is not None:
+        return digest == source_digest(*sources)
+    return all(os.path.getmtime(numpy_path) >= os.path.getmtime(path) for path in sources)
+
+
+def resolve_backend(backend='auto', model_path=MODEL_PATH, numpy_path=NUMPY_MODEL_PATH,
+                    tokenizer_path=TOKENIZER_PATH, encoder_path=ENCODER_PATH):
+    """Бэкенд, который будет загружен: 'auto' заменяется на 'numpy' или 'keras'"""
+    if backend == 'auto':
+        fresh = _numpy_export_is_fresh(numpy_path, model_path, tokenizer_path, encoder_path)
+        return 'numpy' if fresh else 'keras'
+    return backend
+
+
+def _resolve(model_path, tokenizer_path, encoder_path, numpy_path, backend, ngram_path=NGRAM_MODEL_PATH):
+    """Ключ реестра и функция загрузки для выбранного бэкенда"""
+    backend = resolve_backend(backend, model_path, numpy_path, tokenizer_path, encoder_path)
+
+    if backend == 'numpy':
+        return (_artifact_key('numpy', numpy_path),
+                lambda: _load_numpy_artifacts(numpy_path))
+    if backend == 'keras':
+        return (_artifact_key('keras', model_path, tokenizer_path, encoder_path),
+                lambda: _load_keras_artifacts(model_path, tokenizer_path, encoder_path))
+    if backend == 'ngram':
+        return (_artifact_key('ngram', ngram_path),
+                lambda: _load_ngram_artifacts(ngram_path))
+
+    raise ValueError(f"Неизвестный бэкенд модели: {backend}")
+
+
+def get_model_artifacts(model_path=MODEL_PATH, tokenizer_path=TOKENIZER_PATH, encoder_path=ENCODER_PATH,
+                        numpy_path=NUMPY_MODEL_PATH, backend='auto', ngram_path=NGRAM_MODEL_PATH):
+    """
+    Возвращает артефакты модели из реестра процесса.
+
+    Артефакты загружаются один раз и отдаются всем запросам. Если файлы модели
+    изменились на диске, артефакты перезагружаются.
+
+    backend:
+      'auto'  - NumPy-движок, если есть актуальная выгрузка .npz, иначе Keras
+      'numpy' - прямой проход на NumPy без TensorFlow
+      'keras' - исходная Keras-модель
+      'ngram' - линейный классификатор на символьных n-граммах (scikit-learn)
+    """
+    key, loader = _resolve(model_path, tokenizer_path, encoder_path, numpy_path, backend, ngram_path)
+    return _get_or_load(key, loader)
+
+
+def artifacts_fingerprint(model_path=MODEL_PATH, tokenizer_path=TOKENIZER_PATH, encoder_path=ENCODER_PATH,
+                          numpy_path=NUMPY_MODEL_PATH, backend='auto', ngram_path=NGRAM_MODEL_PATH):
+    """Отпечаток артефактов модели без их загрузки (меняется вместе с файлами модели)"""
+    key, _ = _resolve(model_path, tokenizer_path, encoder_path, numpy_path, backend, ngram_path)
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+
+def warm_up(model_path=MODEL_PATH, tokenizer_path=TOKENIZER_PATH, encoder_path=ENCODER_PATH,
+            numpy_path=NUMPY_MODEL_PATH, backend='auto', ngram_path=NGRAM_MODEL_PATH):
+    """Предзагрузка артефактов при старте сервера (вызывается из serv/app.py)"""
+    artifacts = get_model_artifacts(model_path, tokenizer_path, encoder_path, numpy_path, backend, ngram_path)
+
+    # Пробный прогон, чтобы модель собрала граф предсказания до первого запроса
+    artifacts['predict_proba'](['warm_up'])
+
+    return artifacts
+
+
+def clear_registry():
+    """Очистка реестра артефактов"""
+    with _registry_lock:
+        _registry.clear()
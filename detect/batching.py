@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+# Сколько ждать заголовки других запросов, прежде чем вызвать модель
+MAX_WAIT_MS = 5
+# Предел числа заголовков в одном вызове модели
+MAX_BATCH = 512
+
+
+class MicroBatcher:
+    """
+    Общая очередь предсказаний для параллельных запросов.
+
+    Вызовы predict_proba из разных потоков складываются в очередь. Фоновый
+    поток забирает первый запрос и до max_wait_ms собирает остальные, затем
+    вызывает модель один раз на все заголовки и раздаёт каждому запросу его
+    строки вероятностей.
+
+    Если в этот момент модель ждёт только один запрос, он выполняется сразу
+    без ожидания, поэтому одиночный запрос не получает дополнительной задержки.
+    """
+
+    def __init__(self, predict_proba, max_wait_ms=MAX_WAIT_MS, max_batch=MAX_BATCH):
+        self._predict_proba = predict_proba
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+
+        self._queue = queue.Queue()
+        # Число запросов, которым ещё не выдан результат (уменьшает фоновый поток)
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name='header-batcher', daemon=True)
+                    self._worker.start()
+
+    def predict_proba(self, names):
+        """Вероятности классов для списка заголовков (блокирует до готовности пакета)"""
+        names = list(names)
+        if not names:
+            return self._predict_proba(names)
+
+        future = Future()
+        with self._active_lock:
+            self._active += 1
+        try:
+            self._ensure_worker()
+            self._queue.put((names, future))
+        except BaseException:
+            with self._active_lock:
+                self._active -= 1
+            raise
+        return future.result()
+
+    def _finish(self, batch):
+        """Запросы пакета больше не ждут результата: _collect не должен их учитывать"""
+        with self._active_lock:
+            self._active -= len(batch)
+
+    def _collect(self):
+        """Первый запрос из очереди и все, что успели прийти за max_wait"""
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch:
+            # Ждать имеет смысл, только если есть другие вызывающие потоки
+            with self._active_lock:
+                others_active = self._active > len(batch)
+            timeout = deadline - time.monotonic()
+            if not others_active or timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            names = [name for item_names, _ in batch for name in item_names]
+            try:
+                proba = np.asarray(self._predict_proba(names))
+            except Exception as e:
+                self._finish(batch)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self._finish(batch)
+            start = 0
+            for item_names, future in batch:
+                future.set_result(proba[start:start + len(item_names)])
+                start += len(item_names)
@@ -0,0 +1,179 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+from detect.artifacts import get_model_artifacts
+from detect.ngram_model import DATASET_PATH, split_dataset
+from detect.test_cases import UNDEFINED, labeled_test_cases
+
+REPORT_PATH = './detect/res/benchmark.json'
+# Краткая таблица сравнения бэкендов
+TABLE_PATH = './detect/res/backend_comparison.txt'
+BACKENDS = ('keras', 'numpy', 'ngram')
+# Порог уверенности, как в detect.detect_columns
+CONFIDENCE_THRESHOLD = 0.6
+# Размеры пакетов для замера задержки
+BATCH_SIZES = (1, 16, 128, 1024)
+# Повторы замера задержки одного пакета
+REPEATS = 30
+
+_COLD_LOAD_CODE = """
+import time
+start = time.perf_counter()
+from detect.artifacts import get_model_artifacts
+get_model_artifacts(backend={backend!r})['predict_proba'](['warm_up'])
+print(time.perf_counter() - start)
+"""
+
+
+def _timings(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+
+def _latency(timings):
+    return {
+        'median_ms': round(float(np.median(timings)) * 1000, 3),
+        'p95_ms': round(float(np.percentile(timings, 95)) * 1000, 3),
+        'min_ms': round(float(timings.min()) * 1000, 3)
+    }
+
+
+def measure_cold_load(backend):
+    """
+    Время холодного старта бэкенда в отдельном процессе: импорты, загрузка
+    артефактов и первое предсказание. В текущем процессе артефакты уже
+    могут лежать в реестре, поэтому замер здесь был бы неверным.
+    """
+    result = subprocess.run([sys.executable, '-c', _COLD_LOAD_CODE.format(backend=backend)],
+                            capture_output=True, text=True, cwd=os.getcwd())
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode)
+    return round(float(result.stdout.strip().splitlines()[-1]), 3)
+
+
+def predict_labels(artifacts, names, confidence_threshold=CONFIDENCE_THRESHOLD):
+    """Тип и уверенность для списка заголовков одним вызовом модели"""
+    proba = np.asarray(artifacts['predict_proba'](list(names)))
+    labels = np.asarray(artifacts['classes'])[np.argmax(proba, axis=1)].astype(object)
+    confidence = proba.max(axis=1)
+    if confidence_threshold:
+        labels[confidence < confidence_threshold] = UNDEFINED
+    return labels, confidence
+
+
+def benchmark_backend(backend, test_names, test_labels, repeats=REPEATS, batch_sizes=BATCH_SIZES,
+                      confidence_threshold=CONFIDENCE_THRESHOLD, cold=True):
+    """Скорость и качество одного бэкенда; None, если бэкенд недоступен"""
+    try:
+        cold_load = measure_cold_load(backend) if cold else None
+        start = time.perf_counter()
+        artifacts = get_model_artifacts(backend=backend)
+        load_time = time.perf_counter() - start
+    except Exception as e:
+        print(f"Бэкенд {backend} недоступен: {e}")
+        return None
+
+    predict_proba = artifacts['predict_proba']
+    predict_proba(test_names[:1])  # прогрев
+
+    # Задержка по размерам пакета
+    latency = {}
+    for size in batch_sizes:
+        batch = (test_names * (size // len(test_names) + 1))[:size]
+        timings = _timings(lambda: predict_proba(batch), repeats if size < 1024 else max(3, repeats // 5))
+        latency[str(size)] = dict(_latency(timings), per_header_us=round(float(np.median(timings)) / size * 1e6, 2))
+
+    # Пропускная способность на всей тестовой части
+    start = time.perf_counter()
+    predicted, _ = predict_labels(artifacts, test_names, confidence_threshold=None)
+    full_time = time.perf_counter() - start
+
+    # Ручные тестовые случаи с порогом уверенности
+    cases = labeled_test_cases()
+    case_pred, case_conf = predict_labels(artifacts, [header for header, _ in cases], confidence_threshold)
+    errors = [
+        {'header': header, 'expected': expected, 'predicted': pred, 'confidence': round(float(conf), 3)}
+        for (header, expected), pred, conf in zip(cases, case_pred, case_conf) if pred != expected
+    ]
+
+    return {
+        'backend': backend,
+        'cold_load_s': cold_load,
+        'load_s': round(load_time, 3),
+        'latency': latency,
+        'throughput_headers_per_s': int(len(test_names) / full_time) if full_time else 0,
+        'holdout_accuracy': round(float(np.mean(predicted == test_labels)), 4),
+        'test_cases_accuracy': round(1 - len(errors) / len(cases), 4),
+        'test_cases_errors': errors
+    }
+
+
+def summary_table(results):
+    """Краткая таблица сравнения бэкендов (DataFrame) по результатам benchmark_backend"""
+    return pd.DataFrame([{
+        'backend': result['backend'],
+        'accuracy': result['holdout_accuracy'],
+        'test_cases': result['test_cases_accuracy'],
+        'cold_s': result['cold_load_s'],
+        'load_s': result['load_s'],
+        'single_ms': result['latency']['1']['median_ms'] if '1' in result['latency'] else None,
+        'headers_per_s': result['throughput_headers_per_s']
+    } for result in results])
+
+
+def run_benchmark(backends=BACKENDS, dataset_path=DATASET_PATH, report_path=REPORT_PATH, repeats=REPEATS,
+                  confidence_threshold=CONFIDENCE_THRESHOLD, cold=True, table_path=TABLE_PATH):
+    """
+    Замер бэкендов детекции заголовков: холодный старт, задержка по размерам
+    пакета, пропускная способность, точность на отложенной части
+    synthetic_columns.csv и на размеченных тестовых случаях (detect.test_cases).
+
+    Результат сохраняется в report_path в формате JSON, краткая таблица
+    сравнения бэкендов - в table_path (None - не сохранять).
+    """
+    _, _, test = split_dataset(pd.read_csv(dataset_path))
+    test_names = test['column_name'].astype(str).tolist()
+    test_labels = test['label'].to_numpy()
+
+    results = []
+    for backend in backends:
+        result = benchmark_backend(backend, test_names, test_labels, repeats, confidence_threshold=confidence_threshold,
+                                   cold=cold)
+        if result is None:
+            continue
+        results.append(result)
+        print(f"{backend}: cold {result['cold_load_s']} s, 1 header {result['latency']['1']['median_ms']} ms, "
+              f"{result['throughput_headers_per_s']} headers/s, holdout {result['holdout_accuracy']}, "
+              f"test cases {result['test_cases_accuracy']}")
+
+    report = {
+        'dataset': dataset_path,
+        'holdout_size': len(test_names),
+        'test_cases': len(labeled_test_cases()),
+        'confidence_threshold': confidence_threshold,
+        'cpu_count': os.cpu_count(),
+        'backends': results
+    }
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в: {report_path}")
+
+    text = f"Тестовых заголовков: {len(test_names)}\n{summary_table(results).to_string(index=False)}\n"
+    print(text)
+    if table_path:
+        with open(table_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Таблица сохранена в: {table_path}")
+    return report
+
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1:] or BACKENDS)
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+CACHE_PATH = './detect/cache/predictions.sqlite'
+
+# Предельное число записей в каждой таблице, сверх него удаляются давно не использованные
+MAX_HEADER_ENTRIES = 100000
+MAX_SCHEMA_ENTRIES = 10000
+
+# Версия формата кэша: увеличивается при изменении логики детекции
+CACHE_VERSION = 5
+
+# Открытые кэши процесса: {(pid, путь, model_key): PredictionCache}
+_caches = {}
+_caches_lock = threading.Lock()
+# Файлы, в которых уже созданы таблицы: {(pid, путь)}
+_initialized = set()
+
+
+def normalize_header(header):
+    """Нормализация заголовка: токенизатор модели не различает регистр"""
+    return str(header).lower()
+
+
+def schema_fingerprint(columns, **params):
+    """Отпечаток строки заголовков вместе с параметрами детекции"""
+    payload = json.dumps({'columns': [str(col) for col in columns], 'params': params},
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class PredictionCache:
+    """
+    Дисковый кэш предсказаний (SQLite).
+
+    Хранит:
+      - header_predictions: нормализованный заголовок -> (тип, уверенность)
+      - schema_results: отпечаток строки заголовков -> result_list из get_list_result
+
+    Все записи привязаны к отпечатку артефактов модели (model_key), поэтому в одном
+    файле уживаются записи разных моделей и бэкендов. Записи устаревших моделей
+    не удаляются сразу: их больше никто не читает, и они первыми вытесняются
+    при ограничении размера таблиц (вытесняются записи, которые дольше всех
+    не использовались).
+
+    Открывается один раз на процесс через get_prediction_cache; соединение
+    с базой у каждого потока своё и переиспользуется между вызовами.
+    """
+
+    def __init__(self, path=CACHE_PATH, model_key='', max_headers=MAX_HEADER_ENTRIES,
+                 max_schemas=MAX_SCHEMA_ENTRIES):
+        self.path = path
+        self.model_key = f"{CACHE_VERSION}:{model_key}"
+        self.max_headers = max_headers
+        self.max_schemas = max_schemas
+        self._local = threading.local()
+
+        key = (os.getpid(), os.path.abspath(path))
+        with _caches_lock:
+            if key not in _initialized:
+                self._create_tables()
+                _initialized.add(key)
+
+    def _create_tables(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS header_predictions (
+                    model TEXT NOT NULL,
+                    header TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    used_at REAL NOT NULL,
+                    PRIMARY KEY (model, header)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS schema_results (
+                    model TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    used_at REAL NOT NULL,
+                    PRIMARY KEY (model, fingerprint)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS header_predictions_used ON header_predictions (used_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS schema_results_used ON schema_results (used_at)')
+
+    @contextmanager
+    def _connect(self):
+        """Соединение текущего потока (создаётся заново после fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            self._local.pid = os.getpid()
+        with conn:
+            yield conn
+
+    @staticmethod
+    def _evict(conn, table, limit):
+        """Удаление давно не использованных записей сверх лимита"""
+        count = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        if count > limit:
+            conn.execute(
+                f'DELETE FROM {table} WHERE rowid IN '
+                f'(SELECT rowid FROM {table} ORDER BY used_at LIMIT ?)',
+                (count - limit,)
+            )
+
+    def get_headers(self, headers):
+        """Возвращает {нормализованный заголовок: (тип, уверенность)} для найденных в кэше"""
+        keys = list({normalize_header(header) for header in headers})
+        if not keys:
+            return {}
+
+        found = {}
+        with self._connect() as conn:
+            # Ограничение SQLite на число параметров в запросе
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    f'SELECT header, label, confidence FROM header_predictions '
+                    f'WHERE model = ? AND header IN ({",".join("?" * len(chunk))})',
+                    [self.model_key] + chunk
+                ).fetchall()
+                found.update({header: (label, confidence) for header, label, confidence in rows})
+
+            if found:
+                now = time.time()
+                conn.executemany(
+                    'UPDATE header_predictions SET used_at = ? WHERE model = ? AND header = ?',
+                    [(now, self.model_key, header) for header in found]
+                )
+        return found
+
+    def put_headers(self, predictions):
+        """Сохранение предсказаний: predictions - {заголовок: (тип, уверенность)}"""
+        if not predictions:
+            return
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO header_predictions (model, header, label, confidence, used_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(self.model_key, normalize_header(header), str(label), float(confidence), now)
+                 for header, (label, confidence) in predictions.items()]
+            )
+            self._evict(conn, 'header_predictions', self.max_headers)
+
+    def get_schema(self, fingerprint):
+        """Возвращает сохранённый результат для строки заголовков или None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT result FROM schema_results WHERE model = ? AND fingerprint = ?',
+                (self.model_key, fingerprint)
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                'UPDATE schema_results SET used_at = ? WHERE model = ? AND fingerprint = ?',
+                (time.time(), self.model_key, fingerprint)
+            )
+        return json.loads(row[0])
+
+    def put_schema(self, fingerprint, result):
+        """Сохранение результата для строки заголовков (result должен сериализоваться в JSON)"""
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO schema_results (model, fingerprint, result, used_at) '
+                'VALUES (?, ?, ?, ?)',
+                (self.model_key, fingerprint, json.dumps(result, ensure_ascii=False), time.time())
+            )
+            self._evict(conn, 'schema_results', self.max_schemas)
+
+
+def get_prediction_cache(path=CACHE_PATH, model_key=''):
+    """Кэш предсказаний для файла path и модели model_key, один на процесс"""
+    key = (os.getpid(), os.path.abspath(path), model_key)
+    cache = _caches.get(key)
+    if cache is None:
+        cache = PredictionCache(path, model_key=model_key)
+        with _caches_lock:
+            cache = _caches.setdefault(key, cache)
+    return cache
@@ -0,0 +1,155 @@
+import sys
+import unicodedata
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Весовые коэффициенты контрольных сумм
+INN_10_WEIGHTS = np.array([2, 4, 10, 3, 5, 9, 4, 6, 8])
+INN_11_WEIGHTS = np.array([7, 2, 4, 10, 3, 5, 9, 4, 6, 8])
+INN_12_WEIGHTS = np.array([3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8])
+SNILS_WEIGHTS = np.arange(9, 0, -1)
+OKPO_WEIGHTS = np.arange(1, 10)
+# Остаток числа от деления на m через цифры: sum(d_i * (10^k_i mod m)) mod m
+OGRN_WEIGHTS = np.array([pow(10, 11 - i, 11) for i in range(12)])
+OGRNIP_WEIGHTS = np.array([pow(10, 13 - i, 13) for i in range(14)])
+
+KPP_REASONS = np.zeros(100, dtype=bool)
+KPP_REASONS[[1, 2, 3, 4, 5]] = True
+KPP_REASONS[31:] = True
+
+
+@lru_cache(maxsize=None)
+def _unicode_digits():
+    """Таблица замены цифр других алфавитов на ASCII (их принимают \\d и int())"""
+    return {code: ord('0') + unicodedata.digit(chr(code))
+            for code in range(128, sys.maxunicode + 1)
+            if unicodedata.category(chr(code)) == 'Nd'}
+
+
+def _as_str(values):
+    """Колонка значений как pandas Series строк с ASCII-цифрами"""
+    texts = pd.Series(values, dtype=object).astype(str)
+    non_ascii = ~texts.map(str.isascii).to_numpy(dtype=bool)
+    if non_ascii.any():
+        texts = texts.copy()
+        texts[non_ascii] = texts[non_ascii].str.translate(_unicode_digits())
+    return texts
+
+
+def _only_digits(values):
+    """Удаление всех нецифровых символов (как re.sub(r'[^\\d]', '', x))"""
+    texts = _as_str(values)
+    dirty = ~texts.str.isdigit().to_numpy(dtype=bool)
+    if dirty.any():
+        texts = texts.copy()
+        texts[dirty] = texts[dirty].str.replace(r'[^\d]', '', regex=True)
+    return texts
+
+
+def digit_matrix(values, width):
+    """
+    Колонка строк -> матрица цифр (n, width) uint8.
+
+    Строки выравниваются по правому краю и дополняются нулями слева.
+    Возвращает (матрица, длины строк, маска строк из одних ASCII-цифр длиной 1..width).
+    """
+    texts = np.asarray(values, dtype=str)
+    n = len(texts)
+    if n == 0:
+        return np.zeros((0, width), dtype=np.uint8), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+    size = texts.dtype.itemsize // 4
+    # Коды символов минус '0': у цифр 0..9, у остальных (с переполнением uint32) больше
+    codes = texts.view(np.uint32).reshape(n, size) - np.uint32(ord('0'))
+    lengths = np.char.str_len(texts)
+
+    is_digit = codes < 10
+    in_text = np.arange(size) < lengths[:, None]
+    ok = (lengths > 0) & (lengths <= width) & (is_digit | ~in_text).all(axis=1)
+
+    src = np.arange(width) - (width - lengths)[:, None]
+    digits = np.take_along_axis(codes, src.clip(0, size - 1), axis=1)
+    digits = np.where((src >= 0) & ok[:, None], digits, 0).astype(np.uint8)
+
+    return digits, lengths, ok
+
+
+def _control(digits, weights, modulo):
+    """Взвешенная контрольная сумма по строкам матрицы цифр: sum(d * w) % modulo % 10"""
+    return (digits.astype(np.int64) @ weights) % modulo % 10
+
+
+def inn_mask(values):
+    """Векторная проверка ИНН (10 или 12 цифр) по контрольным суммам"""
+    digits, lengths, ok = digit_matrix(_as_str(values).str.strip(), 12)
+
+    legal = digits[:, 2:]
+    valid_10 = _control(legal[:, :9], INN_10_WEIGHTS, 11) == legal[:, 9]
+    valid_12 = ((_control(digits[:, :10], INN_11_WEIGHTS, 11) == digits[:, 10]) &
+                (_control(digits[:, :11], INN_12_WEIGHTS, 11) == digits[:, 11]))
+
+    return ok & (((lengths == 10) & valid_10) | ((lengths == 12) & valid_12))
+
+
+def ogrn_mask(values):
+    """Векторная проверка ОГРН: 13 цифр, первые 12 по модулю 11"""
+    digits, lengths, ok = digit_matrix(_only_digits(values), 13)
+    return ok & (lengths == 13) & (_control(digits[:, :12], OGRN_WEIGHTS, 11) == digits[:, 12])
+
+
+def ogrnip_mask(values):
+    """Векторная проверка ОГРНИП: 15 цифр, первые 14 по модулю 13"""
+    digits, lengths, ok = digit_matrix(_only_digits(values), 15)
+    return ok & (lengths == 15) & (_control(digits[:, :14], OGRNIP_WEIGHTS, 13) == digits[:, 14])
+
+
+def kpp_mask(values):
+    """Векторная проверка КПП: 9 цифр и допустимый код причины постановки"""
+    digits, lengths, ok = digit_matrix(_only_digits(values), 9)
+    reason = digits[:, 4].astype(np.int64) * 10 + digits[:, 5]
+    return ok & (lengths == 9) & KPP_REASONS[reason]
+
+
+def okpo_mask(values):
+    """Векторная проверка ОКПО: 8 цифр (юр. лица) или 10 цифр (ИП) с контрольной суммой"""
+    digits, lengths, ok = digit_matrix(_only_digits(values), 10)
+
+    short = digits[:, 2:]
+    valid_8 = _control(short[:, :7], OKPO_WEIGHTS[:7], 11) == short[:, 7]
+    valid_10 = _control(digits[:, :9], OKPO_WEIGHTS, 11) == digits[:, 9]
+
+    return ok & (((lengths == 8) & valid_8) | ((lengths == 10) & valid_10))
+
+
+def snils_mask(values):
+    """Векторная проверка СНИЛС: 11 цифр, контрольное число по весам 9..1"""
+    digits, lengths, ok = digit_matrix(_only_digits(values), 11)
+    base = digits[:, :9]
+    control = digits[:, 9].astype(np.int64) * 10 + digits[:, 10]
+
+    weighted_sum = base.astype(np.int64) @ SNILS_WEIGHTS
+    remainder = weighted_sum % 101
+    computed = np.where(weighted_sum < 100, weighted_sum,
+                        np.where(weighted_sum <= 101, 0,
+                                 np.where(remainder < 100, remainder, 0)))
+
+    same_digits = (base == base[:, :1]).all(axis=1)
+    return ok & (lengths == 11) & ~same_digits & (computed == control)
+
+
+def luhn_mask(values, min_length=13, max_length=19):
+    """Векторная проверка номеров карт по алгоритму Луна (разделители игнорируются)"""
+    digits, lengths, ok = digit_matrix(_only_digits(values), max_length)
+
+    # Удваивается каждая вторая цифра, считая от контрольной (последней)
+    doubled = (np.arange(max_length)[::-1] % 2) == 1
+    weighted = np.where(doubled, digits.astype(np.int64) * 2, digits)
+    weighted = np.where(weighted > 9, weighted - 9, weighted)
+
+    return ok & (lengths >= min_length) & (weighted.sum(axis=1) % 10 == 0)
+
+
+def pass_rate(mask):
+    """Доля прошедших проверку значений"""
+    return float(mask.mean()) if len(mask) else 0.0
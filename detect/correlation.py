@@ -1,47 +1,222 @@
+import os
+import re
+import uuid
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 
+# Число строк в одной порции при подсчёте корреляций
+CHUNK_ROWS = 50000
+# Тепловые карты сохраняются отдельно для каждой задачи
+HEATMAP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'res', 'heatmaps')
+# Допустимый идентификатор задачи в имени файла тепловой карты (без / и ..)
+JOB_ID_RE = re.compile(r'[A-Za-z0-9_-]+')
+# Подписи значений в ячейках только для небольших матриц
+ANNOTATE_MAX_COLUMNS = 20
 
-def analyze_correlations(df, column_indices, save_path='../detect/res/correlation_heatmap.png'):
+
+class StreamingCorrelation:
+    """
+    Потоковая матрица корреляций Пирсона.
+
+    Данные подаются порциями (update), в памяти хранятся только попарные
+    накопители размера (k, k): число пар наблюдений, средние и центрированные
+    суммы произведений. Порции объединяются формулами Чана (обобщение
+    алгоритма Уэлфорда), поэтому результат устойчив к большим значениям.
+    Как и DataFrame.corr(), для каждой пары колонок учитываются строки,
+    где заданы обе колонки.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros((k, k))
+        # mean[i, j] - среднее колонки i по строкам, где заданы и i, и j
+        self.mean = np.zeros((k, k))
+        # m2[i, j] - сумма квадратов отклонений колонки i по тем же строкам
+        self.m2 = np.zeros((k, k))
+        # comoment[i, j] - сумма произведений отклонений колонок i и j
+        self.comoment = np.zeros((k, k))
+
+    def update(self, values):
+        """Добавление порции: массив (n, k) или DataFrame с колонками self.columns, NaN - пропуск"""
+        x = np.asarray(values, dtype=np.float64)
+        if len(x) == 0:
+            return
+
+        valid = ~np.isnan(x)
+        m = valid.astype(np.float64)
+        n_valid = m.sum(axis=0)
+
+        # Сначала порция центрируется по средним своих колонок: без этого при большом
+        # смещении (например, метки времени ~1e9) sum(x*y) - n*mean*mean теряет все
+        # значащие цифры. Средние пар отличаются от средних колонок только из-за
+        # пропусков, поэтому после сдвига вычитание ниже уже не теряет точность.
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shift = np.where(n_valid > 0, np.where(valid, x, 0.0).sum(axis=0) / n_valid, 0.0)
+        xc = np.where(valid, x - shift, 0.0)
+
+        count = m.T @ m
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # mean_c[i, j] - среднее сдвинутой колонки i по строкам, где заданы i и j
+            mean_c = np.where(count > 0, (xc.T @ m) / count, 0.0)
+        # Суммы отклонений от средних пар: sum((x - mean_x) * (y - mean_y))
+        m2 = (xc * xc).T @ m - count * mean_c * mean_c
+        comoment = xc.T @ xc - count * mean_c * mean_c.T
+
+        self._merge(count, mean_c + shift[:, None], m2, comoment)
+
+    def _merge(self, count, mean, m2, comoment):
+        """Объединение накопителей с накопителями порции (формулы Чана)"""
+        total = self.count + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, self.count * count / total, 0.0)
+            delta = mean - self.mean
+
+            self.m2 += m2 + delta * delta * weight
+            self.comoment += comoment + delta * delta.T * weight
+            self.mean += np.where(total > 0, delta * count / total, 0.0)
+        self.count = total
+
+    def select(self, columns):
+        """
+        Накопители только для части колонок.
+        Попарные накопители не зависят от остальных колонок, поэтому пересчёт не нужен.
+        """
+        idx = np.array([self.columns.index(col) for col in columns], dtype=np.int64)
+        selected = StreamingCorrelation(columns)
+        for name in ('count', 'mean', 'm2', 'comoment'):
+            setattr(selected, name, getattr(self, name)[np.ix_(idx, idx)])
+        return selected
+
+    def result(self):
+        """Матрица корреляций (DataFrame); NaN для пар без разброса или с < 2 наблюдений"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        corr[(self.count < 2) | ~np.isfinite(corr)] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, np.where(np.diag(self.m2) > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def _numeric_columns(df):
+    """Числовые колонки порции (как select_dtypes(include=[np.number]))"""
+    return list(df.select_dtypes(include=[np.number]).columns)
+
+
+def correlations_from_chunks(chunks):
+    """
+    Матрица корреляций по последовательности порций DataFrame.
+
+    Колонка учитывается, если она числовая во всех порциях: порции читаются
+    независимо, и тип колонки определяется по каждой отдельно.
+    """
+    accumulator = None
+
+    for chunk in chunks:
+        chunk_numeric = set(_numeric_columns(chunk))
+        if accumulator is None:
+            accumulator = StreamingCorrelation([col for col in chunk.columns if col in chunk_numeric])
+        elif not set(accumulator.columns) <= chunk_numeric:
+            accumulator = accumulator.select([col for col in accumulator.columns if col in chunk_numeric])
+        accumulator.update(chunk[accumulator.columns])
+
+    if accumulator is None or not accumulator.columns:
+        return pd.DataFrame()
+    return accumulator.result()
+
+
+def heatmap_path(job_id=None):
+    """
+    Путь тепловой карты для задачи (уникальный, если job_id не задан).
+    job_id из букв, цифр, _ и -, иначе ValueError: файл всегда остаётся в HEATMAP_DIR.
+    """
+    if not job_id:
+        job_id = uuid.uuid4().hex
+    elif not JOB_ID_RE.fullmatch(str(job_id)):
+        raise ValueError(f"Недопустимый идентификатор задачи: {job_id!r}")
+    return os.path.join(HEATMAP_DIR, f'correlation_heatmap_{job_id}.png')
+
+
+def render_heatmap(corr_matrix, save_path=None):
     """
-    Анализ корреляций и сохранение тепловой карты
+    Отрисовка и сохранение тепловой карты матрицы корреляций.
+
+    Рисует в отдельный Figure без pyplot, поэтому параллельные запросы
+    не мешают друг другу. Возвращает путь к файлу.
+    """
+    # Импорт здесь: графические библиотеки нужны только при отрисовке
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    save_path = save_path or heatmap_path()
+    os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
+
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    sns.heatmap(corr_matrix,
+                annot=len(corr_matrix) <= ANNOTATE_MAX_COLUMNS,
+                fmt=".2f",
+                cmap='coolwarm',
+                center=0,
+                linewidths=.5,
+                ax=ax)
+    ax.set_title('Матрица корреляций')
+    fig.tight_layout()
+    fig.savefig(save_path)
+
+    print(f'Тепловая карта сохранена в: {save_path}')
+    return save_path
+
+
+def analyze_correlations(df, column_indices, save_path=None, heatmap=False, chunk_rows=CHUNK_ROWS):
+    """
+    Анализ корреляций
 
     Параметры:
     - df: исходный DataFrame
     - column_indices: список индексов столбцов для анализа
-    - save_path: путь для сохранения heatmap (по умолчанию 'correlation_heatmap.png')
+    - save_path: путь для сохранения heatmap (по умолчанию свой файл в HEATMAP_DIR)
+    - heatmap: рисовать ли тепловую карту
+    - chunk_rows: число строк в порции
 
     Возвращает:
     - DataFrame с матрицей корреляций
-    - Сохраняет тепловую карту в файл
+    - При heatmap=True сохраняет тепловую карту в файл
     """
     # Выбираем указанные столбцы
     columns_to_analyze = df.iloc[:, column_indices]
 
-    # Для числовых столбцов считаем корреляцию Пирсона
+    # Для числовых столбцов считаем корреляцию Пирсона, порциями по chunk_rows строк
     numeric_cols = columns_to_analyze.select_dtypes(include=[np.number])
 
-    if not numeric_cols.empty:
-        corr_matrix = numeric_cols.corr()
-
-        # Создаем и сохраняем heatmap
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(corr_matrix,
-                    annot=True,
-                    fmt=".2f",
-                    cmap='coolwarm',
-                    center=0,
-                    linewidths=.5)
-        plt.title('Матрица корреляций')
-        plt.tight_layout()
-        plt.savefig(save_path)
-        plt.close()
-
-        print(f'Тепловая карта сохранена в: {save_path}')
-    else:
-        corr_matrix = pd.DataFrame()
+    if numeric_cols.empty:
+        print('Нет числовых столбцов для анализа корреляций')
+        return pd.DataFrame()
+
+    accumulator = StreamingCorrelation(numeric_cols.columns)
+    for start in range(0, len(numeric_cols), chunk_rows):
+        accumulator.update(numeric_cols.iloc[start:start + chunk_rows])
+    corr_matrix = accumulator.result()
+
+    if heatmap:
+        render_heatmap(corr_matrix, save_path)
+
+    return corr_matrix
+
+
+def analyze_csv_correlations(csv_path, column_indices, encoding='utf-8', save_path=None, heatmap=False,
+                             chunk_rows=CHUNK_ROWS):
+    """Анализ корреляций файла CSV без загрузки его целиком (читается порциями по chunk_rows строк)"""
+    if len(column_indices) == 0:
+        print('Нет числовых столбцов для анализа корреляций')
+        return pd.DataFrame()
+
+    chunks = pd.read_csv(csv_path, encoding=encoding, usecols=list(column_indices), chunksize=chunk_rows)
+    corr_matrix = correlations_from_chunks(chunks)
+
+    if corr_matrix.empty:
         print('Нет числовых столбцов для анализа корреляций')
+    elif heatmap:
+        render_heatmap(corr_matrix, save_path)
 
-    return corr_matrix
\ No newline at end of file
+    return corr_matrix
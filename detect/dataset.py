@@ -1,5 +1,5 @@
+import numpy as np
 import pandas as pd
-import random
 
 column_types = {
     "first_name": [
@@ -205,26 +205,166 @@ column_types = {
 
 }
 
-def generate_dataset(size_per_class=500):
-    rows = []
-    for label, variations in column_types.items():
-        for _ in range(size_per_class):
-            value = random.choice(variations)
-            noise = random.choice([
-                value.lower(),
-                value.upper(),
-                value.title(),
-                value.replace(" ", "_"),
-                value.replace(" ", "").lower(),
-                value.replace(" ", "-"),
-                value.replace("_", ""),
-            ])
-            rows.append({"column_name": noise, "label": label})
-    df = pd.DataFrame(rows)
-    df = df.sample(frac=1).reset_index(drop=True)
-    return df
+# Варианты написания заголовка (регистр и разделители)
+CASE_VARIANTS = (
+    lambda value: value.lower(),
+    lambda value: value.upper(),
+    lambda value: value.title(),
+    lambda value: value.replace(" ", "_"),
+    lambda value: value.replace(" ", "").lower(),
+    lambda value: value.replace(" ", "-"),
+    lambda value: value.replace("_", ""),
+)
+
+# Приставки, с которыми заголовки встречаются в выгрузках
+PREFIXES = ("client_", "user_", "customer_", "cust_", "src_", "клиент_", "пользователь_")
+
+# Транслитерация кириллицы (заголовки вида "familiya", "telefon")
+TRANSLIT = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z', 'и': 'i',
+    'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
+    'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch', 'ъ': '', 'ы': 'y', 'ь': '',
+    'э': 'e', 'ю': 'yu', 'я': 'ya',
+}
+TRANSLIT_TABLE = str.maketrans({**TRANSLIT, **{key.upper(): value.capitalize() for key, value in TRANSLIT.items()}})
+
+# Вероятности аугментаций по умолчанию
+PREFIX_PROB = 0.15
+TRANSLIT_PROB = 0.15
+TYPO_PROB = 0.1
+# Опечатки вносятся только в заголовки не короче этого
+TYPO_MIN_LENGTH = 4
+
+CHUNK_ROWS = 100000
+
+
+def transliterate(value):
+    return value.translate(TRANSLIT_TABLE)
+
+
+def _variant_table(types=None):
+    """
+    Все варианты всех синонимов, собранные один раз.
+
+    Возвращает (labels, strings, variants, starts, counts):
+      strings - массив всех различных строк-вариантов;
+      variants[i, case, prefix, translit] - номер строки в strings для синонима i
+      (prefix 0 - без приставки, translit 0 - исходное написание);
+      синонимы метки labels[j] - variants[starts[j]:starts[j] + counts[j]].
+    """
+    types = column_types if types is None else types
+    labels = list(types)
+
+    strings = {}
+    table = []
+    synonym_labels = []
+    for label_idx, label in enumerate(labels):
+        for value in types[label]:
+            cell = np.empty((len(CASE_VARIANTS), len(PREFIXES) + 1, 2), dtype=np.int64)
+            for translit, base in enumerate((value, transliterate(value))):
+                for case, variant in enumerate(CASE_VARIANTS):
+                    text = variant(base)
+                    for prefix_idx, prefix in enumerate(("",) + PREFIXES):
+                        cell[case, prefix_idx, translit] = strings.setdefault(prefix + text, len(strings))
+            table.append(cell)
+            synonym_labels.append(label_idx)
+
+    synonym_labels = np.array(synonym_labels)
+    counts = np.bincount(synonym_labels, minlength=len(labels))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return labels, np.array(list(strings), dtype=str), np.stack(table), starts, counts
+
+
+def _apply_typos(texts, rng):
+    """
+    Опечатка в каждой строке: пропуск, удвоение символа или перестановка соседних.
+
+    Строки переводятся в матрицу кодов символов, правка делается перестановкой
+    индексов для всего массива сразу.
+    """
+    n = len(texts)
+    width = texts.dtype.itemsize // 4
+    codes = np.zeros((n, width + 1), dtype=np.uint32)
+    codes[:, :width] = texts.view(np.uint32).reshape(n, width)
+    lengths = np.char.str_len(texts)
+
+    op = rng.integers(0, 3, n)
+    pos = (rng.random(n) * (lengths - 1)).astype(np.int64)
+    j = np.arange(width + 1)[None, :]
+    p = pos[:, None]
+
+    src = np.select(
+        [op[:, None] == 0, op[:, None] == 1],
+        [j + (j >= p),                         # пропуск символа pos
+         j - (j > p)],                         # удвоение символа pos
+        np.where(j == p, p + 1, np.where(j == p + 1, p, j))  # перестановка pos и pos+1
+    )
+    out = np.take_along_axis(codes, src.clip(0, width), axis=1)
+
+    new_lengths = lengths + np.select([op == 0, op == 1], [-1, 1], 0)
+    out[j >= new_lengths[:, None]] = 0
+    return out.view(f'<U{width + 1}').ravel()
+
+
+def _sample_rows(label_ids, table, rng, prefix_prob, translit_prob, typo_prob):
+    """Заголовки для массива меток: все случайные выборы - массивами индексов"""
+    labels, strings, variants, starts, counts = table
+    n = len(label_ids)
+
+    synonym = starts[label_ids] + (rng.random(n) * counts[label_ids]).astype(np.int64)
+    case = rng.integers(0, variants.shape[1], n)
+    prefix = np.where(rng.random(n) < prefix_prob, rng.integers(1, variants.shape[2], n), 0)
+    translit = (rng.random(n) < translit_prob).astype(np.int64)
+
+    names = strings[variants[synonym, case, prefix, translit]]
+
+    typo = (rng.random(n) < typo_prob) & (np.char.str_len(names) >= TYPO_MIN_LENGTH)
+    if typo.any():
+        names = names.astype(f'<U{names.dtype.itemsize // 4 + 1}')
+        names[typo] = _apply_typos(names[typo], rng)
+
+    return pd.DataFrame({"column_name": names, "label": np.array(labels)[label_ids]})
+
+
+def generate_dataset(size_per_class=500, seed=None, prefix_prob=PREFIX_PROB, translit_prob=TRANSLIT_PROB,
+                     typo_prob=TYPO_PROB, types=None):
+    """
+    Генерация размеченных заголовков: size_per_class строк на каждый тип.
+
+    Синоним, вариант написания, приставка, транслитерация и опечатка выбираются
+    массивами индексов NumPy. При заданном seed результат воспроизводим.
+    """
+    rng = np.random.default_rng(seed)
+    table = _variant_table(types)
+
+    label_ids = rng.permutation(np.repeat(np.arange(len(table[0])), size_per_class))
+    return _sample_rows(label_ids, table, rng, prefix_prob, translit_prob, typo_prob)
+
+
+def generate_dataset_to_csv(path, total_rows, seed=None, chunk_rows=CHUNK_ROWS, prefix_prob=PREFIX_PROB,
+                            translit_prob=TRANSLIT_PROB, typo_prob=TYPO_PROB, types=None):
+    """
+    Генерация большого набора сразу в CSV порциями по chunk_rows строк.
+
+    В памяти держится только одна порция, внутри порции типы сбалансированы.
+    Результат воспроизводим при тех же seed и chunk_rows.
+    """
+    rng = np.random.default_rng(seed)
+    table = _variant_table(types)
+    num_labels = len(table[0])
+
+    written = 0
+    while written < total_rows:
+        n = min(chunk_rows, total_rows - written)
+        label_ids = rng.permutation(np.arange(n) % num_labels)
+        chunk = _sample_rows(label_ids, table, rng, prefix_prob, translit_prob, typo_prob)
+        chunk.to_csv(path, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+        written += n
+
+    print(f"Сгенерировано строк: {written} -> {path}")
+    return path
 
 if __name__ == "__main__":
     df = generate_dataset()
     df.to_csv("../detect/res/synthetic_columns.csv", index=False)
-    print("Сгенерирован и сохранён: synthetic_columns.csv")
\ No newline at end of file
+    print("Сгенерирован и сохранён: synthetic_columns.csv")
@@ -1,61 +1,129 @@
 import pandas as pd
-import numpy as np
 import os
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from detect.correlation import analyze_correlations
-from detect.gender import detect_gender
+from detect.artifacts import get_model_artifacts, artifacts_fingerprint
+from detect.cache import CACHE_PATH, get_prediction_cache, normalize_header, schema_fingerprint
+from detect.correlation import analyze_csv_correlations, heatmap_path
+from detect.gender import detect_gender_array
+from detect.synonyms import SYNONYM_CONFIDENCE, lookup_synonym
 from detect.valid import validate_column_data  # Импорт новой функции
+from detect.value_scan import CONTENT_THRESHOLD, best_content_type, scan_column
+
+
+CONFIDENTIAL_TYPES = ['first_name', 'last_name', 'inn', 'phone', 'middle_name', 'full_name', "snils",
+                      "ogrn", "kpp", "okpo", "ogrnip", "email", "birth_date", "passport_number", "passport_series",
+                      "international_passport_number", "military_ticket_num", "sailor_ticket_num", "birth_certificate_num",
+                      "work_book_num", "vehicle_number", "nr_credit_account", "nr_bank_contract", "nr_dep_contract",
+                      "card_number", "bank_account_number", "investor_code", "address", "login", "ip", "uri"]
 
 
 def load_model_artifacts(model_path='./detect/res/best_model.h5',
                          tokenizer_path='./detect/res/tokenizer.pkl',
-                         encoder_path='./detect/res/label_encoder.pkl'):
-    """Загрузка артефактов модели"""
-    return {
-        'model': load_model(model_path),
-        'tokenizer': pd.read_pickle(tokenizer_path),
-        'encoder': pd.read_pickle(encoder_path)
-    }
+                         encoder_path='./detect/res/label_encoder.pkl', backend='auto'):
+    """Загрузка артефактов модели (из общего реестра процесса)"""
+    return get_model_artifacts(model_path, tokenizer_path, encoder_path, backend=backend)
 
 
-def predict_column_type(column_name, artifacts, confidence_threshold=0.6):
-    """Предсказание типа колонки"""
-    seq = artifacts['tokenizer'].texts_to_sequences([column_name])
-    pad = pad_sequences(seq, maxlen=20)
-    pred_proba = artifacts['model'].predict(pad, verbose=0)[0]
+def predict_header_probabilities(column_names, artifacts):
+    """Наиболее вероятный тип и его вероятность для каждого заголовка (без порога)"""
+    names = [str(name) for name in column_names]
+    if not names:
+        return []
+
+    # Через общую очередь реестра, если она есть: вызовы из параллельных запросов идут одним пакетом
+    batcher = artifacts.get('batcher')
+    pred_proba = batcher.predict_proba(names) if batcher is not None else artifacts['predict_proba'](names)
+
+    max_proba = pred_proba.max(axis=1)
+    classes = artifacts['classes'][pred_proba.argmax(axis=1)]
+
+    return list(zip(classes, max_proba))
+
 
-    max_proba = np.max(pred_proba)
-    if max_proba < confidence_threshold:
-        return "не определено", max_proba
-    return artifacts['encoder'].classes_[np.argmax(pred_proba)], max_proba
+def _apply_threshold(pred_type, confidence, confidence_threshold):
+    if confidence < confidence_threshold:
+        return "не определено", confidence
+    return pred_type, confidence
 
 
-def get_confidential_data_map(csv_path, model, token, encoder, encoding='utf-8', confidence_threshold=0.6):
+def predict_column_types(column_names, artifacts, confidence_threshold=0.6):
+    """
+    Пакетное предсказание типов колонок.
 
-    """Анализ CSV файла и создание карты конфиденциальных данных"""
-    df = pd.read_csv(csv_path, encoding=encoding)
+    Все заголовки токенизируются и дополняются разом, модель вызывается один раз
+    на всю таблицу. Возвращает список пар (тип, уверенность) в порядке колонок.
+    """
+    return [
+        _apply_threshold(pred_type, confidence, confidence_threshold)
+        for pred_type, confidence in predict_header_probabilities(column_names, artifacts)
+    ]
+
+
+def predict_column_type(column_name, artifacts, confidence_threshold=0.6):
+    """Предсказание типа одной колонки"""
+    return predict_column_types([column_name], artifacts, confidence_threshold)[0]
+
+
+def predict_column_types_cached(column_names, load_artifacts, confidence_threshold=0.6, cache=None,
+                                use_synonyms=True):
+    """
+    Предсказание типов колонок со словарём синонимов и дисковым кэшем заголовков.
+
+    Сначала заголовок ищется в словаре синонимов из detect/dataset.py, затем в
+    кэше. Модель получает только оставшиеся заголовки, а load_artifacts
+    вызывается лишь если такие есть.
+    """
+    names = [str(name) for name in column_names]
+
+    known = {}
+    if use_synonyms:
+        for name in names:
+            label = lookup_synonym(name)
+            if label is not None:
+                known[normalize_header(name)] = (label, SYNONYM_CONFIDENCE)
+
+    rest = [name for name in names if normalize_header(name) not in known]
+    if cache is not None and rest:
+        known.update(cache.get_headers(rest))
+
+    missing = list(dict.fromkeys(name for name in rest if normalize_header(name) not in known))
+    if missing:
+        predicted = dict(zip(missing, predict_header_probabilities(missing, load_artifacts())))
+        if cache is not None:
+            cache.put_headers(predicted)
+        known.update({normalize_header(name): pred for name, pred in predicted.items()})
+
+    return [
+        _apply_threshold(*known[normalize_header(name)], confidence_threshold)
+        for name in names
+    ]
+
+
+def get_confidential_data_map(csv_path, model, token, encoder, encoding='utf-8', confidence_threshold=0.6,
+                              cache=None, nlp_workers=None, backend='auto', df=None):
+
+    """Анализ CSV файла и создание карты конфиденциальных данных (df - уже прочитанный файл)"""
+    if df is None:
+        df = pd.read_csv(csv_path, encoding=encoding)
     print(f"Обрабатываем файл по пути: {csv_path}")  # Добавьте эту строку
     print(f"Файл существует: {os.path.exists(csv_path)}")  # Проверка существования файла
-    artifacts = load_model_artifacts(model, token, encoder)
 
-    confidential_types = ['first_name', 'last_name', 'inn', 'phone', 'middle_name', 'full_name', "snils",
-                          "ogrn", "kpp", "okpo", "ogrnip", "email", "birth_date", "passport_number", "passport_series",
-                          "international_passport_number", "military_ticket_num", "sailor_ticket_num", "birth_certificate_num",
-                          "work_book_num", "vehicle_number", "nr_credit_account", "nr_bank_contract", "nr_dep_contract",
-                          "card_number", "bank_account_number", "investor_code", "address", "login", "ip", "uri"]
+    confidential_types = CONFIDENTIAL_TYPES
     confidential_map = {}
     results = []
 
+    # Один вызов модели на все заголовки таблицы, которых нет в словаре синонимов и в кэше
+    predictions = predict_column_types_cached(df.columns, lambda: load_model_artifacts(model, token, encoder, backend),
+                                              confidence_threshold, cache)
+
     for idx, col in enumerate(df.columns):
         try:
-            pred_type, confidence = predict_column_type(col, artifacts, confidence_threshold)
+            pred_type, confidence = predictions[idx]
             is_confidential = pred_type in confidential_types
 
             validation = {}
             if is_confidential:
                 try:
-                    validation = validate_column_data(df[col], pred_type)
+                    validation = validate_column_data(df[col], pred_type, nlp_workers=nlp_workers)
                     status = "CONFIRMED" if validation.get('is_valid', False) else \
                              "SUSPICIOUS" if confidence > 0.5 else "REJECTED"
                 except Exception as e:
@@ -93,13 +161,17 @@ def get_confidential_data_map(csv_path, model, token, encoder, encoding='utf-8',
     return confidential_map, pd.DataFrame(results)
 
 
-def analyze_data(csv_path, model, token, encoder, encoding='utf-8'):
-    """Полный анализ данных с валидацией"""
+def analyze_data(csv_path, model, token, encoder, encoding='utf-8', cache=None, nlp_workers=None,
+                 correlations=True, backend='auto', df=None):
+    """Полный анализ данных с валидацией (df - уже прочитанный файл)"""
     try:
-        df = pd.read_csv(csv_path, encoding=encoding)
-        confidential_map, columns_info = get_confidential_data_map(csv_path,model, token, encoder, encoding=encoding)
+        if df is None:
+            df = pd.read_csv(csv_path, encoding=encoding)
+        confidential_map, columns_info = get_confidential_data_map(csv_path,model, token, encoder, encoding=encoding,
+                                                                   cache=cache, nlp_workers=nlp_workers,
+                                                                   backend=backend, df=df)
         non_conf_indices = [idx for idx in range(len(df.columns)) if idx not in confidential_map]
-        corr_matrix = analyze_correlations(df, non_conf_indices)
+        corr_matrix = analyze_csv_correlations(csv_path, non_conf_indices, encoding=encoding) if correlations else None
 
         return {
             'confidential_data_map': confidential_map,
@@ -120,10 +192,111 @@ def analyze_data(csv_path, model, token, encoder, encoding='utf-8'):
 THRESHOLD = 0.1
 
 
-def get_list_result(csv_path, model_path ,token, enconder, encoding='utf-8'):
+def detect_by_content(df, column_indices, threshold=CONTENT_THRESHOLD):
+    """
+    Определение типа колонок по значениям (для колонок, не распознанных по заголовку
+    или не подтверждённых валидацией).
 
-    analysis_results = analyze_data(csv_path, model_path ,token, enconder, encoding=encoding)
+    Возвращает записи в формате result_list: [тип, индекс колонки, доля совпавших значений].
+    """
+    content_results = []
+    for idx in column_indices:
+        try:
+            scores = scan_column(df.iloc[:, idx], types=CONFIDENTIAL_TYPES)
+            col_type, score = best_content_type(scores, threshold)
+            if col_type is not None:
+                print(f"Столбец {df.columns[idx]}: тип {col_type} определён по содержимому ({score:.0%})")
+                content_results.append([col_type, idx, round(score, 4)])
+        except Exception as e:
+            print(f"Ошибка при проверке содержимого столбца {df.columns[idx]}: {str(e)}")
+    return content_results
+
+
+def get_list_result(csv_path, model_path ,token, enconder, encoding='utf-8', cache=None, nlp_workers=None,
+                    content_scan=True, heatmap=False, job_id=None, backend='auto'):
+
+    # Файлы с уже встречавшимся набором заголовков не анализируем повторно.
+    # В кэше хранится только результат по заголовкам: проверка содержимого
+    # зависит от данных и выполняется для каждого файла.
+    fingerprint = None
+    cached = None
+    df = None
+    if cache is not None:
+        columns = pd.read_csv(csv_path, encoding=encoding, nrows=0).columns
+        fingerprint = schema_fingerprint(columns, threshold=THRESHOLD)
+        cached = cache.get_schema(fingerprint)
+
+    if cached is not None:
+        print("Результат детекции взят из кэша")
+        result_list = cached['result_list']
+        non_conf_indices = cached['non_confidential_columns']
+        unconfirmed = cached.get('unconfirmed_columns', [])
+    else:
+        # Файл читается один раз: тот же DataFrame используется для валидации и проверки содержимого
+        df = pd.read_csv(csv_path, encoding=encoding)
+        columns = df.columns
+        result_list, non_conf_indices, unconfirmed = _header_result_list(csv_path, model_path, token, enconder,
+                                                                         encoding, cache, fingerprint,
+                                                                         nlp_workers, backend, df=df)
+
+    if non_conf_indices is None:
+        if not content_scan:
+            return [], None
+        # Детекция по заголовкам не удалась: по значениям проверяются все колонки
+        result_list, non_conf_indices, unconfirmed = [], list(range(len(columns))), []
+
+    # По значениям проверяются колонки, не распознанные по заголовку, и колонки,
+    # тип которых по заголовку не подтвердила валидация (модель могла ошибиться).
+    # Тип, найденный по содержимому, заменяет тип по заголовку.
+    if content_scan:
+        scan_indices = sorted(set(non_conf_indices) | set(unconfirmed))
+        if df is not None:
+            content_results = detect_by_content(df, scan_indices)
+        elif scan_indices:
+            # Результат по заголовкам взят из кэша: читаются только проверяемые колонки
+            scan_df = pd.read_csv(csv_path, encoding=encoding, usecols=scan_indices)
+            content_results = [[col_type, scan_indices[pos], score] for col_type, pos, score
+                               in detect_by_content(scan_df, range(len(scan_indices)))]
+        else:
+            content_results = []
+        matched = {col_idx: (col_type, score) for col_type, col_idx, score in content_results}
+        merged = []
+        for col_type, col_idx, prob in result_list:
+            if col_idx not in matched:
+                merged.append([col_type, col_idx, prob])
+            elif matched[col_idx][0] == col_type:
+                # Содержимое подтвердило тип по заголовку
+                merged.append([col_type, col_idx, max(prob, matched.pop(col_idx)[1])])
+            else:
+                print(f"Столбец {columns[col_idx]}: тип по заголовку {col_type} "
+                      f"заменён типом по содержимому {matched[col_idx][0]}")
+        result_list = merged + [[col_type, col_idx, score] for col_idx, (col_type, score) in matched.items()]
+        non_conf_indices = [idx for idx in non_conf_indices if idx not in matched]
+
+    # Корреляции считаются по файлу порциями, без копии выбранных колонок в памяти
+    try:
+        corr_matrix = analyze_csv_correlations(csv_path, non_conf_indices, encoding=encoding,
+                                               save_path=heatmap_path(job_id) if heatmap else None,
+                                               heatmap=heatmap)
+    except Exception as e:
+        print(f"Ошибка анализа корреляций: {str(e)}")
+        corr_matrix = None
+    return result_list, corr_matrix
+
+
+def _header_result_list(csv_path, model_path, token, enconder, encoding, cache, fingerprint, nlp_workers,
+                        backend='auto', df=None):
+    """
+    Результат детекции по заголовкам: (result_list, индексы неконфиденциальных колонок,
+    индексы колонок, тип которых не подтвердила валидация).
+    Если анализ не удался, возвращает ([], None, []).
+    """
+    analysis_results = analyze_data(csv_path, model_path ,token, enconder, encoding=encoding, cache=cache,
+                                    nlp_workers=nlp_workers, correlations=False, backend=backend, df=df)
     #print(analysis_results)
+    if analysis_results['columns_info'].empty:
+        return [], None, []
+
     result_list = []
 
     if analysis_results and analysis_results['confidential_data_map']:
@@ -138,11 +311,33 @@ def get_list_result(csv_path, model_path ,token, enconder, encoding='utf-8'):
             if prob > THRESHOLD:
                 result_list.append([info['type'], col_idx, round(prob, 4)])
 
-    return result_list, analysis_results.get('correlation_analysis', None)
+    non_conf_indices = [int(idx) for idx in analysis_results['non_confidential_columns']]
+    unconfirmed = [int(idx) for idx, info in analysis_results['confidential_data_map'].items()
+                   if info['status'] != "CONFIRMED"]
+    if cache is not None:
+        cache.put_schema(fingerprint, {
+            'result_list': [[col_type, int(col_idx), float(prob)] for col_type, col_idx, prob in result_list],
+            'non_confidential_columns': non_conf_indices,
+            'unconfirmed_columns': unconfirmed
+        })
+
+    return result_list, non_conf_indices, unconfirmed
+
+def open_prediction_cache(model_path, tokenizer_path, encoder_path, cache_path=CACHE_PATH, backend='auto'):
+    """Дисковый кэш предсказаний для текущих артефактов модели, один на процесс (None при ошибке)"""
+    try:
+        model_key = artifacts_fingerprint(model_path, tokenizer_path, encoder_path, backend=backend)
+        return get_prediction_cache(cache_path, model_key)
+    except Exception as e:
+        print(f"Кэш предсказаний недоступен: {e}")
+        return None
+
 
 def column_detect(csv_path, encoding='utf-8',model_path='./detect/res/best_model.h5',
                          tokenizer_path='./detect/res/tokenizer.pkl',
-                         encoder_path='./detect/res/label_encoder.pkl'):
+                         encoder_path='./detect/res/label_encoder.pkl',
+                         use_cache=True, cache_path=CACHE_PATH, nlp_workers=None, heatmap=False, job_id=None,
+                         backend='auto'):
     import chardet
 
     pd.set_option('display.max_rows', None)
@@ -153,9 +348,15 @@ def column_detect(csv_path, encoding='utf-8',model_path='./detect/res/best_model
         rawdata = f.read(10000)
         encoding = chardet.detect(rawdata)['encoding']
     print(f"Определена кодировка файла: {encoding}")
-    results, corr = get_list_result(csv_path, model_path=model_path, token=tokenizer_path, enconder=encoder_path, encoding=encoding)
-
-    gender_rel = detect_gender(results, csv_path)
+    # backend - модель заголовков: 'auto', 'numpy', 'keras' или 'ngram' (см. detect.artifacts.get_model_artifacts)
+    cache = open_prediction_cache(model_path, tokenizer_path, encoder_path, cache_path, backend) if use_cache else None
+    # heatmap=True дополнительно сохраняет тепловую карту корреляций в detect/res/heatmaps (файл на job_id)
+    results, corr = get_list_result(csv_path, model_path=model_path, token=tokenizer_path, enconder=encoder_path,
+                                    encoding=encoding, cache=cache, nlp_workers=nlp_workers,
+                                    heatmap=heatmap, job_id=job_id, backend=backend)
+
+    # nlp_workers - число процессов для разбора имён и адресов (None - detect.nlp_pool.NLP_WORKERS)
+    gender_rel = detect_gender_array(results, csv_path, nlp_workers=nlp_workers)
     print(results)
     print("------")
     print(gender_rel)
@@ -1,12 +1,21 @@
-import csv
 import numpy as np
+import pandas as pd
 import chardet
-from natasha import MorphVocab, NamesExtractor
-import random
-from collections import defaultdict
+from detect.nlp import get_morph_vocab, get_names_extractor
+from detect.nlp_pool import detect_genders
 
-# Глобальные переменные с результатами анализа
-analysis_results = {}  # Будет хранить результаты в формате {row_num: {'type': result}}
+# Коды пола в массивах вердиктов (int8)
+GENDER_UNKNOWN = 0
+GENDER_MALE = 1
+GENDER_FEMALE = 2
+# Поле не участвует в голосовании (пустое значение, нет колонки, некорректный ввод)
+GENDER_SKIP = -1
+
+GENDER_CODES = {'male': GENDER_MALE, 'female': GENDER_FEMALE, 'unknown': GENDER_UNKNOWN}
+GENDER_LABELS = {GENDER_MALE: 'male', GENDER_FEMALE: 'female', GENDER_UNKNOWN: 'unknown'}
+
+# Типы колонок, по которым определяется пол
+GENDER_FIELDS = ('first_name', 'last_name', 'middle_name')
 
 # Глобальные переменные с окончаниями
 MALE_NAME_ENDS = ('й', 'н', 'р', 'с', 'т', 'в', 'д', 'л', 'г', 'к')
@@ -22,6 +31,54 @@ FEMALE_SURNAME_ENDS = ('ова', 'ева', 'ина', 'ына', 'ская', 'цк
 MALE_MIDDLE_NAME_ENDS = ('ович', 'евич', 'ич', 'ыч')
 FEMALE_MIDDLE_NAME_ENDS = ('овна', 'евна', 'ична', 'инична')
 
+MALE_FLAG = 1
+FEMALE_FLAG = 2
+
+
+def _build_suffix_trie(male_ends, female_ends):
+    """
+    Дерево перевёрнутых окончаний: {символ: узел}, в узле под ключом None
+    хранятся флаги полов, чьё окончание заканчивается в этом узле.
+    """
+    root = {}
+    for flag, ends in ((MALE_FLAG, male_ends), (FEMALE_FLAG, female_ends)):
+        for end in ends:
+            node = root
+            for char in reversed(end.lower()):
+                node = node.setdefault(char, {})
+            node[None] = node.get(None, 0) | flag
+    return root
+
+
+def _match_suffix(trie, text):
+    """
+    Пол по окончанию за один проход по концу строки.
+    Как и прежние проверки any(endswith), мужские окончания имеют приоритет.
+    """
+    flags = 0
+    node = trie
+    for char in reversed(text):
+        node = node.get(char)
+        if node is None:
+            break
+        flags |= node.get(None, 0)
+
+    if flags & MALE_FLAG:
+        return 'male'
+    if flags & FEMALE_FLAG:
+        return 'female'
+    return None
+
+
+# Окончания, скомпилированные в деревья по режимам
+SUFFIX_TRIES = {
+    'first_name': _build_suffix_trie(MALE_NAME_ENDS, FEMALE_NAME_ENDS),
+    'last_name': _build_suffix_trie(MALE_SURNAME_ENDS, FEMALE_SURNAME_ENDS),
+    # Для отчеств дополнительно любое окончание на 'на' считается женским
+    'middle_name': _build_suffix_trie(MALE_MIDDLE_NAME_ENDS, FEMALE_MIDDLE_NAME_ENDS + ('на',)),
+}
+MALE_NAME_EXCEPTIONS = frozenset(name.lower() for name in NAME_MALE_EXCEPTIONS)
+
 # Веса по умолчанию
 DEFAULT_WEIGHTS = {
     'first_name': 0.3,
@@ -32,8 +89,8 @@ DEFAULT_WEIGHTS = {
 
 class GenderAnalyzer:
     def __init__(self):
-        self.morph_vocab = MorphVocab()
-        self.names_extractor = NamesExtractor(self.morph_vocab)
+        self.morph_vocab = get_morph_vocab()
+        self.names_extractor = get_names_extractor()
 
     def _get_gender_from_natasha(self, text):
         """Определение пола через Natasha"""
@@ -54,31 +111,13 @@ class GenderAnalyzer:
 
         text_lower = text.lower()
 
-        if mode == 'first_name':
-            if text_lower in NAME_MALE_EXCEPTIONS:
-                return 'male'
-            if any(text_lower.endswith(end) for end in MALE_NAME_ENDS):
-                return 'male'
-            if any(text_lower.endswith(end) for end in FEMALE_NAME_ENDS):
-                return 'female'
-
-        elif mode == 'last_name':
-            if any(text_lower.endswith(end) for end in MALE_SURNAME_ENDS):
-                return 'male'
-            if any(text_lower.endswith(end) for end in FEMALE_SURNAME_ENDS):
-                return 'female'
-
-        elif mode == 'middle_name':
-            if any(text_lower.endswith(end) for end in MALE_MIDDLE_NAME_ENDS):
-                return 'male'
-            if any(text_lower.endswith(end) for end in FEMALE_MIDDLE_NAME_ENDS):
-                return 'female'
-            if text_lower.endswith('на'):
-                return 'female'
-            if text_lower.endswith('ич') or text_lower.endswith('ыч'):
-                return 'male'
+        if mode == 'first_name' and text_lower in MALE_NAME_EXCEPTIONS:
+            return 'male'
 
-        return None
+        trie = SUFFIX_TRIES.get(mode)
+        if trie is None:
+            return None
+        return _match_suffix(trie, text_lower)
 
     def detect_gender(self, text, mode):
         """Определение пола с приоритетом Natasha для имен и фамилий"""
@@ -98,14 +137,25 @@ class GenderAnalyzer:
 
         return 'unknown'
 
+    def detect_gender_many(self, texts, mode):
+        """
+        Определение пола для списка значений.
+        Каждое различное значение разбирается один раз, результат раздаётся всем строкам.
+        """
+        resolved = {}
+        for text in texts:
+            if text not in resolved:
+                resolved[text] = self.detect_gender(text, mode)
+        return [resolved[text] for text in texts]
+
 
 def parse_analysis_config(config):
-    """Парсинг конфигурации анализа"""
+    """Парсинг конфигурации анализа (учитываются только колонки имён)"""
     analysis_commands = []
     weights = DEFAULT_WEIGHTS.copy()
 
     for item in config:
-        if len(item) >= 3:
+        if len(item) >= 3 and item[0] in GENDER_FIELDS:
             field_type = item[0]
             column_idx = item[1]
             weight = float(item[2])  # Конвертируем np.float32 в обычный float
@@ -124,106 +174,109 @@ def detect_file_encoding(file_path):
         return result['encoding'] if result['confidence'] > 0.7 else 'utf-8'
 
 
-def analyze_file(file_path, analysis_commands, skip_header=True):
-    """Анализ файла по заданным командам"""
-    analyzer = GenderAnalyzer()
-    global analysis_results
-
-    try:
-        encoding = detect_file_encoding(file_path)
-
-        with open(file_path, 'r', encoding=encoding) as file:
-            reader = csv.reader(file)
-            for row_num, row in enumerate(reader):
-                if skip_header and row_num == 0:
-                    continue
-
-                if row_num not in analysis_results:
-                    analysis_results[row_num] = {}
-
-                for field_type, column_idx in analysis_commands:
-                    if column_idx < len(row):
-                        text = row[column_idx].strip()
-                        if text:
-                            result = analyzer.detect_gender(text, field_type)
-                        else:
-                            result = 'empty'
-                    else:
-                        result = 'no_column'
-
-                    analysis_results[row_num][field_type] = result
-
-    except Exception as e:
-        analysis_results['error'] = str(e)
-
-
-def get_final_verdicts(weights):
-    """Заменяет 'unknown' на 'male' или 'female', учитывая текущую пропорцию полов."""
-    global analysis_results
-    final_results = {}
-
-    # Сначала собираем статистику по уже определённым полу
-    gender_counts = defaultdict(int)
-
-    for row_num, results in analysis_results.items():
-        if isinstance(row_num, int):
-            for field_type, result in results.items():
-                if result in ('male', 'female'):
-                    gender_counts[result] += 1
-
-    # Если нет статистики (все unknown), то 50/50
-    total_known = gender_counts['male'] + gender_counts['female']
-    if total_known == 0:
-        male_prob = 0.5
-        female_prob = 0.5
-    else:
-        male_prob = gender_counts['male'] / total_known
-        female_prob = gender_counts['female'] / total_known
-
-    # Теперь обрабатываем все строки, заменяя unknown с учётом пропорции
-    for row_num, results in analysis_results.items():
-        if isinstance(row_num, int):
-            male_score = 0
-            female_score = 0
-
-            for field_type, result in results.items():
-                weight = weights.get(field_type, 0)
-
-                # Если поле 'unknown', выбираем пол по пропорции
-                if result == 'unknown':
-                    resolved_result = random.choices(
-                        ['male', 'female'],
-                        weights=[male_prob, female_prob]
-                    )[0]
-                else:
-                    resolved_result = result
-
-                # Считаем веса
-                if resolved_result == 'male':
-                    male_score += weight
-                elif resolved_result == 'female':
-                    female_score += weight
-
-            # Определяем итоговый пол
-            final_results[row_num] = (
-                'male' if male_score > female_score
-                else 'female' if female_score > male_score
-                else random.choice(['male', 'female'])  # 50/50 при равенстве
-            )
-
-    return final_results
+def read_frame(file_path):
+    """Чтение файла как таблицы строк (без преобразования типов и пропусков)"""
+    return pd.read_csv(file_path, encoding=detect_file_encoding(file_path), dtype=str, keep_default_na=False)
 
 
-def detect_gender(config, file_path):
-    """Основная функция для определения пола"""
-    global analysis_results
-    analysis_results = {}  # Очищаем предыдущие результаты
+def analyze_frame(df, analysis_commands, analyzer=None, nlp_workers=None):
+    """
+    Пол по каждому полю каждой строки.
+
+    Возвращает int8-матрицу (строки df, команды анализа) с кодами GENDER_*.
+    Пол определяется один раз на каждое различное значение колонки: без
+    analyzer значения разбираются в пуле из nlp_workers процессов (detect.nlp_pool).
+    """
+    field_codes = np.full((len(df), len(analysis_commands)), GENDER_SKIP, dtype=np.int8)
+
+    for j, (field_type, column_idx) in enumerate(analysis_commands):
+        if column_idx >= df.shape[1]:
+            continue
+
+        texts = df.iloc[:, column_idx].fillna('').astype(str).str.strip()
+        inverse, uniques = pd.factorize(texts)
+        if analyzer is not None:
+            genders = analyzer.detect_gender_many(list(uniques), field_type)
+        else:
+            genders = detect_genders(list(uniques), field_type, workers=nlp_workers)
+
+        unique_codes = np.array(
+            [GENDER_CODES.get(gender, GENDER_SKIP) if text else GENDER_SKIP
+             for text, gender in zip(uniques, genders)],
+            dtype=np.int8
+        )
+        field_codes[:, j] = unique_codes[inverse]
+
+    return field_codes
+
+
+def analyze_file(file_path, analysis_commands):
+    """Анализ файла по заданным командам (см. analyze_frame)"""
+    return analyze_frame(read_frame(file_path), analysis_commands)
+
 
+def resolve_verdicts(field_codes, field_weights, seed=None, resolve_unknown=True):
+    """
+    Итоговый пол по строкам: int8-массив GENDER_MALE / GENDER_FEMALE / GENDER_UNKNOWN.
+
+    Неопределённые поля заменяются на 'male' или 'female' с вероятностями,
+    равными текущей пропорции полов, затем поля голосуют с весами field_weights.
+    При равенстве голосов пол выбирается 50/50. С resolve_unknown=False
+    неопределённые поля не голосуют, а ничьи остаются GENDER_UNKNOWN.
+    """
+    rng = np.random.default_rng(seed)
+    resolved = field_codes.copy()
+
+    if resolve_unknown:
+        male_count = np.count_nonzero(field_codes == GENDER_MALE)
+        total_known = male_count + np.count_nonzero(field_codes == GENDER_FEMALE)
+        # Если нет статистики (все unknown), то 50/50
+        male_prob = male_count / total_known if total_known else 0.5
+
+        unknown = resolved == GENDER_UNKNOWN
+        resolved[unknown] = np.where(rng.random(np.count_nonzero(unknown)) < male_prob,
+                                     GENDER_MALE, GENDER_FEMALE)
+
+    weights = np.asarray(field_weights, dtype=np.float64)
+    male_score = ((resolved == GENDER_MALE) * weights).sum(axis=1)
+    female_score = ((resolved == GENDER_FEMALE) * weights).sum(axis=1)
+
+    verdicts = np.full(len(resolved), GENDER_UNKNOWN, dtype=np.int8)
+    verdicts[male_score > female_score] = GENDER_MALE
+    verdicts[female_score > male_score] = GENDER_FEMALE
+
+    if resolve_unknown:
+        ties = verdicts == GENDER_UNKNOWN
+        verdicts[ties] = np.where(rng.random(np.count_nonzero(ties)) < 0.5, GENDER_MALE, GENDER_FEMALE)
+
+    return verdicts
+
+
+def detect_gender_array(config, source, seed=None, resolve_unknown=True, nlp_workers=None):
+    """
+    Определение пола по строкам файла или DataFrame.
+
+    Не хранит состояния между вызовами, поэтому безопасна для параллельных
+    запросов. Возвращает int8-массив кодов GENDER_*, выровненный по строкам
+    DataFrame (без строки заголовков).
+    """
     analysis_commands, weights = parse_analysis_config(config)
-    analyze_file(file_path, analysis_commands)
-    final_verdicts = get_final_verdicts(weights)
+    df = source if isinstance(source, pd.DataFrame) else read_frame(source)
+
+    field_codes = analyze_frame(df, analysis_commands, nlp_workers=nlp_workers)
+    field_weights = [weights.get(field_type, 0) for field_type, _ in analysis_commands]
+    return resolve_verdicts(field_codes, field_weights, seed=seed, resolve_unknown=resolve_unknown)
+
 
-    return final_verdicts
+def gender_label(code):
+    """Код пола -> 'male' / 'female' / None"""
+    return GENDER_LABELS.get(int(code)) if code in (GENDER_MALE, GENDER_FEMALE) else None
+
+
+def detect_gender(config, file_path):
+    """Основная функция для определения пола: {номер строки файла (с 1): 'male'/'female'}"""
+    verdicts = detect_gender_array(config, file_path)
+    return {row_num: GENDER_LABELS[code] for row_num, code in enumerate(verdicts.tolist(), 1)}
 
 
 if __name__ == "__main__":
@@ -234,5 +287,5 @@ if __name__ == "__main__":
         ['middle_name', 2, np.float32(0.2)]
     ]
 
-    result = detect_gender(config, '../mask/fake_data.csv')
-    print("Результаты анализа:", result)
\ No newline at end of file
+    result = detect_gender_array(config, '../mask/fake_data.csv')
+    print("Результаты анализа:", result)
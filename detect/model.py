@@ -14,11 +14,24 @@ from tensorflow.keras.models import Model
 import os
 import pickle
 
-# Создание папки для результатов
-os.makedirs("./res", exist_ok=True)
+RES_DIR = "./res"
+DATASET_PATH = "./res/synthetic_columns.csv"
+
+# Гиперпараметры по умолчанию
+MAX_LEN = 20
+EMBEDDING_DIM = 128
+CONV_FILTERS = 128
+KERNEL_SIZE = 3
+DENSE_UNITS = 128
+EPOCHS = 50
+BATCH_SIZE = 256
+LEARNING_RATE = 2e-3
+PATIENCE = 10
+SEED = 42
+
 
 # Аугментация текста
-def augment_text(text):
+def augment_text(text, rng=random):
     if len(text) < 5:
         variants = [
             text,
@@ -27,98 +40,148 @@ def augment_text(text):
             f' {text} ',
             f'__{text}__'
         ]
-        return random.choice(variants)
+        return rng.choice(variants)
     return text
 
 # Препроцессинг
 def preprocess_text(text):
     return f'^{str(text).lower().strip()}$'
 
-# Загрузка/генерация данных
-try:
-    df = pd.read_csv("./res/synthetic_columns.csv")
-except FileNotFoundError:
-    from dataset import generate_dataset
-    df = generate_dataset(size_per_class=1000)
-    df.to_csv("./res/synthetic_columns.csv", index=False)
-
-df['column_name'] = df['column_name'].apply(preprocess_text).apply(augment_text)
-
-# Кодировка меток
-le = LabelEncoder()
-df['label_enc'] = le.fit_transform(df['label'])
-
-# Токенизация
-tokenizer = Tokenizer(char_level=True, oov_token='<OOV>')
-tokenizer.fit_on_texts(df['column_name'])
-X_seq = tokenizer.texts_to_sequences(df['column_name'])
-max_len = 20
-X_pad = pad_sequences(X_seq, maxlen=max_len, padding='post', truncating='post')
-
-# Разделение
-X_train, X_test, y_train, y_test = train_test_split(X_pad, df['label_enc'], test_size=0.2, random_state=42)
-X_val, X_test, y_val, y_test = train_test_split(X_test, y_test, test_size=0.5, random_state=42)
-
-# Веса классов
-class_weights = class_weight.compute_class_weight('balanced', classes=np.unique(y_train), y=y_train)
-class_weights = dict(enumerate(class_weights))
-
-vocab_size = len(tokenizer.word_index) + 1
-num_classes = len(le.classes_)
-
-inputs = Input(shape=(max_len,))
-x = Embedding(input_dim=vocab_size, output_dim=128, mask_zero=True)(inputs)
-x = Conv1D(128, 3, activation='relu', padding='same')(x)
-x = GlobalMaxPooling1D()(x)
-x = Dropout(0.5)(x)
-x = Dense(128, activation='relu')(x)
-x = Dropout(0.3)(x)
-x = Dense(128, activation='relu')(x)
-x = Dropout(0.2)(x)
-outputs = Dense(num_classes, activation='softmax')(x)
-
-model = Model(inputs=inputs, outputs=outputs)
-model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
-
-# Колбэки
-callbacks = [
-    EarlyStopping(monitor='val_accuracy', patience=10, restore_best_weights=True, mode='max'),
-    ModelCheckpoint(filepath='./res/best_model.h5', monitor='val_accuracy', mode='max', save_best_only=True, verbose=1),
-    ReduceLROnPlateau(monitor='val_loss', factor=0.2, patience=3, min_lr=1e-6, verbose=1)
-]
-
-# Обучение
-history = model.fit(
-    X_train,
-    y_train,
-    epochs=50,
-    batch_size=32,
-    validation_data=(X_val, y_val),
-    callbacks=callbacks,
-    class_weight=class_weights
-)
-
-# Предсказания
-y_pred = model.predict(X_test)
-y_pred_classes = y_pred.argmax(axis=-1)
-
-print("Classification Report:")
-print(classification_report(y_test, y_pred_classes, target_names=le.classes_))
-
-# Сохранение
-model.save("./res/column_classifier_model.h5")
-with open("./res/tokenizer.pkl", "wb") as f:
-    pickle.dump(tokenizer, f)
-with open("./res/label_encoder.pkl", "wb") as f:
-    pickle.dump(le, f)
-pd.to_pickle(history.history, "./res/training_history.pkl")
-
-# Сохранение тестовых и тренировочных данных
-pd.to_pickle(X_test, "./res/X_test.pkl")
-pd.to_pickle(y_test, "./res/y_test.pkl")
-pd.to_pickle(X_train, "./res/X_train.pkl")
-pd.to_pickle(X_val, "./res/X_val.pkl")
-pd.to_pickle(y_train, "./res/y_train.pkl")
-pd.to_pickle(y_val, "./res/y_val.pkl")
-
-print("Модель и вспомогательные файлы сохранены в папке ./res")
+
+def configure_runtime(seed=SEED, threads=None):
+    """
+    Детерминированность и потоки TensorFlow.
+
+    threads=None - все ядра машины. Вызывается до создания модели:
+    после первой операции TensorFlow число потоков не меняется.
+    """
+    threads = threads or os.cpu_count() or 1
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    except RuntimeError:
+        print("TensorFlow уже инициализирован, число потоков не изменено")
+
+    tf.keras.utils.set_random_seed(seed)
+    tf.config.experimental.enable_op_determinism()
+
+
+def load_dataset(dataset_path=DATASET_PATH, size_per_class=1000, seed=SEED):
+    """Загрузка размеченных заголовков, при отсутствии файла - генерация (воспроизводимая по seed)"""
+    try:
+        return pd.read_csv(dataset_path)
+    except FileNotFoundError:
+        from dataset import generate_dataset
+        df = generate_dataset(size_per_class=size_per_class, seed=seed)
+        df.to_csv(dataset_path, index=False)
+        return df
+
+
+def make_dataset(X, y, weights, batch_size, shuffle=False, seed=SEED):
+    """tf.data-конвейер: данные кэшируются в памяти, пакеты готовятся параллельно с обучением"""
+    ds = tf.data.Dataset.from_tensor_slices((X, y, weights)).cache()
+    if shuffle:
+        ds = ds.shuffle(len(X), seed=seed, reshuffle_each_iteration=True)
+    return ds.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def build_model(vocab_size, num_classes, max_len=MAX_LEN, embedding_dim=EMBEDDING_DIM,
+                conv_filters=CONV_FILTERS, kernel_size=KERNEL_SIZE, dense_units=DENSE_UNITS,
+                learning_rate=LEARNING_RATE):
+    inputs = Input(shape=(max_len,))
+    x = Embedding(input_dim=vocab_size, output_dim=embedding_dim, mask_zero=True)(inputs)
+    x = Conv1D(conv_filters, kernel_size, activation='relu', padding='same')(x)
+    x = GlobalMaxPooling1D()(x)
+    x = Dropout(0.5)(x)
+    x = Dense(dense_units, activation='relu')(x)
+    x = Dropout(0.3)(x)
+    x = Dense(dense_units, activation='relu')(x)
+    x = Dropout(0.2)(x)
+    outputs = Dense(num_classes, activation='softmax')(x)
+
+    model = Model(inputs=inputs, outputs=outputs)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+                  loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def train_model(dataset_path=DATASET_PATH, res_dir=RES_DIR, max_len=MAX_LEN, embedding_dim=EMBEDDING_DIM,
+                conv_filters=CONV_FILTERS, kernel_size=KERNEL_SIZE, dense_units=DENSE_UNITS, epochs=EPOCHS,
+                batch_size=BATCH_SIZE, learning_rate=LEARNING_RATE, patience=PATIENCE, seed=SEED, threads=None):
+    """
+    Обучение классификатора заголовков.
+
+    Сохраняет в res_dir модель, токенизатор, кодировщик меток, историю обучения
+    и разбиение данных (те же файлы, что и раньше). При одинаковом seed
+    результат воспроизводим. Возвращает (model, history).
+    """
+    configure_runtime(seed, threads)
+    rng = random.Random(seed)
+
+    # Создание папки для результатов
+    os.makedirs(res_dir, exist_ok=True)
+
+    df = load_dataset(dataset_path, seed=seed)
+    df['column_name'] = df['column_name'].apply(preprocess_text).apply(lambda text: augment_text(text, rng))
+
+    # Кодировка меток
+    le = LabelEncoder()
+    df['label_enc'] = le.fit_transform(df['label'])
+
+    # Токенизация
+    tokenizer = Tokenizer(char_level=True, oov_token='<OOV>')
+    tokenizer.fit_on_texts(df['column_name'])
+    X_seq = tokenizer.texts_to_sequences(df['column_name'])
+    X_pad = pad_sequences(X_seq, maxlen=max_len, padding='post', truncating='post')
+
+    # Разделение
+    X_train, X_test, y_train, y_test = train_test_split(X_pad, df['label_enc'], test_size=0.2, random_state=42)
+    X_val, X_test, y_val, y_test = train_test_split(X_test, y_test, test_size=0.5, random_state=42)
+
+    # Веса классов (как веса примеров: tf.data отдаёт их третьим элементом)
+    class_weights = class_weight.compute_class_weight('balanced', classes=np.unique(y_train), y=y_train)
+    train_weights = class_weights[np.searchsorted(np.unique(y_train), y_train)].astype(np.float32)
+
+    train_ds = make_dataset(X_train, y_train.to_numpy(), train_weights, batch_size, shuffle=True, seed=seed)
+    val_ds = make_dataset(X_val, y_val.to_numpy(), np.ones(len(y_val), dtype=np.float32), batch_size)
+
+    model = build_model(len(tokenizer.word_index) + 1, len(le.classes_), max_len, embedding_dim,
+                        conv_filters, kernel_size, dense_units, learning_rate)
+
+    # Колбэки
+    callbacks = [
+        EarlyStopping(monitor='val_accuracy', patience=patience, restore_best_weights=True, mode='max'),
+        ModelCheckpoint(filepath=os.path.join(res_dir, 'best_model.h5'), monitor='val_accuracy', mode='max',
+                        save_best_only=True, verbose=1),
+        ReduceLROnPlateau(monitor='val_loss', factor=0.2, patience=3, min_lr=1e-6, verbose=1)
+    ]
+
+    # Обучение
+    history = model.fit(train_ds, epochs=epochs, validation_data=val_ds, callbacks=callbacks)
+
+    # Предсказания
+    y_pred = model.predict(X_test, batch_size=batch_size)
+    y_pred_classes = y_pred.argmax(axis=-1)
+
+    print("Classification Report:")
+    print(classification_report(y_test, y_pred_classes, target_names=le.classes_))
+
+    # Сохранение
+    model.save(os.path.join(res_dir, "column_classifier_model.h5"))
+    with open(os.path.join(res_dir, "tokenizer.pkl"), "wb") as f:
+        pickle.dump(tokenizer, f)
+    with open(os.path.join(res_dir, "label_encoder.pkl"), "wb") as f:
+        pickle.dump(le, f)
+    pd.to_pickle(history.history, os.path.join(res_dir, "training_history.pkl"))
+
+    # Сохранение тестовых и тренировочных данных
+    for name, data in (("X_test", X_test), ("y_test", y_test), ("X_train", X_train),
+                       ("X_val", X_val), ("y_train", y_train), ("y_val", y_val)):
+        pd.to_pickle(data, os.path.join(res_dir, f"{name}.pkl"))
+
+    print(f"Модель и вспомогательные файлы сохранены в папке {res_dir}")
+    return model, history
+
+
+if __name__ == "__main__":
+    train_model()
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+NGRAM_MODEL_PATH = './detect/res/ngram_classifier.npz'
+DATASET_PATH = './detect/res/synthetic_columns.csv'
+
+# Параметры признаков: хэшированные символьные n-граммы
+NGRAM_RANGE = (1, 4)
+N_FEATURES = 2 ** 14
+
+
+def preprocess_text(text):
+    """Как в detect/model.py: нижний регистр и маркеры начала и конца строки"""
+    return f'^{str(text).lower().strip()}$'
+
+
+def build_vectorizer():
+    """Векторизатор без обучения: словарь не хранится, n-граммы хэшируются"""
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(analyzer='char', ngram_range=NGRAM_RANGE, n_features=N_FEATURES,
+                             alternate_sign=False, lowercase=False, norm='l2')
+
+
+def split_dataset(df, random_state=42):
+    """
+    Разбиение на train/val/test так же, как в detect/model.py.
+    Индексы train_test_split зависят только от числа строк и random_state,
+    поэтому тестовая часть совпадает с тестовой частью char-CNN.
+    """
+    from sklearn.model_selection import train_test_split
+
+    train, test = train_test_split(df, test_size=0.2, random_state=random_state)
+    val, test = train_test_split(test, test_size=0.5, random_state=random_state)
+    return train, val, test
+
+
+def train_ngram_model(dataset_path=DATASET_PATH, output_path=NGRAM_MODEL_PATH, random_state=42):
+    """
+    Обучение линейного классификатора заголовков на символьных n-граммах.
+
+    Требует scikit-learn, TensorFlow не нужен. Сохраняет в output_path только
+    веса линейной модели (.npz), без pickle объектов scikit-learn.
+    """
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.metrics import classification_report
+
+    df = pd.read_csv(dataset_path)
+    train, val, test = split_dataset(df, random_state)
+
+    vectorizer = build_vectorizer()
+    X_train = vectorizer.transform(train['column_name'].map(preprocess_text))
+
+    classifier = SGDClassifier(loss='log_loss', alpha=1e-6, max_iter=50, tol=1e-4,
+                               class_weight='balanced', random_state=random_state)
+    classifier.fit(X_train, train['label'])
+
+    for name, part in (('Validation', val), ('Test', test)):
+        y_pred = classifier.predict(vectorizer.transform(part['column_name'].map(preprocess_text)))
+        print(f"{name} accuracy: {np.mean(y_pred == part['label'].to_numpy()):.4f}")
+
+    print("Classification Report:")
+    print(classification_report(test['label'], y_pred))
+
+    np.savez_compressed(
+        output_path,
+        coef=classifier.coef_.astype(np.float32),
+        intercept=classifier.intercept_.astype(np.float32),
+        classes=np.array(classifier.classes_, dtype=str),
+        ngram_range=np.array(NGRAM_RANGE),
+        n_features=np.array(N_FEATURES)
+    )
+    print(f"Модель сохранена в: {output_path}")
+    return output_path
+
+
+class NgramHeaderClassifier:
+    """
+    Классификатор заголовков на хэшированных символьных n-граммах.
+
+    Признаки строит HashingVectorizer, вероятности считаются как
+    SGDClassifier(loss='log_loss').predict_proba: сигмоида решающих функций
+    "один против всех", нормированная по строке.
+    """
+
+    def __init__(self, coef, intercept, classes):
+        self.coef_t = np.ascontiguousarray(coef.T)
+        self.intercept = intercept
+        self.classes_ = classes
+        self.vectorizer = build_vectorizer()
+
+    @classmethod
+    def load(cls, path=NGRAM_MODEL_PATH):
+        """Загрузка весов, сохранённых train_ngram_model"""
+        with np.load(path, allow_pickle=False) as data:
+            if (tuple(data['ngram_range']), int(data['n_features'])) != (NGRAM_RANGE, N_FEATURES):
+                raise ValueError("Параметры признаков модели не совпадают с текущими, переобучите модель")
+            return cls(data['coef'], data['intercept'], data['classes'])
+
+    def predict_proba(self, names):
+        """Вероятности классов для списка заголовков, shape (n, num_classes)"""
+        if len(names) == 0:
+            return np.zeros((0, len(self.classes_)), dtype=np.float32)
+
+        features = self.vectorizer.transform([preprocess_text(name) for name in names])
+        scores = features @ self.coef_t + self.intercept
+        proba = 1.0 / (1.0 + np.exp(-scores))
+        return proba / proba.sum(axis=1, keepdims=True)
+
+
+if __name__ == "__main__":
+    train_ngram_model()
@@ -0,0 +1,60 @@
+from functools import lru_cache
+from natasha import MorphVocab, NamesExtractor, AddrExtractor
+
+# Размер LRU-кэша результатов разбора (по числу различных строк)
+NLP_CACHE_SIZE = 100000
+
+
+@lru_cache(maxsize=None)
+def get_morph_vocab():
+    """Общий для процесса MorphVocab, создаётся при первом обращении"""
+    return MorphVocab()
+
+
+@lru_cache(maxsize=None)
+def get_names_extractor():
+    """Общий для процесса NamesExtractor"""
+    return NamesExtractor(get_morph_vocab())
+
+
+@lru_cache(maxsize=None)
+def get_addr_extractor():
+    """Общий для процесса AddrExtractor"""
+    return AddrExtractor(get_morph_vocab())
+
+
+def normalize_text(text):
+    """Ключ кэша разбора: строка без пробелов по краям"""
+    return str(text).strip()
+
+
+@lru_cache(maxsize=NLP_CACHE_SIZE)
+def _parse_name(text):
+    matches = list(get_names_extractor()(text))
+    if not matches:
+        return None
+
+    # Берем первое совпадение
+    fact = matches[0].fact
+    return fact.first, fact.last, fact.middle
+
+
+def parse_name(text):
+    """Разбор имени через Natasha: (first, last, middle) первого совпадения или None"""
+    return _parse_name(normalize_text(text))
+
+
+@lru_cache(maxsize=NLP_CACHE_SIZE)
+def _has_address(text):
+    return next(iter(get_addr_extractor()(text)), None) is not None
+
+
+def has_address(text):
+    """Есть ли в строке адрес по AddrExtractor"""
+    return _has_address(normalize_text(text))
+
+
+def clear_caches():
+    """Очистка кэшей разбора"""
+    _parse_name.cache_clear()
+    _has_address.cache_clear()
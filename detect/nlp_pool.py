@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from detect.nlp import get_morph_vocab, get_names_extractor, get_addr_extractor, parse_name, has_address
+
+# Число процессов NLP-этапа по умолчанию: 1 - разбор в текущем процессе, без пула.
+# Пул включается явно (MASKING_NLP_WORKERS или nlp_workers). Под gunicorn пул
+# создаётся в каждом рабочем процессе со своими словарями pymorphy2, поэтому
+# там его размер стоит выбирать с учётом числа рабочих процессов.
+NLP_WORKERS = max(1, int(os.environ.get('MASKING_NLP_WORKERS', 1)))
+# Меньше этого числа различных значений разбор идёт в текущем процессе:
+# пересылка данных в пул дороже самого разбора
+PARALLEL_MIN_VALUES = 500
+# Число значений в одной задаче пула
+CHUNK_SIZE = 250
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """Инициализатор процесса пула: словари и экстракторы Natasha создаются один раз"""
+    get_morph_vocab()
+    get_names_extractor()
+    get_addr_extractor()
+
+
+@lru_cache(maxsize=None)
+def _gender_analyzer():
+    # Импорт здесь: detect.gender сам использует этот модуль
+    from detect.gender import GenderAnalyzer
+    return GenderAnalyzer()
+
+
+def _gender(text, mode):
+    return _gender_analyzer().detect_gender(text, mode)
+
+
+# Задачи NLP-этапа: имя задачи -> функция от (значение, *аргументы)
+NLP_TASKS = {
+    'parse_name': parse_name,
+    'has_address': has_address,
+    'gender': _gender,
+}
+
+
+def _run_chunk(task, args, chunk):
+    """
+    Выполнение задачи над порцией значений (в процессе пула или в текущем).
+    Значение, на котором разбор упал, получает результат None.
+    """
+    func = NLP_TASKS[task]
+    results = []
+    for value in chunk:
+        try:
+            results.append(func(value, *args))
+        except Exception:
+            results.append(None)
+    return results
+
+
+def get_pool(workers=None):
+    """Общий пул процессов NLP-этапа, пересоздаётся при смене числа процессов"""
+    global _pool, _pool_workers
+    workers = workers or NLP_WORKERS
+
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn: fork из многопоточного сервера может унаследовать захваченные блокировки.
+            # Процессы spawn заново импортируют главный модуль (как __mp_main__), поэтому
+            # у точек запуска не должно быть побочных эффектов при импорте (см. serv/app.py)
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker)
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    """Остановка пула процессов"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_workers = 0
+
+
+def map_distinct(task, values, *args, workers=None):
+    """
+    Результаты задачи NLP_TASKS[task] для каждого значения, в исходном порядке.
+
+    Каждое различное значение обрабатывается один раз. Если различных значений
+    достаточно много и workers != 1, они делятся на порции и разбираются в пуле
+    процессов; порции возвращаются в порядке отправки.
+    """
+    values = list(values)
+    distinct = list(dict.fromkeys(values))
+    workers = workers or NLP_WORKERS
+
+    if workers <= 1 or len(distinct) < PARALLEL_MIN_VALUES:
+        results = _run_chunk(task, args, distinct)
+    else:
+        chunks = [distinct[start:start + CHUNK_SIZE] for start in range(0, len(distinct), CHUNK_SIZE)]
+        pool = get_pool(workers)
+        results = [result
+                   for chunk_results in pool.map(_run_chunk, [task] * len(chunks), [args] * len(chunks), chunks)
+                   for result in chunk_results]
+
+    resolved = dict(zip(distinct, results))
+    return [resolved[value] for value in values]
+
+
+def parse_names(values, workers=None):
+    """parse_name для колонки значений"""
+    return map_distinct('parse_name', values, workers=workers)
+
+
+def has_addresses(values, workers=None):
+    """has_address для колонки значений"""
+    return map_distinct('has_address', values, workers=workers)
+
+
+def detect_genders(values, mode, workers=None):
+    """GenderAnalyzer.detect_gender для колонки значений"""
+    return map_distinct('gender', values, mode, workers=workers)
@@ -0,0 +1,169 @@
+import hashlib
+from functools import lru_cache
+import os
+import numpy as np
+import pandas as pd
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'softmax': lambda x: _softmax(x)
+}
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+@lru_cache(maxsize=32)
+def _file_digest(path, mtime, size):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def source_digest(*paths):
+    """
+    Отпечаток содержимого исходных артефактов (модель, токенизатор, кодировщик меток).
+    Пересчитывается только при изменении времени или размера файла.
+    """
+    parts = []
+    for path in paths:
+        stat = os.stat(path)
+        parts.append(_file_digest(os.path.abspath(path), stat.st_mtime, stat.st_size))
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def stored_digest(numpy_path):
+    """Отпечаток исходных артефактов, записанный в выгрузку (None у старых выгрузок)"""
+    with np.load(numpy_path, allow_pickle=False) as data:
+        return str(data['source_digest']) if 'source_digest' in data.files else None
+
+
+def export_numpy_model(model_path='./detect/res/best_model.h5',
+                       tokenizer_path='./detect/res/tokenizer.pkl',
+                       encoder_path='./detect/res/label_encoder.pkl',
+                       output_path='./detect/res/header_classifier.npz',
+                       max_len=20):
+    """
+    Выгрузка весов best_model.h5 и словаря символов tokenizer.pkl в компактный .npz
+
+    Требует TensorFlow, запускается один раз после обучения модели.
+    """
+    from tensorflow.keras.models import load_model
+    from tensorflow.keras.layers import Embedding, Conv1D, Dense
+
+    model = load_model(model_path)
+    tokenizer = pd.read_pickle(tokenizer_path)
+    encoder = pd.read_pickle(encoder_path)
+
+    arrays = {}
+    dense_activations = []
+    for layer in model.layers:
+        if isinstance(layer, Embedding):
+            arrays['embedding'] = layer.get_weights()[0]
+        elif isinstance(layer, Conv1D):
+            if layer.get_config()['padding'] != 'same':
+                raise ValueError("Поддерживается только Conv1D с padding='same'")
+            arrays['conv_kernel'], arrays['conv_bias'] = layer.get_weights()
+            arrays['conv_activation'] = np.array(layer.get_config()['activation'])
+        elif isinstance(layer, Dense):
+            kernel, bias = layer.get_weights()
+            arrays[f'dense_{len(dense_activations)}_kernel'] = kernel
+            arrays[f'dense_{len(dense_activations)}_bias'] = bias
+            dense_activations.append(layer.get_config()['activation'])
+
+    # Словарь символов: Tokenizer(char_level=True) хранит по индексу на каждый символ
+    chars = [(char, idx) for char, idx in tokenizer.word_index.items() if len(char) == 1]
+    codes = np.array([ord(char) for char, _ in chars], dtype=np.int64)
+    order = np.argsort(codes)
+
+    np.savez(
+        output_path,
+        dense_activations=np.array(dense_activations),
+        vocab_codes=codes[order],
+        vocab_ids=np.array([idx for _, idx in chars], dtype=np.int32)[order],
+        oov_id=np.array(tokenizer.word_index.get(tokenizer.oov_token, 0), dtype=np.int32),
+        max_len=np.array(max_len, dtype=np.int32),
+        classes=np.array(encoder.classes_, dtype=str),
+        source_digest=np.array(source_digest(model_path, tokenizer_path, encoder_path)),
+        **{name: np.asarray(value, dtype=np.float32) if value.dtype.kind == 'f' else value
+           for name, value in arrays.items()}
+    )
+    print(f"Модель выгружена в: {output_path}")
+    return output_path
+
+
+class NumpyHeaderClassifier:
+    """
+    Классификатор заголовков на чистом NumPy.
+
+    Повторяет прямой проход сети из detect/model.py:
+    Embedding -> Conv1D(same) -> GlobalMaxPooling1D -> Dense... -> softmax.
+    Dropout на инференсе не действует. Маска mask_zero=True в Keras 3 не
+    учитывается ни Conv1D, ни GlobalMaxPooling1D, поэтому здесь её тоже нет.
+    """
+
+    def __init__(self, arrays):
+        self.embedding = arrays['embedding']
+        self.conv_kernel = arrays['conv_kernel']
+        self.conv_bias = arrays['conv_bias']
+        self.conv_activation = ACTIVATIONS[str(arrays['conv_activation'])]
+        self.dense = [
+            (arrays[f'dense_{i}_kernel'], arrays[f'dense_{i}_bias'], ACTIVATIONS[str(activation)])
+            for i, activation in enumerate(arrays['dense_activations'])
+        ]
+        self.vocab_codes = arrays['vocab_codes']
+        self.vocab_ids = arrays['vocab_ids']
+        self.oov_id = int(arrays['oov_id'])
+        self.max_len = int(arrays['max_len'])
+        self.classes_ = arrays['classes']
+
+    @classmethod
+    def load(cls, path):
+        """Загрузка классификатора из .npz"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def encode(self, names):
+        """
+        Векторизованная замена texts_to_sequences + pad_sequences(maxlen).
+
+        Как и Tokenizer(char_level=True), переводит строку в нижний регистр,
+        неизвестные символы заменяет на OOV. Как и pad_sequences по умолчанию,
+        оставляет последние max_len символов и дополняет нулями слева.
+        """
+        texts = [str(name).lower()[-self.max_len:] for name in names]
+        if not texts:
+            return np.zeros((0, self.max_len), dtype=np.int32)
+
+        codes = np.array(texts, dtype=f'<U{self.max_len}').view(np.uint32).reshape(len(texts), self.max_len)
+        lengths = np.array([len(text) for text in texts])
+
+        pos = np.searchsorted(self.vocab_codes, codes).clip(max=len(self.vocab_codes) - 1)
+        ids = np.where(self.vocab_codes[pos] == codes, self.vocab_ids[pos], self.oov_id)
+
+        # Выравнивание по правому краю (padding='pre')
+        src = np.arange(self.max_len) - (self.max_len - lengths)[:, None]
+        return np.where(src >= 0, np.take_along_axis(ids, src.clip(min=0), axis=1), 0).astype(np.int32)
+
+    def predict_proba(self, names):
+        """Вероятности классов для списка заголовков, shape (n, num_classes)"""
+        ids = self.encode(names)
+        x = self.embedding[ids]
+
+        width = self.conv_kernel.shape[0]
+        pad_left = (width - 1) // 2
+        x = np.pad(x, ((0, 0), (pad_left, width - 1 - pad_left), (0, 0)))
+        conv = self.conv_bias + sum(
+            x[:, i:i + self.max_len, :] @ self.conv_kernel[i] for i in range(width)
+        )
+        x = self.conv_activation(conv).max(axis=1)
+
+        for kernel, bias, activation in self.dense:
+            x = activation(x @ kernel + bias)
+        return x
+
+
+if __name__ == "__main__":
+    export_numpy_model()
@@ -5,6 +5,7 @@ from tensorflow.keras.preprocessing.sequence import pad_sequences
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import confusion_matrix, classification_report
+from test_cases import UNDEFINED, labeled_test_cases
 
 
 def load_artifacts():
@@ -19,20 +20,27 @@ def load_artifacts():
     }
 
 
+def predict_column_types(texts, artifacts, confidence_threshold=0.5):
+    """
+    Предсказание типов для списка колонок одним вызовом модели
+    Возвращает "не определено" там, где уверенность < confidence_threshold
+    """
+    seq = artifacts['tokenizer'].texts_to_sequences(list(texts))
+    pad = pad_sequences(seq, maxlen=20)
+    pred_proba = artifacts['model'].predict(pad, batch_size=max(len(pad), 32), verbose=0)
+
+    max_proba = pred_proba.max(axis=1)
+    labels = artifacts['le'].classes_[pred_proba.argmax(axis=1)].astype(object)
+    labels[max_proba < confidence_threshold] = UNDEFINED
+    return list(zip(labels, max_proba))
+
+
 def predict_column_type(text, artifacts, confidence_threshold=0.5):
     """
     Предсказание типа колонки с проверкой уверенности
     Возвращает "не определено" если уверенность < confidence_threshold
     """
-    seq = artifacts['tokenizer'].texts_to_sequences([text])
-    pad = pad_sequences(seq, maxlen=20)
-    pred_proba = artifacts['model'].predict(pad, verbose=0)[0]
-
-    max_proba = np.max(pred_proba)
-    if max_proba < confidence_threshold:
-        return "не определено", max_proba
-    else:
-        return artifacts['le'].classes_[np.argmax(pred_proba)], max_proba
+    return predict_column_types([text], artifacts, confidence_threshold)[0]
 
 
 def save_plot_and_report(artifacts):
@@ -82,55 +90,29 @@ def save_plot_and_report(artifacts):
 
 
 def run_and_save_test_cases(artifacts, confidence_threshold=0.5):
-    """Запуск и сохранение тестовых случаев с проверкой уверенности"""
-    test_cases = [
-        "user_inn", "client_inn", "inn_number", "tax_id", "inn_code",
-        "first_name", "user_name", "name", "given_name", "clientname",
-        "lastname", "family_name", "surname", "user_surname", "second_name",
-        "phone", "mobile", "telephone", "contact_number", "phone_num", "user_phone", "client_tel", "cellphone", "phone_code", "whatsapp_num",
-        "middle_name", "отчество", "отчество клиента", "отч.",
-        "fullname", "Фамилия имя отчество", "ФИО", "ФИО клиента",
-        "birth_date", "дата рождения", "date of birth", "др", "birth day", "день рождения", "birthdate", "birth date", "дата_рождения", "birthdata", "день роджения", "birth",
-        "СНИЛС", "snils", "номер снилс", "страховой номер",
-        "kpp", "КПП", "код причины постановки", "kpp_code", "налоговый кпп", "кпп организации", "kpp_number", "кпп юрлица", "причина постановки", "kpp_id",
-        "огрн", "ogrn", "ОГРН", "основной гос номер", "ogrn_number", "регистрационный номер","номер огрн", "гос номер юрлица", "ogrn_code", "единый госреестр", "ogrn_id",
-        "okpo", "окпо", "okpo", "ОКПО", "общероссийский классификатор", "okpo_code", "номер окпо", "классификатор предприятий", "okpo_id",
-        "огрнип", "ogrnip", "ОГРНИП", "огрн ип", "ogrnip_number", "огрн индивидуального предпринимателя", "огрнип код", "ogrnip_code",
-        "email", "почта", "e-mail", "почта пользователя", "mail",
-        "Номер паспорта", "passport num", "паспорт", "паспортные данные", "паспорт клиента",
-        "Серия паспорта", "Серия", "Series", "ser", "passport_ser",
-        "Загран паспорт", "foreign passport number", "загранпаспорт", "загран", "загран номер",
-        "Номер военного билета", "Военник", "Military ticket", "военник номер", "military ID",
-        "билет моряка", "паспорт моряка", "морской паспорт", "seaman's passport","документ моряка", "морской билет",
-        "свидетельство о рождении", "номер свидетельства о рождении", "документ о рождении", "birthday record",
-        "трудовая книга", "номер трудовой книги", "номер трудовой", "трудовая кн",
-        "гос номер", "номер автомобиля", "номер автомобиля", "car number", "автомобильный номер", "автомобиль",
-        "номер кредитного договора", "номер кредитного счета", "кредитный договор номер", "кредитный договор №", "credit account number", "кредитный номер", "кредитный договор", "credit agreement number",
-        "номер банковского договора", "номер договора с банком", "банковский договор номер", "банковский договор №", "bank contract number", "bank agreement number",
-        "номер депозитарного договора", "номер договора депозита", "депозитарный договор номер", "депозитарный договор №", "номер депозитного договора", "deposit contract number", "deposit agreement number", "депозитный номер договора",
-        "номер карты", "депозитная карта", "карта банка", "card number", "номер карточки", "карта"
-        "ненужная информация", "неподходящая  информация", "идентификатор"
-    ]
+    """Запуск и сохранение тестовых случаев (detect/test_cases.py) с проверкой уверенности"""
+    test_cases = labeled_test_cases()
+    predictions = predict_column_types([case for case, _ in test_cases], artifacts, confidence_threshold)
 
     results = []
-    for case in test_cases:
-        pred, proba = predict_column_type(case, artifacts, confidence_threshold)
-        results.append(f"{case.ljust(20)} -> {pred} (уверенность: {proba:.2f})")
+    by_label = {}
+    for (case, expected), (pred, proba) in zip(test_cases, predictions):
+        mark = "" if pred == expected else f"  [ожидалось: {expected}]"
+        line = f"{case.ljust(20)} -> {pred} (уверенность: {proba:.2f}){mark}"
+        results.append(line)
+        by_label.setdefault(expected, []).append(line)
+
+    correct = sum(pred == expected for (_, expected), (pred, _) in zip(test_cases, predictions))
+    summary = f"Верно: {correct} из {len(test_cases)} ({correct / len(test_cases):.2%})"
 
     with open('./res/test_cases_results.txt', 'w', encoding='utf-8') as f:
-        f.write("\n".join(results))
-
-    # Вывод в консоль с группировкой
-    print("\nINN Predictions:")
-    print("\n".join(results[:5]))
-    print("\nFirst Name Predictions:")
-    print("\n".join(results[5:10]))
-    print("\nLast Name Predictions:")
-    print("\n".join(results[10:15]))
-    print("\nPhone Predictions:")
-    print("\n".join(results[15:25]))
-    print("\nOther Predictions:")
-    print("\n".join(results[25:]))
+        f.write("\n".join(results + ["", summary]))
+
+    # Вывод в консоль с группировкой по ожидаемому типу
+    for label, lines in by_label.items():
+        print(f"\n{label}:")
+        print("\n".join(lines))
+    print(f"\n{summary}")
 
 
 if __name__ == "__main__":
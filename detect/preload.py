@@ -0,0 +1,52 @@
+import gc
+from detect.artifacts import resolve_backend, warm_up
+from detect.nlp import get_morph_vocab, get_names_extractor, get_addr_extractor
+
+
+def preload_nlp():
+    """Загрузка словарей pymorphy2 и экстракторов Natasha, общих для detect.valid и detect.gender"""
+    get_morph_vocab()
+    get_names_extractor()
+    get_addr_extractor()
+
+
+def freeze_shared_state():
+    """
+    Перенос всех живых объектов в постоянное поколение сборщика мусора.
+
+    После fork сборщик в рабочих процессах не обходит эти объекты и не пишет
+    в их заголовки, поэтому страницы памяти с моделью и словарями остаются
+    общими (copy-on-write) и не копируются в каждый процесс.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def preload_shared_state(backend='auto', nlp=True):
+    """
+    Загрузка модели и словарей в родительском процессе до fork рабочих процессов.
+
+    Keras-модель не загружается: TensorFlow запускает свои потоки при загрузке
+    и не переносит fork, поэтому в этом случае каждый рабочий процесс загрузит
+    её сам при первом запросе. NumPy-выгрузка (python -m detect.numpy_model)
+    и n-граммная модель - обычные массивы NumPy и делятся между процессами.
+    """
+    try:
+        if resolve_backend(backend) == 'keras':
+            print("Keras-модель загружается в рабочих процессах: "
+                  "для общей памяти выгрузите её командой python -m detect.numpy_model")
+        else:
+            warm_up(backend=backend)
+            print("Артефакты модели загружены до запуска рабочих процессов.")
+    except Exception as e:
+        print(f"Не удалось предзагрузить артефакты модели: {e}")
+
+    if nlp:
+        try:
+            preload_nlp()
+            print("Словари Natasha загружены до запуска рабочих процессов.")
+        except Exception as e:
+            print(f"Не удалось предзагрузить словари Natasha: {e}")
+
+    freeze_shared_state()
+
@@ -0,0 +1,96 @@
+import math
+from statistics import NormalDist
+import numpy as np
+
+# Размер первой порции проверяемых значений и предел проверок на колонку
+FIRST_BATCH = 20
+MAX_SAMPLES = 2000
+# Число равных по длине блоков файла, из которых поровну берутся значения
+STRATA = 20
+
+
+def stratified_order(n, strata=STRATA, seed=0, limit=None):
+    """
+    Порядок обхода позиций 0..n-1 для выборочной проверки.
+
+    Позиции делятся на strata последовательных блоков, внутри блока
+    перемешиваются, а затем блоки чередуются. Любой префикс порядка поэтому
+    равномерно покрывает весь файл, а не только его начало.
+
+    limit - сколько первых позиций порядка нужно. Из каждого блока тогда
+    выбирается без повторов лишь столько позиций, сколько попадёт в префикс,
+    и стоимость зависит от limit, а не от n.
+    """
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    strata = max(1, min(strata, n))
+    limit = n if limit is None else min(limit, n)
+
+    # Блок b - позиции [starts[b], starts[b + 1]), как у i * strata // n
+    bounds = (np.arange(strata + 1) * n + strata - 1) // strata
+    starts, sizes = bounds[:-1], np.diff(bounds)
+
+    # Позиций на блок: с запасом на короткие блоки, которые исчерпаются раньше
+    per_block = -(-limit // strata)
+    while np.minimum(sizes, per_block).sum() < limit:
+        per_block *= 2
+    taken = np.minimum(sizes, per_block)
+
+    positions = np.concatenate([start + rng.choice(size, count, replace=False)
+                                for start, size, count in zip(starts, sizes, taken)])
+    block = np.repeat(np.arange(strata), taken)
+    rank = np.arange(len(positions)) - np.repeat(np.cumsum(taken) - taken, taken)
+
+    # Чередование блоков: сначала по одному значению из каждого блока, затем по второму и т.д.
+    return positions[np.lexsort((block, rank))][:limit]
+
+
+def wilson_interval(passed, total, confidence=0.95):
+    """Доверительный интервал Уилсона для доли прошедших проверку значений"""
+    if total == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    p = passed / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def sequential_pass_rate(check, n, threshold=0.6, confidence=0.95, max_samples=MAX_SAMPLES,
+                         first_batch=FIRST_BATCH, seed=0):
+    """
+    Выборочная оценка доли прошедших проверку значений с ранней остановкой.
+
+    check(positions) проверяет значения на переданных позициях и возвращает
+    булев массив. Значения берутся порциями (каждая следующая вдвое больше)
+    в порядке stratified_order. Проверка останавливается, как только
+    доверительный интервал целиком выше или ниже threshold, либо после
+    max_samples значений.
+    """
+    order = stratified_order(n, seed=seed, limit=max_samples)
+
+    passed = 0
+    checked = 0
+    lower, upper = 0.0, 1.0
+    batch = first_batch
+    while checked < len(order):
+        positions = order[checked:checked + batch]
+        passed += int(np.count_nonzero(check(positions)))
+        checked += len(positions)
+        batch *= 2
+
+        lower, upper = wilson_interval(passed, checked, confidence)
+        if lower >= threshold or upper < threshold:
+            break
+
+    return {
+        'passed': passed,
+        'checked': checked,
+        'order': order[:checked],
+        'confidence_interval': (lower, upper),
+        'decided': lower >= threshold or upper < threshold
+    }
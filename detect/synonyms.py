@@ -0,0 +1,46 @@
+import re
+from detect.dataset import column_types
+
+_SEPARATORS = re.compile(r'[\s_\-]+')
+
+# Уверенность для заголовков, найденных в словаре синонимов
+SYNONYM_CONFIDENCE = 1.0
+
+
+def normalize_synonym(text):
+    """Нормализация заголовка: нижний регистр, '_', '-' и пробелы сводятся к одному пробелу"""
+    return _SEPARATORS.sub(' ', str(text).lower()).strip()
+
+
+def _variants(text):
+    """Варианты написания, которые порождает generate_dataset: с разделителями и слитно"""
+    normalized = normalize_synonym(text)
+    return {normalized, normalized.replace(' ', '')}
+
+
+def build_synonym_index(types=None):
+    """
+    Индекс точного совпадения {нормализованный синоним: тип} по column_types.
+
+    Синонимы, которые встречаются у нескольких типов (например, 'username' у
+    first_name и login), в индекс не попадают и остаются на долю модели.
+    """
+    candidates = {}
+    for label, synonyms in (column_types if types is None else types).items():
+        for synonym in synonyms:
+            for key in _variants(synonym):
+                candidates.setdefault(key, set()).add(label)
+
+    return {key: next(iter(labels)) for key, labels in candidates.items() if key and len(labels) == 1}
+
+
+SYNONYM_INDEX = build_synonym_index()
+
+
+def lookup_synonym(header):
+    """Тип колонки по словарю синонимов или None, если заголовок там не найден"""
+    normalized = normalize_synonym(header)
+    label = SYNONYM_INDEX.get(normalized)
+    if label is None:
+        label = SYNONYM_INDEX.get(normalized.replace(' ', ''))
+    return label
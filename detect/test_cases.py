@@ -0,0 +1,53 @@
+# Размеченные заголовки для проверки классификатора: {тип: [заголовки]}
+TEST_CASES = {
+    "inn": ["user_inn", "client_inn", "inn_number", "tax_id", "inn_code"],
+    "first_name": ["first_name", "user_name", "name", "given_name", "clientname"],
+    "last_name": ["lastname", "family_name", "surname", "user_surname", "second_name"],
+    "phone": ["phone", "mobile", "telephone", "contact_number", "phone_num", "user_phone", "client_tel", "cellphone",
+              "phone_code", "whatsapp_num"],
+    "middle_name": ["middle_name", "отчество", "отчество клиента", "отч."],
+    "full_name": ["fullname", "Фамилия имя отчество", "ФИО", "ФИО клиента"],
+    "birth_date": ["birth_date", "дата рождения", "date of birth", "др", "birth day", "день рождения", "birthdate",
+                   "birth date", "дата_рождения", "birthdata", "день роджения", "birth"],
+    "snils": ["СНИЛС", "snils", "номер снилс", "страховой номер"],
+    "kpp": ["kpp", "КПП", "код причины постановки", "kpp_code", "налоговый кпп", "кпп организации", "kpp_number",
+            "кпп юрлица", "причина постановки", "kpp_id"],
+    "ogrn": ["огрн", "ogrn", "ОГРН", "основной гос номер", "ogrn_number", "регистрационный номер", "номер огрн",
+             "гос номер юрлица", "ogrn_code", "единый госреестр", "ogrn_id"],
+    "okpo": ["okpo", "окпо", "okpo", "ОКПО", "общероссийский классификатор", "okpo_code", "номер окпо",
+             "классификатор предприятий", "okpo_id"],
+    "ogrnip": ["огрнип", "ogrnip", "ОГРНИП", "огрн ип", "ogrnip_number", "огрн индивидуального предпринимателя",
+               "огрнип код", "ogrnip_code"],
+    "email": ["email", "почта", "e-mail", "почта пользователя", "mail"],
+    "passport_number": ["Номер паспорта", "passport num", "паспорт", "паспортные данные", "паспорт клиента"],
+    "passport_series": ["Серия паспорта", "Серия", "Series", "ser", "passport_ser"],
+    "international_passport_number": ["Загран паспорт", "foreign passport number", "загранпаспорт", "загран",
+                                      "загран номер"],
+    "military_ticket_num": ["Номер военного билета", "Военник", "Military ticket", "военник номер", "military ID"],
+    "sailor_ticket_num": ["билет моряка", "паспорт моряка", "морской паспорт", "seaman's passport",
+                          "документ моряка", "морской билет"],
+    "birth_certificate_num": ["свидетельство о рождении", "номер свидетельства о рождении", "документ о рождении",
+                              "birthday record"],
+    "work_book_num": ["трудовая книга", "номер трудовой книги", "номер трудовой", "трудовая кн"],
+    "vehicle_number": ["гос номер", "номер автомобиля", "номер автомобиля", "car number", "автомобильный номер",
+                       "автомобиль"],
+    "nr_credit_account": ["номер кредитного договора", "номер кредитного счета", "кредитный договор номер",
+                          "кредитный договор №", "credit account number", "кредитный номер", "кредитный договор",
+                          "credit agreement number"],
+    "nr_bank_contract": ["номер банковского договора", "номер договора с банком", "банковский договор номер",
+                         "банковский договор №", "bank contract number", "bank agreement number"],
+    "nr_dep_contract": ["номер депозитарного договора", "номер договора депозита", "депозитарный договор номер",
+                        "депозитарный договор №", "номер депозитного договора", "deposit contract number",
+                        "deposit agreement number", "депозитный номер договора"],
+    "card_number": ["номер карты", "депозитная карта", "карта банка", "card number", "номер карточки", "карта"],
+}
+
+# Заголовки без конфиденциальных данных: ожидается "не определено"
+UNDEFINED = "не определено"
+NEGATIVE_CASES = ["ненужная информация", "неподходящая  информация", "идентификатор"]
+
+
+def labeled_test_cases():
+    """Список пар (заголовок, ожидаемый тип) в порядке TEST_CASES, затем отрицательные примеры"""
+    cases = [(header, label) for label, headers in TEST_CASES.items() for header in headers]
+    return cases + [(header, UNDEFINED) for header in NEGATIVE_CASES]
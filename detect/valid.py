@@ -1,17 +1,33 @@
 import re
+import numpy as np
 from pandas.api.types import is_numeric_dtype
 from email_validator import validate_email, EmailNotValidError
+from detect.checksum import inn_mask, snils_mask, ogrn_mask, ogrnip_mask, kpp_mask, okpo_mask
+from detect.sampling import MAX_SAMPLES, sequential_pass_rate
 
 TOP_FIELD = 20
 
-from natasha import (
-    NamesExtractor,
-    MorphVocab,
-    AddrExtractor
-)
-
-morph_vocab = MorphVocab()
-extractor = NamesExtractor(morph_vocab)
+from detect.nlp import parse_name, has_address
+from detect.nlp_pool import parse_names, has_addresses
+
+# Шаблоны проверок компилируются один раз при импорте и используются
+# как поштучными validate_*, так и векторной проверкой колонок
+BIRTH_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}|\d{2}\.\d{2}\.\d{4}|\d{4}/\d{2}/\d{2}|\d{8}|\d{4} год')
+PHONE_RE = re.compile(r'[\d\+\(\)\s\-]{7,20}')
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
+INTERNATIONAL_PASSPORT_RE = re.compile(r'[АВЕКМНОРСТУХ]{2}\d{6}')
+MILITARY_TICKET_RE = re.compile(r'^[А-ЯЁ]{2}\d{7}$')
+BIRTH_CERTIFICATE_RE = re.compile(r'[А-ЯЁ]{2}.*\d{6}')
+SIX_DIGITS_RE = re.compile(r'\d{6}')
+THREE_DIGITS_RE = re.compile(r'\d{3}')
+TWO_CYRILLIC_RE = re.compile(r'[А-ЯЁ]{2}')
+CARD_NUMBER_RE = re.compile(r'(?:\d[ -]?){12,18}\d')
+ACCOUNT_NUMBER_RE = re.compile(r'(?:\d[ -]?){16,}')
+INVESTOR_CODE_RE = re.compile(r'(?:[A-Z]{2}[ -]?)?(?:\d[ -]?){6,}')
+LOGIN_RE = re.compile(r'^[a-zA-Z0-9_\-.]{3,}$')
+IP_RE = re.compile(r'^((25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}(25[0-5]|2[0-4]\d|[01]?\d\d?)$'
+                   r'|^([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$')
+DOMAIN_RE = re.compile(r'^[a-zA-Z0-9\-]+(\.[a-zA-Z0-9\-]+)+$')
 
 
 def is_name(text, key):
@@ -25,21 +41,26 @@ def is_name(text, key):
     Возвращает:
         bool: True если строка соответствует указанному типу имени
     """
-    matches = list(extractor(text))
-    if not matches:
+    # Разбор кэшируется в detect.nlp: повторяющиеся значения не разбираются заново
+    match = parse_name(text)
+    if match is None:
         return False
 
-    # Берем первое совпадение
-    match = matches[0].fact
+    return _name_has_key(match, key)
+
+
+def _name_has_key(match, key):
+    """Есть ли в разобранном имени (first, last, middle) часть, нужная для типа key"""
+    first, last, middle = match
 
     if key == 'first_name':
-        return bool(match.first)
+        return bool(first)
     elif key == 'last_name':
-        return bool(match.last)
+        return bool(last)
     elif key == 'middle_name':
-        return bool(match.middle)
+        return bool(middle)
     elif key == 'full_name':
-        return bool(match.first and match.last)
+        return bool(first and last)
     else:
         raise ValueError("Неподдерживаемый ключ. Используйте: 'first_name', 'last_name', 'middle_name', 'full_name'")
 
@@ -159,8 +180,7 @@ def validate_email_address(email_str):
         pass
 
     # Альтернативная проверка через regex (менее строгая)
-    regex_pattern = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-    return re.fullmatch(regex_pattern, email) is not None
+    return EMAIL_RE.fullmatch(email) is not None
 
 def validate_snils(snils_str):
     """
@@ -231,11 +251,7 @@ def validate_international_passport_number(passport_str: str) -> bool:
     digits_part = cleaned[2:]
 
     # Проверяем что первые 2 символа - русские буквы из допустимого набора
-    valid_letters = {'А', 'В', 'Е', 'К', 'М', 'Н', 'О', 'Р', 'С', 'Т', 'У', 'Х'}
-    if not all(c in valid_letters for c in letters_part):
-        return False
-
-    return digits_part.isdigit() and len(digits_part) == 6
+    return INTERNATIONAL_PASSPORT_RE.fullmatch(letters_part + digits_part) is not None
 
 
 def validate_military_ticket_number(ticket_str):
@@ -250,31 +266,29 @@ def validate_military_ticket_number(ticket_str):
     cleaned = re.sub(r'\s', '', ticket_str).upper()
 
     # Проверяем формат: 2 буквы + 7 цифр
-    return bool(re.fullmatch(r'^[А-ЯЁ]{2}\d{7}$', cleaned))
+    return bool(MILITARY_TICKET_RE.fullmatch(cleaned))
 
 def validate_birth_certificate_number_simple(value: str) -> bool:
     """
     Возвращает True, если строка содержит 2 заглавные кириллические буквы и 6 цифр.
     Иначе — False.
     """
-    pattern = r'[А-ЯЁ]{2}.*\d{6}'
-    return bool(re.search(pattern, value.strip()))
+    return bool(BIRTH_CERTIFICATE_RE.search(value.strip()))
 
 def validate_work_book_number(value: str) -> bool:
     """
     Возвращает True, если строка содержит 6 цифр подряд.
     Иначе — False.
     """
-    pattern = r'\d{6}'
-    return bool(re.search(pattern, value.strip()))
+    return bool(SIX_DIGITS_RE.search(value.strip()))
 
 def validate_vehicle_number(value: str) -> bool:
     """
     Возвращает True, если строка содержит хотя бы 3 цифры и 2 кириллические буквы.
     Иначе — False.
     """
-    has_digits = re.search(r'\d{3}', value)
-    has_letters = re.search(r'[А-ЯЁ]{2}', value.upper())
+    has_digits = THREE_DIGITS_RE.search(value)
+    has_letters = TWO_CYRILLIC_RE.search(value.upper())
     return bool(has_digits and has_letters)
 
 def validate_credit_agreement(value: str) -> bool:
@@ -282,18 +296,17 @@ def validate_credit_agreement(value: str) -> bool:
     Возвращает True, если строка содержит хотя бы 6 цифры и 2 кириллические буквы.
     Иначе — False.
     """
-    has_digits = re.search(r'\d{6}', value)
-    has_letters = re.search(r'[А-ЯЁ]{2}', value.upper())
+    has_digits = SIX_DIGITS_RE.search(value)
+    has_letters = TWO_CYRILLIC_RE.search(value.upper())
     return bool(has_digits and has_letters)
 
 def validate_card_number(value: str) -> bool:
     """
-    Проверяет, содержит ли строка номер карты (16+ цифр).
+    Проверяет, содержит ли строка номер карты (13-19 цифр).
     Возвращает True если условие выполняется, иначе False.
     """
-    # Ищем последовательность из 16+ цифр, возможно с разделителями
-    pattern = r'(?:\d[ -]?){16,}'
-    return bool(re.fullmatch(pattern, value))
+    # Ищем последовательность из 13-19 цифр, возможно с разделителями
+    return bool(CARD_NUMBER_RE.fullmatch(value))
 
 def validate_account_number(value: str) -> bool:
     """
@@ -301,16 +314,14 @@ def validate_account_number(value: str) -> bool:
     Возвращает True если условие выполняется, иначе False.
     """
     # Ищем последовательность из 20+ цифр, возможно с разделителями
-    pattern = r'(?:\d[ -]?){16,}'
-    return bool(re.fullmatch(pattern, value))
+    return bool(ACCOUNT_NUMBER_RE.fullmatch(value))
 
 def validate_investor_code(value: str) -> bool:
     """
-    Проверяет, содержит ли строка код инвестора (6+ цифр).
+    Проверяет, содержит ли строка код инвестора (6+ цифр, возможно с кодом страны: RU-123-456789).
     Возвращает True если условие выполняется, иначе False.
     """
-    pattern = r'(?:\d[ -]?{6,})'
-    return bool(re.fullmatch(pattern, value))
+    return bool(INVESTOR_CODE_RE.fullmatch(value))
 
 
 def validate_address(text: str) -> bool:
@@ -323,19 +334,14 @@ def validate_address(text: str) -> bool:
     Returns:
         bool: True если строка содержит адрес, иначе False
     """
-    morph_vocab = MorphVocab()
-    addr_extractor = AddrExtractor(morph_vocab)
-
-    matches = list(addr_extractor(text))
-    return len(matches) > 0
+    return has_address(text)
 
 def validate_login(value: str) -> bool:
     """
     Проверяет, соответствует ли строка формату логина (3+ символов: буквы, цифры, _-.).
     Возвращает True, если условие выполняется, иначе False.
     """
-    pattern = r'^[a-zA-Z0-9_\-.]{3,}$'
-    return bool(re.fullmatch(pattern, value))
+    return bool(LOGIN_RE.fullmatch(value))
 
 
 def validate_ip(value: str) -> bool:
@@ -343,12 +349,8 @@ def validate_ip(value: str) -> bool:
     Проверяет, является ли строка IPv4 или IPv6 адресом.
     Возвращает True, если условие выполняется, иначе False.
     """
-    # IPv4 (e.g., 192.168.1.1)
-    ipv4_pattern = r'^((25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}(25[0-5]|2[0-4]\d|[01]?\d\d?)$'
-    # IPv6 (упрощенная проверка)
-    ipv6_pattern = r'^([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$'
-
-    return bool(re.fullmatch(ipv4_pattern, value) or re.fullmatch(ipv6_pattern, value))
+    # IPv4 (e.g., 192.168.1.1) или IPv6 (упрощенная проверка)
+    return bool(IP_RE.fullmatch(value))
 
 
 def validate_domain(value: str) -> bool:
@@ -362,168 +364,297 @@ def validate_domain(value: str) -> bool:
 
     Возвращает True, если соответствует формату, иначе False.
     """
-    pattern = r'^[a-zA-Z0-9\-]+(\.[a-zA-Z0-9\-]+)+$'
-    return bool(re.fullmatch(pattern, value))
-
-def validate_column_data(column_data, column_type):
-    samples = column_data.head(TOP_FIELD).dropna().astype(str).tolist()
-
-    validation_rules = {
-        'birth_date': {
-            'check': lambda x: (
-                    re.fullmatch(r'^\d{4}-\d{2}-\d{2}$', x.strip()) or
-                    re.fullmatch(r'^\d{2}\.\d{2}\.\d{4}$', x.strip()) or
-                    re.fullmatch(r'^\d{4}/\d{2}/\d{2}$', x.strip()) or
-                    re.fullmatch(r'^\d{8}$', x.strip()) or
-                    re.fullmatch(r'^\d{4} год$', x.strip()) or
-                    is_name(x, 'birth_date')
-            ),
-            'description': 'дата в формате ГГГГ-ММ-ДД, ДД.ММ.ГГГГ, YYYYMMDD или текст (например, "12 мая 1990")'
-        },
-        'phone': {
-            'check': lambda x: re.fullmatch(r'^[\d\+\(\)\s\-]{7,20}$', x.strip()) is not None,
-            'description': '7-20 цифр с возможными +, (), -'
-        },
-        'first_name': {
-            'check': lambda x: is_name(x, 'first_name'),
-            'description': 'корректное имя (например, "Иван")'
-        },
-        'last_name': {
-            'check': lambda x: is_name(x, 'last_name'),
-            'description': 'корректная фамилия (например, "Иванов")'
-        },
-        'middle_name': {
-            'check': lambda x: is_name(x, 'middle_name'),
-            'description': 'корректное отчество (например, "Иванович")'
-        },
-        'full_name': {
-            'check': lambda x: is_name(x, 'full_name'),
-            'description': 'полное ФИО (например, "Иванов Иван Иванович")'
-        },
-        'inn': {
-            'check': lambda x: validate_inn(x),
-            'description': '10 или 12 цифр с корректными контрольными суммами'
-        },
-        'snils': {
-            'check': lambda x: validate_snils(x),
-            'description': '11 цифр (формат XXX-XXX-XXX YY) с корректной контрольной суммой'
-        },
-        'ogrn': {
-            'check': lambda x: validate_ogrn(x),
-            'description': '13 цифр с корректной контрольной суммой (для юр. лиц)'
-        },
-        'ogrnip': {
-            'check': lambda x: validate_ogrnip(x),
-            'description': '15 цифр с корректной контрольной суммой (для ИП)'
-        },
-        'kpp': {
-            'check': lambda x: validate_kpp(x),
-            'description': '9 цифр с корректным кодом причины постановки'
-        },
-        'okpo': {
-            'check': lambda x: validate_okpo(x),
-            'description': '8 цифр (юр. лица) или 10 цифр (ИП) с контрольной суммой'
-        },
-        'passport_number': {
-            'check': lambda x: validate_passport_number(x),
-            'description': 'корректный номер паспорта (содержит от 6 цифр)'
-        },
-        'passport_series': {
-            'check': lambda x: validate_passport_series(x),
-            'description': 'корректный серия паспорта (4 цифры)'
-        },
-        'international_passport_number':{
-            'check': lambda x: validate_international_passport_number(x),
-            'description': 'корректный номер загран. паспорта (содержит 2 буквы и 6 цифр)'
-        },
-        'military_ticket_num':{
-            'check': lambda x: validate_military_ticket_number(x),
-            'description': 'корректный номер военного билета (содержит 2 буквы и 7 цифр)'
-        },
-        'sailor_ticket_num':{
-            'check': lambda x: validate_military_ticket_number(x),
-            'description': 'корректный номер билета моряка (содержит 2 буквы и 7 цифр)'
-        },
-        'birth_certificate_num':{
-            'check': lambda x: validate_birth_certificate_number_simple(x),
-            'description': 'корректное свидетельство о рождении (содержит 2 буквы и 6 цифр)'
-        },
-        'work_book_num':{
-            'check': lambda x: validate_work_book_number(x),
-            'description': 'корректная трудовая книга (содержит 6 цифр)'
-        },
-        'vehicle_number':{
-            'check': lambda x: validate_vehicle_number(x),
-            'description': 'корректный номер автомобиля (3 цифры и хотя бы 2 буквы)'
-        },
-        'email': {
-            'check': lambda x: validate_email_address(x),
-            'description': 'корректный email адрес (например, user@example.com)'
-        },
-        'nr_credit_account': {
-            'check': lambda x: validate_credit_agreement(x),
-            'description': 'корректный номер кредитного договора (2 буквы, 6 цифр)'
-        },
-        'nr_bank_contract': {
-            'check': lambda x: validate_credit_agreement(x),
-            'description': 'корректный номер банковского договора (2 буквы, 6 цифр)'
-        },
-        'nr_dep_contract': {
-            'check': lambda x: validate_credit_agreement(x),
-            'description': 'корректный номер депозитарного договора (2 буквы, 6 цифр)'
-        },
-        'card_number': {
-            'check': lambda x: validate_card_number(x),
-            'description': 'корректный номер карты (от 16 цифр)'
-        },
-        'bank_account_number': {
-            'check': lambda x: validate_account_number(x),
-            'description': 'корректный номер банковского счета (от 20 цифр)'
-        },
-        'investor_code': {
-            'check': lambda x: validate_investor_code(x),
-            'description': 'корректный код инвестора (от 6 цифр)'
-        },
-        'address': {
-            'check': lambda x: validate_address(x),
-            'description': 'корректный адрес'
-        },
-        'login': {
-            'check': lambda x: validate_login(x),
-            'description': 'корректный логин'
-        },
-        'ip': {
-            'check': lambda x: validate_ip(x),
-            'description': 'корректный IP (является IPv4 или IPv6)'
-        },
-        'uri': {
-            'check': lambda x: validate_domain(x),
-            'description': 'корректный домен (в конце точка и символы)'
-        }
+    return bool(DOMAIN_RE.fullmatch(value))
+
+def _safe_check(check, value):
+    """Поштучная проверка: ошибка проверки считается непрошедшим значением"""
+    try:
+        return bool(check(value))
+    except Exception:
+        return False
+
+
+def _fullmatch(regex, strip=False):
+    """Векторная проверка: полное совпадение каждого значения с шаблоном"""
+    def vector(values):
+        if strip:
+            values = values.str.strip()
+        return values.str.fullmatch(regex).to_numpy(dtype=bool)
+    return vector
+
+
+def _digit_count(check):
+    """Векторная проверка по числу цифр в значении"""
+    return lambda values: check(values.str.count(r'\d').to_numpy())
+
+
+def _email_vector(values):
+    """regex отбирает заведомо валидные адреса, остальные проверяет email-validator"""
+    mask = values.str.strip().str.fullmatch(EMAIL_RE).to_numpy(dtype=bool)
+    for pos in np.flatnonzero(~mask):
+        mask[pos] = _safe_check(validate_email_address, values.iat[pos])
+    return mask
+
+
+def _international_passport_vector(values):
+    cleaned = values.str.replace(r'[^\w]', '', regex=True).str.upper()
+    return cleaned.str.fullmatch(INTERNATIONAL_PASSPORT_RE).to_numpy(dtype=bool)
+
+
+def _military_ticket_vector(values):
+    cleaned = values.str.replace(r'\s', '', regex=True).str.upper()
+    return cleaned.str.fullmatch(MILITARY_TICKET_RE).to_numpy(dtype=bool)
+
+
+def _digits_and_letters(digits_re):
+    """Векторная проверка: есть группа цифр и 2 кириллические буквы"""
+    def vector(values):
+        has_digits = values.str.contains(digits_re).to_numpy(dtype=bool)
+        has_letters = values.str.upper().str.contains(TWO_CYRILLIC_RE).to_numpy(dtype=bool)
+        return has_digits & has_letters
+    return vector
+
+
+def _contains(regex, strip=False):
+    def vector(values):
+        if strip:
+            values = values.str.strip()
+        return values.str.contains(regex).to_numpy(dtype=bool)
+    return vector
+
+
+def _names_batch(key):
+    """Проверка is_name(x, key) для колонки через NLP-этап с пулом процессов"""
+    def batch(values, workers=None):
+        return np.array([match is not None and _name_has_key(match, key)
+                         for match in parse_names(values, workers=workers)], dtype=bool)
+    return batch
+
+
+def _address_batch(values, workers=None):
+    return np.array([bool(found) for found in has_addresses(values, workers=workers)], dtype=bool)
+
+
+# Реестр правил валидации, собирается один раз при импорте.
+#   check       - поштучная проверка строки
+#   vector      - та же проверка для всей колонки сразу (pandas Series строк)
+#   nlp         - проверка через Natasha по различным значениям колонки (detect.nlp_pool)
+#   description - описание ожидаемого формата
+VALIDATION_RULES = {
+    'birth_date': {
+        'check': lambda x: BIRTH_DATE_RE.fullmatch(x.strip()) is not None,
+        'vector': _fullmatch(BIRTH_DATE_RE, strip=True),
+        'description': 'дата в формате ГГГГ-ММ-ДД, ДД.ММ.ГГГГ, YYYYMMDD или текст (например, "12 мая 1990")'
+    },
+    'phone': {
+        'check': lambda x: PHONE_RE.fullmatch(x.strip()) is not None,
+        'vector': _fullmatch(PHONE_RE, strip=True),
+        'description': '7-20 цифр с возможными +, (), -'
+    },
+    'first_name': {
+        'check': lambda x: is_name(x, 'first_name'),
+        'nlp': _names_batch('first_name'),
+        'description': 'корректное имя (например, "Иван")'
+    },
+    'last_name': {
+        'check': lambda x: is_name(x, 'last_name'),
+        'nlp': _names_batch('last_name'),
+        'description': 'корректная фамилия (например, "Иванов")'
+    },
+    'middle_name': {
+        'check': lambda x: is_name(x, 'middle_name'),
+        'nlp': _names_batch('middle_name'),
+        'description': 'корректное отчество (например, "Иванович")'
+    },
+    'full_name': {
+        'check': lambda x: is_name(x, 'full_name'),
+        'nlp': _names_batch('full_name'),
+        'description': 'полное ФИО (например, "Иванов Иван Иванович")'
+    },
+    'inn': {
+        'check': validate_inn,
+        'vector': inn_mask,
+        'description': '10 или 12 цифр с корректными контрольными суммами'
+    },
+    'snils': {
+        'check': validate_snils,
+        'vector': snils_mask,
+        'description': '11 цифр (формат XXX-XXX-XXX YY) с корректной контрольной суммой'
+    },
+    'ogrn': {
+        'check': validate_ogrn,
+        'vector': ogrn_mask,
+        'description': '13 цифр с корректной контрольной суммой (для юр. лиц)'
+    },
+    'ogrnip': {
+        'check': validate_ogrnip,
+        'vector': ogrnip_mask,
+        'description': '15 цифр с корректной контрольной суммой (для ИП)'
+    },
+    'kpp': {
+        'check': validate_kpp,
+        'vector': kpp_mask,
+        'description': '9 цифр с корректным кодом причины постановки'
+    },
+    'okpo': {
+        'check': validate_okpo,
+        'vector': okpo_mask,
+        'description': '8 цифр (юр. лица) или 10 цифр (ИП) с контрольной суммой'
+    },
+    'passport_number': {
+        'check': validate_passport_number,
+        'vector': _digit_count(lambda count: count >= 6),
+        'description': 'корректный номер паспорта (содержит от 6 цифр)'
+    },
+    'passport_series': {
+        'check': validate_passport_series,
+        'vector': _digit_count(lambda count: count == 4),
+        'description': 'корректный серия паспорта (4 цифры)'
+    },
+    'international_passport_number': {
+        'check': validate_international_passport_number,
+        'vector': _international_passport_vector,
+        'description': 'корректный номер загран. паспорта (содержит 2 буквы и 6 цифр)'
+    },
+    'military_ticket_num': {
+        'check': validate_military_ticket_number,
+        'vector': _military_ticket_vector,
+        'description': 'корректный номер военного билета (содержит 2 буквы и 7 цифр)'
+    },
+    'sailor_ticket_num': {
+        'check': validate_military_ticket_number,
+        'vector': _military_ticket_vector,
+        'description': 'корректный номер билета моряка (содержит 2 буквы и 7 цифр)'
+    },
+    'birth_certificate_num': {
+        'check': validate_birth_certificate_number_simple,
+        'vector': _contains(BIRTH_CERTIFICATE_RE, strip=True),
+        'description': 'корректное свидетельство о рождении (содержит 2 буквы и 6 цифр)'
+    },
+    'work_book_num': {
+        'check': validate_work_book_number,
+        'vector': _contains(SIX_DIGITS_RE, strip=True),
+        'description': 'корректная трудовая книга (содержит 6 цифр)'
+    },
+    'vehicle_number': {
+        'check': validate_vehicle_number,
+        'vector': _digits_and_letters(THREE_DIGITS_RE),
+        'description': 'корректный номер автомобиля (3 цифры и хотя бы 2 буквы)'
+    },
+    'email': {
+        'check': validate_email_address,
+        'vector': _email_vector,
+        'description': 'корректный email адрес (например, user@example.com)'
+    },
+    'nr_credit_account': {
+        'check': validate_credit_agreement,
+        'vector': _digits_and_letters(SIX_DIGITS_RE),
+        'description': 'корректный номер кредитного договора (2 буквы, 6 цифр)'
+    },
+    'nr_bank_contract': {
+        'check': validate_credit_agreement,
+        'vector': _digits_and_letters(SIX_DIGITS_RE),
+        'description': 'корректный номер банковского договора (2 буквы, 6 цифр)'
+    },
+    'nr_dep_contract': {
+        'check': validate_credit_agreement,
+        'vector': _digits_and_letters(SIX_DIGITS_RE),
+        'description': 'корректный номер депозитарного договора (2 буквы, 6 цифр)'
+    },
+    'card_number': {
+        'check': validate_card_number,
+        'vector': _fullmatch(CARD_NUMBER_RE),
+        'description': 'корректный номер карты (13-19 цифр)'
+    },
+    'bank_account_number': {
+        'check': validate_account_number,
+        'vector': _fullmatch(ACCOUNT_NUMBER_RE),
+        'description': 'корректный номер банковского счета (от 20 цифр)'
+    },
+    'investor_code': {
+        'check': validate_investor_code,
+        'vector': _fullmatch(INVESTOR_CODE_RE),
+        'description': 'корректный код инвестора (от 6 цифр, возможно с кодом страны)'
+    },
+    'address': {
+        'check': validate_address,
+        'nlp': _address_batch,
+        'description': 'корректный адрес'
+    },
+    'login': {
+        'check': validate_login,
+        'vector': _fullmatch(LOGIN_RE),
+        'description': 'корректный логин'
+    },
+    'ip': {
+        'check': validate_ip,
+        'vector': _fullmatch(IP_RE),
+        'description': 'корректный IP (является IPv4 или IPv6)'
+    },
+    'uri': {
+        'check': validate_domain,
+        'vector': _fullmatch(DOMAIN_RE),
+        'description': 'корректный домен (в конце точка и символы)'
     }
+}
+
 
-    if column_type not in validation_rules:
+def validate_series(column_data, column_type, nlp_workers=None):
+    """
+    Проверка всех значений колонки.
+
+    Пустые значения отбрасываются. Возвращает булев массив по непустым значениям.
+    Где возможно, проверка выполняется векторно (str.fullmatch/str.contains,
+    контрольные суммы через матрицы цифр в detect.checksum). Типы на основе NLP
+    разбирают различные значения в пуле из nlp_workers процессов.
+    """
+    rule = VALIDATION_RULES[column_type]
+    values = column_data.dropna().astype(str)
+
+    if 'vector' in rule:
+        return np.asarray(rule['vector'](values), dtype=bool)
+
+    if 'nlp' in rule:
+        return rule['nlp'](values, workers=nlp_workers)
+
+    check = rule['check']
+    return np.fromiter((_safe_check(check, value) for value in values), dtype=bool, count=len(values))
+
+
+def validate_column_data(column_data, column_type, threshold=0.6, confidence=0.95,
+                         max_samples=MAX_SAMPLES, seed=0, nlp_workers=None):
+    """
+    Выборочная валидация колонки.
+
+    Значения берутся равномерно по всему файлу (stratified_order) порциями,
+    проверка останавливается, как только доля прошедших значений с заданной
+    доверительной вероятностью выше или ниже threshold. Так стоимость проверки
+    ограничена и на больших файлах, а отсортированные выгрузки не дают
+    смещённой оценки по первым строкам.
+    """
+    values = column_data.dropna()
+
+    if column_type not in VALIDATION_RULES:
         return {
             'is_valid': None,
             'description': f'Нет правил валидации для типа {column_type}',
-            'sample_data': samples
+            'sample_data': values.head(TOP_FIELD).astype(str).tolist()
         }
 
-    # Проверяем каждое значение
-    passed = 0
-    for value in samples:
-        try:
-            if validation_rules[column_type]['check'](value):
-                passed += 1
-        except:
-            continue
-
-    pass_rate = passed / len(samples) if samples else 0
+    result = sequential_pass_rate(
+        lambda positions: validate_series(values.iloc[positions], column_type, nlp_workers),
+        len(values), threshold=threshold, confidence=confidence, max_samples=max_samples, seed=seed
+    )
+    pass_rate = result['passed'] / result['checked'] if result['checked'] else 0
+    lower, upper = result['confidence_interval']
 
+    description = VALIDATION_RULES[column_type]['description']
     return {
-        'is_valid': pass_rate >= 0.6,  # 60% должны соответствовать
+        'is_valid': pass_rate >= threshold,  # 60% должны соответствовать
         'pass_rate': f"{pass_rate:.0%}",
-        'description': validation_rules[column_type]['description'],
-        'sample_data': samples,
-        'expected_format': validation_rules[column_type]['description']
-    }
\ No newline at end of file
+        'checked': result['checked'],
+        'confidence_interval': (round(lower, 4), round(upper, 4)),
+        'description': description,
+        'sample_data': values.iloc[result['order'][:TOP_FIELD]].astype(str).tolist(),
+        'expected_format': description
+    }
@@ -0,0 +1,101 @@
+import re
+import numpy as np
+from detect.checksum import inn_mask, snils_mask, ogrn_mask, ogrnip_mask, okpo_mask, luhn_mask
+from detect.sampling import stratified_order
+
+# Число значений колонки, по которым определяется тип
+SCAN_SAMPLES = 500
+# Доля значений, которые должны подойти под тип, чтобы колонка считалась им
+CONTENT_THRESHOLD = 0.8
+
+# Форматы значений для определения типа по содержимому.
+# Шаблоны строже правил валидации: колонка с произвольным заголовком
+# должна определяться без ложных срабатываний на обычные числа и коды.
+# Порядок задаёт приоритет при равных долях (сначала более специфичные).
+#   pattern  - полное совпадение значения (без пробелов по краям)
+#   checksum - векторная проверка контрольной суммы (второй этап, только по совпавшим)
+CONTENT_PATTERNS = {
+    'email': {'pattern': r'[A-Za-z0-9_.+\-]+@[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)+'},
+    'ip': {'pattern': r'(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}(?:25[0-5]|2[0-4]\d|[01]?\d\d?)'
+                      r'|(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}'},
+    'uri': {'pattern': r'(?:https?://)?(?:[A-Za-z0-9\-]+\.)+[A-Za-z]{2,}(?:/\S*)?'},
+    'snils': {'pattern': r'\d{3}-?\d{3}-?\d{3}[ \-]?\d{2}', 'checksum': snils_mask},
+    'inn': {'pattern': r'\d{10}|\d{12}', 'checksum': inn_mask},
+    'ogrn': {'pattern': r'\d{13}', 'checksum': ogrn_mask},
+    'ogrnip': {'pattern': r'\d{15}', 'checksum': ogrnip_mask},
+    'okpo': {'pattern': r'\d{8}|\d{10}', 'checksum': okpo_mask},
+    'card_number': {'pattern': r'\d{4}[ \-]?\d{4}[ \-]?\d{4}[ \-]?\d{1,7}', 'checksum': luhn_mask},
+    'bank_account_number': {'pattern': r'\d{5}[ \-]?\d{3}[ \-]?\d[ \-]?\d{11}'},
+    'birth_date': {'pattern': r'\d{4}-\d{2}-\d{2}|\d{2}\.\d{2}\.\d{4}|\d{4}/\d{2}/\d{2}'},
+    'phone': {'pattern': r'(?:\+7|8)[ \-]?\(?\d{3}\)?[ \-]?\d{3}[ \-]?\d{2}[ \-]?\d{2}'},
+    'passport_number': {'pattern': r'\d{2} ?\d{2} ?№? ?\d{6}'},
+    'international_passport_number': {'pattern': r'[АВЕКМНОРСТУХ]{2} ?\d{6}'},
+    'military_ticket_num': {'pattern': r'[А-ЯЁ]{2} ?\d{7}'},
+    'birth_certificate_num': {'pattern': r'[IVXLC]{1,4}-?[А-ЯЁ]{2} ?№? ?\d{6}'},
+    'vehicle_number': {'pattern': r'[АВЕКМНОРСТУХ] ?\d{3} ?[АВЕКМНОРСТУХ]{2} ?\d{2,3}'},
+}
+
+
+def _compile_scanner(patterns):
+    """
+    Один шаблон на все типы.
+
+    Каждый тип - необязательная опережающая проверка с именованной группой
+    в начале строки, поэтому одно совпадение отмечает все подходящие типы сразу,
+    а не только первую подошедшую альтернативу.
+    """
+    parts = [rf'(?:(?=(?P<{col_type}>(?:{rule["pattern"]}))\Z))?' for col_type, rule in patterns.items()]
+    return re.compile(r'\A' + ''.join(parts))
+
+
+SCANNER_RE = _compile_scanner(CONTENT_PATTERNS)
+
+
+def scan_values(values):
+    """
+    Маски совпадения значений с каждым типом из CONTENT_PATTERNS.
+
+    values - pandas Series строк. Первый этап - один проход общим шаблоном,
+    второй - контрольные суммы только для значений, прошедших первый.
+    Возвращает {тип: булев массив}.
+    """
+    matches = values.str.strip().str.extract(SCANNER_RE)
+
+    masks = {}
+    for col_type, rule in CONTENT_PATTERNS.items():
+        mask = matches[col_type].notna().to_numpy().copy()
+        checksum = rule.get('checksum')
+        if checksum is not None and mask.any():
+            candidates = np.flatnonzero(mask)
+            mask[candidates] = checksum(values.iloc[candidates].str.strip())
+        masks[col_type] = mask
+    return masks
+
+
+def scan_column(column_data, types=None, max_samples=SCAN_SAMPLES, seed=0):
+    """
+    Доли значений колонки, подходящих под каждый тип.
+
+    Значения берутся равномерно по всему файлу (stratified_order),
+    пустые отбрасываются. types ограничивает набор типов-кандидатов.
+    """
+    values = column_data.dropna().astype(str)
+    values = values[values.str.strip() != '']
+    if values.empty:
+        return {}
+
+    sample = values.iloc[stratified_order(len(values), seed=seed, limit=max_samples)]
+    masks = scan_values(sample)
+
+    return {col_type: float(mask.mean()) for col_type, mask in masks.items()
+            if types is None or col_type in types}
+
+
+def best_content_type(scores, threshold=CONTENT_THRESHOLD):
+    """Тип с наибольшей долей совпадений не ниже threshold: (тип, доля) или (None, 0.0)"""
+    best_type, best_score = None, 0.0
+    # При равных долях остаётся тип, который раньше в CONTENT_PATTERNS
+    for col_type, score in scores.items():
+        if score >= threshold and score > best_score:
+            best_type, best_score = col_type, score
+    return best_type, best_score
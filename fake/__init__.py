@@ -1,8 +1,11 @@
 from .bank import *
+from .batch import *
 from .birth_date import *
 from .doc_numbers import *
 from .email import *
 from .ids import *
 from .names import *
 from .phone import *
+from .pool import *
+from .templates import *
 from .titles import *
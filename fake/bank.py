@@ -1,9 +1,23 @@
 import asyncio
-from faker import Faker
+from .pool import get_faker
 import random
 import datetime
+import numpy as np
+from .batch import format_digits, get_rng, random_digits
 
-fake = Faker()
+# БИНы карт "Мир" по умолчанию
+MIR_BINS = ("2200", "2201", "2202", "2203", "2204")
+
+# Балансовые счета второго порядка: ФЛ - счета физических лиц, ЮЛ - коммерческих организаций
+BALANCE_ACCOUNTS = {'ФЛ': ("40817",), 'ЮЛ': ("40702", "40701", "40703")}
+# Код валюты счёта (рубль)
+CURRENCY_CODE = "810"
+# Веса контрольного ключа счёта (3 последние цифры БИК + 20 цифр счёта)
+ACCOUNT_KEY_WEIGHTS = np.array([7, 1, 3] * 8)[:23]
+# Позиция контрольного ключа в номере счёта
+ACCOUNT_KEY_POSITION = 8
+
+CONTRACT_PREFIXES = {'credit': 'КД', 'bank': 'НБ', 'depository': 'НД'}
 
 async def validate_agreement_type(agreement_type):
     """Проверка типа договора"""
@@ -14,30 +28,31 @@ async def generate_contract_number(prefix, agreement_type):
     """Общая логика генерации номера договора"""
     await validate_agreement_type(agreement_type)
 
+    fake = get_faker()
     unique_number = fake.random_number(digits=6)  # 6 цифр для уникальности
     current_year = datetime.datetime.now().year
     year = random.choice(range(current_year - 5, current_year + 1))
 
-    return f"{prefix}-{unique_number}-{agreement_type}-{year}"
+    return f"{prefix}-{unique_number:06d}-{agreement_type}-{year}"
 
 async def generate_credit_agreement_number(agreement_type='ФЛ'):
     """Генерация номера кредитного договора"""
     try:
-        return await generate_contract_number('КД', agreement_type)
+        return await generate_contract_number(CONTRACT_PREFIXES['credit'], agreement_type)
     except Exception as e:
         print(f"Произошла ошибка при генерации номера кредитного договора: {e}")
 
 async def generate_bank_contract_number(agreement_type='ФЛ'):
     """Генерация номера договора банковского обслуживания"""
     try:
-        return await generate_contract_number('НБ', agreement_type)
+        return await generate_contract_number(CONTRACT_PREFIXES['bank'], agreement_type)
     except Exception as e:
         print(f"Произошла ошибка при генерации номера банковского договора: {e}")
 
 async def generate_depository_contract_number(agreement_type='ФЛ'):
     """Генерация номера депозитарного договора"""
     try:
-        return await generate_contract_number('НД', agreement_type)
+        return await generate_contract_number(CONTRACT_PREFIXES['depository'], agreement_type)
     except Exception as e:
         print(f"Произошла ошибка при генерации номера депозитарного договора: {e}")
 
@@ -49,51 +64,20 @@ async def generate_valid_card_number(bin: str = "2200", length: int = 16) -> str
         if length not in (13, 16, 19):
             raise ValueError("Длина номера карты должна быть 13, 16 или 19")
 
-        card_number = bin
-        remaining_length = length - len(bin) - 1  # -1 для контрольной цифры
-        card_number += fake.numerify(text="%" * remaining_length)
-
-        total = 0
-        for i, char in enumerate(card_number):
-            digit = int(char)
-            if i % 2 == 0:  # Удваиваем каждую вторую цифру (начиная с 0)
-                doubled = digit * 2
-                total += doubled if doubled < 10 else doubled - 9
-            else:
-                total += digit
-
-        check_digit = (10 - (total % 10)) % 10
-        card_number += str(check_digit)
-
-        formatted_number = " ".join([card_number[i:i+4] for i in range(0, len(card_number), 4)])
-
-        return formatted_number
+        return str(generate_card_number_batch(1, bins=(bin,), length=length)[0])
 
     except Exception as e:
         raise ValueError(f"Ошибка генерации номера карты: {e}")
 
-async def generate_bank_account_number(agreement_type='ФЛ') -> str:
-    """Генерация номера банковского счета в формате IBAN (по законам РФ)"""
+async def generate_bank_account_number(agreement_type='ФЛ', bik=None) -> str:
+    """
+    Генерация номера банковского счета РФ (20 цифр) с верным контрольным ключом.
+    Ключ зависит от БИК банка; если БИК не задан, берётся случайный.
+    """
     try:
         await validate_agreement_type(agreement_type)  # Добавлено await
 
-        # Код страны
-        country_code = "RU"
-
-        # Генерация контрольных цифр (в реальной жизни это вычисляется по алгоритму, но мы генерируем случайно)
-        control_digits = random.randint(10, 99)
-
-        # Генерация БИК банка (8 цифр)
-        bank_bik = fake.random_number(digits=8)
-
-        # Генерация номера счета (для ФЛ 20 цифр, для ЮЛ 20-25)
-        account_number_length = 20 if agreement_type == 'ФЛ' else random.choice([20, 22, 25])
-        account_number = fake.numerify(text="%" * account_number_length)
-
-        # Формирование номера счета
-        bank_account_number = f"{country_code}{control_digits:02d} {bank_bik} {account_number}"
-
-        return bank_account_number
+        return str(generate_bank_account_number_batch(1, agreement_type, bik)[0])
 
     except Exception as e:
         raise ValueError(f"Ошибка генерации номера банковского счета: {e}")
@@ -101,6 +85,8 @@ async def generate_bank_account_number(agreement_type='ФЛ') -> str:
 def generate_investor_code() -> str:
     """Генерация кода инвестора для физического лица"""
     try:
+        fake = get_faker()
+
         # Код страны
         country_code = "RU"
 
@@ -118,6 +104,123 @@ def generate_investor_code() -> str:
     except Exception as e:
         raise ValueError(f"Ошибка генерации кода инвестора: {e}")
 
+def _card_template(length):
+    """Шаблон номера карты: группы по 4 цифры через пробел"""
+    return " ".join("#" * min(4, length - i) for i in range(0, length, 4))
+
+
+def luhn_check_digits(digits):
+    """Контрольные цифры Луна для матрицы цифр без контрольной (n, length - 1)"""
+    # Удваивается каждая вторая цифра, начиная с ближайшей к контрольной
+    doubled = (np.arange(digits.shape[1])[::-1] % 2) == 0
+    weighted = np.where(doubled, digits.astype(np.int64) * 2, digits)
+    weighted = np.where(weighted > 9, weighted - 9, weighted)
+    return ((10 - weighted.sum(axis=1) % 10) % 10).astype(np.uint8)
+
+
+def generate_card_number_batch(n, bins=MIR_BINS, length=16, seed=None):
+    """
+    n номеров карт с верной контрольной цифрой Луна в формате "XXXX XXXX XXXX XXXX".
+    БИН каждой карты выбирается из списка bins (строки цифр, могут быть разной длины).
+    """
+    if length not in (13, 16, 19):
+        raise ValueError("Длина номера карты должна быть 13, 16 или 19")
+    if not bins or not all(str(b).isdigit() and len(str(b)) < length for b in bins):
+        raise ValueError("БИН должен состоять только из цифр и быть короче номера карты")
+
+    rng = get_rng(seed)
+    digits = random_digits(rng, n, length)
+
+    choice = rng.integers(0, len(bins), n)
+    for index, bin in enumerate(bins):
+        rows = choice == index
+        digits[np.ix_(rows, np.arange(len(bin)))] = [int(char) for char in bin]
+
+    digits[:, -1] = luhn_check_digits(digits[:, :-1])
+    return format_digits(digits, _card_template(length))
+
+
+def generate_bik_batch(n, seed=None):
+    """n БИК банков РФ: 04, код региона, подразделение, номер банка 050-999"""
+    rng = get_rng(seed)
+    digits = random_digits(rng, n, 9)
+    digits[:, 0], digits[:, 1] = 0, 4
+    region = rng.integers(1, 100, n)
+    digits[:, 2], digits[:, 3] = region // 10, region % 10
+    bank = rng.integers(50, 1000, n)
+    digits[:, 6], digits[:, 7], digits[:, 8] = bank // 100, bank // 10 % 10, bank % 10
+    return format_digits(digits)
+
+
+def account_control_keys(bik_digits, account_digits):
+    """
+    Контрольные ключи счетов (9-я цифра) по 3 последним цифрам БИК.
+
+    Ключ подбирается так, чтобы сумма младших разрядов произведений цифр
+    (БИК + счёт) на веса 7, 1, 3 делилась на 10.
+    """
+    digits = np.column_stack([bik_digits[:, -3:], account_digits]).astype(np.int64)
+    digits[:, 3 + ACCOUNT_KEY_POSITION] = 0
+    total = ((digits * ACCOUNT_KEY_WEIGHTS) % 10).sum(axis=1)
+    return (total % 10 * 3 % 10).astype(np.uint8)
+
+
+def generate_bank_account_number_batch(n, agreement_type='ФЛ', bik=None, seed=None):
+    """
+    n номеров счетов РФ (20 цифр): балансовый счёт, код валюты, контрольный ключ,
+    номер подразделения и лицевой счёт. Ключ считается по БИК: bik - одна строка
+    для всех счетов, массив из n БИК или None (случайный БИК у каждого счёта).
+    """
+    if agreement_type not in BALANCE_ACCOUNTS:
+        raise ValueError("Тип договора должен быть 'ФЛ' или 'ЮЛ'")
+
+    rng = get_rng(seed)
+    if bik is None:
+        bik = generate_bik_batch(n, rng)
+    biks = np.broadcast_to(np.asarray(bik, dtype='<U9'), (n,))
+    bik_digits = (np.ascontiguousarray(biks).view(np.uint32).reshape(n, 9) - ord('0')).astype(np.uint8)
+
+    balance = BALANCE_ACCOUNTS[agreement_type]
+    prefixes = np.array([[int(char) for char in account + CURRENCY_CODE] for account in balance], dtype=np.uint8)
+
+    digits = random_digits(rng, n, 20)
+    digits[:, :8] = prefixes[rng.integers(0, len(balance), n)]
+    digits[:, ACCOUNT_KEY_POSITION] = account_control_keys(bik_digits, digits)
+    return format_digits(digits)
+
+
+def generate_contract_number_batch(prefix, n, agreement_type='ФЛ', seed=None):
+    """n номеров договоров вида "КД-000123-ФЛ-2024" (номер всегда из 6 цифр)"""
+    if agreement_type not in ['ФЛ', 'ЮЛ']:
+        raise ValueError("Тип договора должен быть 'ФЛ' или 'ЮЛ'")
+
+    rng = get_rng(seed)
+    current_year = datetime.datetime.now().year
+    year = rng.integers(current_year - 5, current_year + 1, n)
+
+    digits = random_digits(rng, n, 10)
+    for i in range(4):
+        digits[:, 6 + i] = year // 10 ** (3 - i) % 10
+    return format_digits(digits, f"{prefix}-######-{agreement_type}-####")
+
+
+def generate_credit_agreement_number_batch(n, agreement_type='ФЛ', seed=None):
+    return generate_contract_number_batch(CONTRACT_PREFIXES['credit'], n, agreement_type, seed)
+
+
+def generate_bank_contract_number_batch(n, agreement_type='ФЛ', seed=None):
+    return generate_contract_number_batch(CONTRACT_PREFIXES['bank'], n, agreement_type, seed)
+
+
+def generate_depository_contract_number_batch(n, agreement_type='ФЛ', seed=None):
+    return generate_contract_number_batch(CONTRACT_PREFIXES['depository'], n, agreement_type, seed)
+
+
+def generate_investor_code_batch(n, seed=None):
+    """n кодов инвестора вида "RU-123-456789" """
+    rng = get_rng(seed)
+    return format_digits(random_digits(rng, n, 9), "RU-###-######")
+
 #async def main():
 #     """Основная функция для демонстрации генерации номеров"""
 #     credit_number = await generate_credit_agreement_number('ФЛ')
@@ -0,0 +1,50 @@
+import numpy as np
+
+
+def get_rng(seed=None):
+    """Генератор NumPy: seed - число, None или уже созданный np.random.Generator"""
+    return np.random.default_rng(seed)
+
+
+def random_digits(rng, n, width, low=0, high=10):
+    """Матрица случайных цифр (n, width) uint8"""
+    return rng.integers(low, high, size=(n, width), dtype=np.uint8)
+
+
+def weighted_sum(digits, weights):
+    """Взвешенная сумма цифр по строкам (по столбцам, без промежуточной матрицы int64)"""
+    total = np.zeros(len(digits), dtype=np.int64)
+    for column, weight in enumerate(weights):
+        if weight:
+            total += digits[:, column].astype(np.int64) * int(weight)
+    return total
+
+
+def control_digit(digits, weights, modulo=11):
+    """Контрольная цифра sum(d * w) % modulo % 10 для каждой строки"""
+    return (weighted_sum(digits, weights) % modulo % 10).astype(np.uint8)
+
+
+def codes_to_strings(codes):
+    """Матрица кодов символов (n, width) -> массив строк; нулевые коды в конце отбрасываются"""
+    codes = np.ascontiguousarray(codes, dtype=np.uint32)
+    return codes.view(f'<U{codes.shape[1]}').ravel()
+
+
+def format_digits(digits, template=None):
+    """
+    Матрица цифр -> массив строк по шаблону.
+
+    В шаблоне '#' - место очередной цифры, остальные символы копируются как есть:
+    format_digits(d, '###-###-### ##') для СНИЛС. Без шаблона цифры идут подряд.
+    """
+    n, width = digits.shape
+    template = template or '#' * width
+    slots = [i for i, char in enumerate(template) if char == '#']
+    if len(slots) != width:
+        raise ValueError(f"В шаблоне {len(slots)} мест для цифр, а цифр {width}")
+
+    codes = np.empty((n, len(template)), dtype=np.uint32)
+    codes[:] = np.array([ord(char) for char in template], dtype=np.uint32)
+    codes[:, slots] = digits + np.uint32(ord('0'))
+    return codes_to_strings(codes)
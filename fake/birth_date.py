@@ -1,10 +1,12 @@
-from faker import Faker
+from .pool import get_faker
 import asyncio
-from datetime import date
+from datetime import date, timedelta
+import numpy as np
+from .batch import get_rng
 
 async def generate_birth_date(locale='ru_RU', min_age=18, max_age=60, as_string=True):
     try:
-        fake = Faker(locale)
+        fake = get_faker(locale)
         birth_date = fake.date_of_birth(minimum_age=min_age, maximum_age=max_age)
         
         if as_string:
@@ -15,6 +17,29 @@ async def generate_birth_date(locale='ru_RU', min_age=18, max_age=60, as_string=
     except Exception as e:
         return f"Ошибка: {e}"
 
+def _years_ago(today, years):
+    """Та же дата years лет назад (29 февраля -> 28 февраля)"""
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        return today.replace(year=today.year - years, day=28)
+
+
+def generate_birth_date_batch(n, min_age=18, max_age=60, as_string=True, seed=None):
+    """
+    n дат рождения для возраста от min_age до max_age лет включительно
+    (тот же диапазон, что у Faker.date_of_birth). Строки 'ГГГГ-ММ-ДД' или объекты date.
+    """
+    today = date.today()
+    start = _years_ago(today, max_age + 1) + timedelta(days=1)
+    end = _years_ago(today, min_age)
+
+    rng = get_rng(seed)
+    dates = np.datetime64(start, 'D') + rng.integers(0, (end - start).days + 1, n)
+    if as_string:
+        return np.datetime_as_string(dates, unit='D')
+    return dates.astype(object)
+
 #
 # async def main():
 #     print(await generate_birth_date())
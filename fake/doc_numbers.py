@@ -1,9 +1,35 @@
 import asyncio
-from faker import Faker
-import random
-import string
+from .pool import get_faker
+from .templates import DOC_LETTERS, ROMAN_NUMERALS, compile_template, generate_from_template
+
+ROMAN_SERIES = '{' + '|'.join(ROMAN_NUMERALS) + '}'
+
+# Шаблоны номеров документов (синтаксис - в fake/templates.py)
+DOC_TEMPLATES = {
+    'passport_number': '%# ## %#####',                           # серия (4 цифры) и номер (6 цифр)
+    'passport_series': '%# ##',
+    'international_passport_number': '[A-Z]{2}№%######',
+    'military_ticket_num': f'[{DOC_LETTERS}]{{2}} #{{7}}',        # 7 цифр с ведущими нулями
+    'birth_certificate_num': f'{ROMAN_SERIES}-[{DOC_LETTERS}]{{2}} № ######',
+    'work_book_num': f'ТК-{ROMAN_SERIES} № ######',
+    'car_certificate': f'## [{DOC_LETTERS}]{{2}} ######',        # СТС
+    'car_passport': f'## [{DOC_LETTERS}]{{2}} ######',           # ПТС
+}
+
+# Массив римских цифр от II до X
+roman_numerals = ROMAN_NUMERALS
+
+
+def generate_doc_number_batch(kind, n, seed=None):
+    """n номеров документа kind (ключ DOC_TEMPLATES)"""
+    if kind not in DOC_TEMPLATES:
+        raise ValueError(f"Неизвестный тип документа: {kind}")
+    return generate_from_template(DOC_TEMPLATES[kind], n, seed)
+
+
+def _doc_number(kind):
+    return compile_template(DOC_TEMPLATES[kind]).one()
 
-fake = Faker('ru_RU')
 
 # Номер паспорта
 async def generate_passport_number() -> str:
@@ -12,9 +38,7 @@ async def generate_passport_number() -> str:
     где первые 4 цифры - серия, последние 6 - номер
     """
     try:
-        series = random.randint(1000, 9999)
-        number = random.randint(100000, 999999)
-        return f"{series // 100} {series % 100} {number}"
+        return _doc_number('passport_number')
     except Exception as e:
         print(f"Ошибка генерации номера паспорта: {e}")
         return "00 00 000000"
@@ -25,8 +49,7 @@ async def generate_passport_series() -> str:
     Генерация серии паспорта (первые 4 цифры)
     """
     try:
-        series = random.randint(1000, 9999)
-        return f"{series // 100} {series % 100}"
+        return _doc_number('passport_series')
     except Exception as e:
         print(f"Ошибка генерации серии паспорта: {e}")
         return "00 00"
@@ -34,95 +57,56 @@ async def generate_passport_series() -> str:
 # Номер загран паспорта
 async def generate_interpass_series_number():
     try:
-        series_letters = fake.bothify(text="??", letters=string.ascii_uppercase)  # 2 случайные буквы
-        
-        number = random.randint(1000000, 9999999)
-        interpass_series_number = f"{series_letters}№{number}"
-        
-        return interpass_series_number
-    
+        return _doc_number('international_passport_number')
     except Exception as e:
         print(f"Произошла ошибка при генерации номера загранпаспорта: {e}")
 
 # Номер военного билета и билета моряка
 async def generate_military_ticket_number():
     try:
-        series = fake.bothify(text="??", letters="АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЭЮЯ")
-        number = f"{fake.random_number(digits=7):07d}"  # 7 цифр с ведущими нулями
-        military_ticket = f"{series} {number}"
-        
-        return military_ticket
-    
+        return _doc_number('military_ticket_num')
     except Exception as e:
         print(f"Произошла ошибка при генерации номера военного билета: {e}")
 
-# Массив римских цифр от II до X
-roman_numerals = ['II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
-
 # Номер свидетельства о рождении
 async def generate_birth_certificate_number():
     try:
-        # Генерация римской цифры от II до X
-        series = random.choice(roman_numerals)
-        letter_series = fake.bothify(text="??", letters="АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЭЮЯ")
-        number = f"{random.randint(0, 999999):06d}"  # 6 цифр с ведущими нулями
-        certificate_number = f"{series}-{letter_series} № {number}"
-        
-        return certificate_number
-    
+        return _doc_number('birth_certificate_num')
     except Exception as e:
         print(f"Произошла ошибка при генерации номера свидетельства о рождении: {e}")
 
 # Номер трудовой книжки
 async def generate_work_book_number():
     try:
-        series = random.choice(roman_numerals)
-        number = f"{random.randint(0, 999999):06d}"  # 6 цифр с ведущими нулями
-        
-        certificate_number = f"ТК-{series} № {number}"
-        
-        return certificate_number
-    
+        return _doc_number('work_book_num')
     except Exception as e:
-        print(f"Произошла ошибка при генерации номера свидетельства о рождении: {e}")
+        print(f"Произошла ошибка при генерации номера трудовой книжки: {e}")
 
 # Регистрационный номер автомобиля
 async def generate_car_license(local='ru_RU'):
     try:
-        fake = Faker(local)
+        fake = get_faker(local)
         license_plate = fake.license_plate()
         return license_plate
     except Exception as e:
         print(f"Произошла ошибка при генерации номера автомобиля: {e}")
 
+def generate_car_license_batch(n, local='ru_RU', seed=None):
+    """Пакетный вариант generate_car_license: список из n номеров"""
+    fake = get_faker(local, seed)
+    return [fake.license_plate() for _ in range(n)]
+
 # Серия, номер СТС транспортного средства
 async def generate_car_certificate(local='ru_RU'):
     try:
-        fake = Faker(local)
-        letter_series = fake.bothify(text="??", letters="АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЭЮЯ")
-        
-        number_1 = f"{random.randint(0, 99):02d}"  
-        number_2 = f"{random.randint(0, 999999):06d}"  # 6 цифр с ведущими нулями
-        
-        certificate_number = f"{number_1} {letter_series} {number_2}"
-        
-        return certificate_number        
+        return _doc_number('car_certificate')
     except Exception as e:
         print(f"Произошла ошибка при генерации СТС автомобиля: {e}")
 
 # Серия, номер ПТС транспортного средства
 async def generate_car_passport(local='ru_RU'):
     try:
-        fake = Faker(local)
-        
-        letter_series = fake.bothify(text="??", letters="АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЭЮЯ")
-        number_1 = f"{random.randint(0, 99):02d}"
-        number_2 = f"{random.randint(0, 999999):06d}"  # 6 цифр с ведущими нулями
-        
-        # Формирование полного номера свидетельства о рождении
-        certificate_number = f"{number_1} {letter_series} {number_2}"
-        
-        return certificate_number        
+        return _doc_number('car_passport')
     except Exception as e:
         print(f"Произошла ошибка при генерации ПТС автомобиля: {e}")
 
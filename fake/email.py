@@ -1,9 +1,9 @@
-from faker import Faker
+from .pool import get_faker
 import asyncio
 
 async def generate_email(locale='en_US', personalized=False):
     try:
-        fake = Faker(locale)
+        fake = get_faker(locale)
         if personalized:
             first = fake.first_name().lower()
             last = fake.last_name().lower()
@@ -14,6 +14,14 @@ async def generate_email(locale='en_US', personalized=False):
     except Exception as e:
         return f"Ошибка: {e}"
     
+def generate_email_batch(n, locale='en_US', personalized=False, seed=None):
+    """Пакетный вариант generate_email: список из n адресов"""
+    fake = get_faker(locale, seed)
+    if personalized:
+        return [f"{fake.first_name().lower()}.{fake.last_name().lower()}@{fake.free_email_domain()}"
+                for _ in range(n)]
+    return [fake.free_email() for _ in range(n)]
+
 #async def main():
 #    print(await generate_email())                        # случайный email
 #    print(await generate_email(personalized=True))       # персонализированный
@@ -1,6 +1,21 @@
-from faker import Faker
+from .pool import get_faker
 import asyncio
 import random
+import numpy as np
+from .batch import control_digit, format_digits, get_rng, random_digits, weighted_sum
+
+# Весовые коэффициенты контрольных цифр
+INN_10_WEIGHTS = [2, 4, 10, 3, 5, 9, 4, 6, 8]
+INN_11_WEIGHTS = [7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
+INN_12_WEIGHTS = [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
+SNILS_WEIGHTS = list(range(9, 0, -1))
+OKPO_WEIGHTS = list(range(1, 8))
+# Остаток числа от деления на m через цифры: sum(d_i * (10^k_i mod m)) mod m
+OGRN_WEIGHTS = [pow(10, 11 - i, 11) for i in range(12)]
+OGRNIP_WEIGHTS = [pow(10, 13 - i, 13) for i in range(14)]
+
+# Коды причины постановки на учёт (5-6 цифры КПП)
+KPP_REASONS = ["01", "02", "43"]
 
 def calculate_snils_control(digits):
     total = sum((9 - i) * d for i, d in enumerate(digits))
@@ -23,20 +38,20 @@ def generate_snils():
 def generate_inn(is_legal_entity=None):
     if is_legal_entity:
         digits = [random.randint(0, 9) for _ in range(9)]
-        control = (sum([v * k for v, k in zip(digits, [2, 4, 10, 3, 5, 9, 4, 6, 8])]) % 11) % 10
+        control = (sum([v * k for v, k in zip(digits, INN_10_WEIGHTS)]) % 11) % 10
         digits.append(control)
         return ''.join(map(str, digits))
     else:
         digits = [random.randint(0, 9) for _ in range(10)]
-        n11 = (sum([v * k for v, k in zip(digits, [7, 2, 4, 10, 3, 5, 9, 4, 6, 8])]) % 11) % 10
+        n11 = (sum([v * k for v, k in zip(digits, INN_11_WEIGHTS)]) % 11) % 10
         digits.append(n11)
-        n12 = (sum([v * k for v, k in zip(digits, [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8, 0])]) % 11) % 10
+        n12 = (sum([v * k for v, k in zip(digits, INN_12_WEIGHTS)]) % 11) % 10
         digits.append(n12)
         return ''.join(map(str, digits))
 
 def generate_ogrn(is_legal_entity):
     if is_legal_entity:
-        digits = [random.randint(1, 9)] + [random.randint(0, 9) for _ in range(12)]
+        digits = [random.randint(1, 9)] + [random.randint(0, 9) for _ in range(11)]
         num = int(''.join(map(str, digits)))
         control = num % 11 % 10
         return ''.join(map(str, digits)) + str(control)
@@ -49,17 +64,99 @@ def generate_ogrn(is_legal_entity):
 def generate_kpp(region_code="77"):
     region = region_code.zfill(2)
     inspectorate = str(random.randint(1, 99)).zfill(2)
-    reason = random.choice(["010", "002", "250"])
-    """ 010 — основное место учета,
-        002 — обособленное подразделение,
-        250 — иностранная организация без филиала, и т.д.
+    reason = random.choice(KPP_REASONS)
+    """ 01 — основное место учета,
+        02 — обособленное подразделение,
+        43 — филиал, и т.д.
     """
-    suffix = str(random.randint(0, 9))
+    suffix = f"{random.randint(1, 999):03d}"
     return f"{region}{inspectorate}{reason}{suffix}"
 
+
+def generate_snils_batch(n, seed=None):
+    """n номеров СНИЛС в формате XXX-XXX-XXX YY с верным контрольным числом"""
+    rng = get_rng(seed)
+    base = random_digits(rng, n, 9)
+
+    # Номера из одинаковых цифр недопустимы
+    same = (base == base[:, :1]).all(axis=1)
+    base[same, 0] = (base[same, 0] + 1) % 10
+
+    control = weighted_sum(base, SNILS_WEIGHTS) % 101 % 100
+    digits = np.column_stack([base, control // 10, control % 10]).astype(np.uint8)
+    return format_digits(digits, '###-###-### ##')
+
+
+def generate_inn_batch(n, is_legal_entity=False, seed=None):
+    """n ИНН: 10 цифр для юр. лиц, 12 для физ. лиц, контрольные цифры по весам ФНС"""
+    rng = get_rng(seed)
+    if is_legal_entity:
+        digits = random_digits(rng, n, 10)
+        digits[:, 9] = control_digit(digits, INN_10_WEIGHTS)
+    else:
+        digits = random_digits(rng, n, 12)
+        digits[:, 10] = control_digit(digits, INN_11_WEIGHTS)
+        digits[:, 11] = control_digit(digits, INN_12_WEIGHTS)
+    return format_digits(digits)
+
+
+def generate_ogrn_batch(n, is_legal_entity=True, seed=None):
+    """n ОГРН (13 цифр, модуль 11) или ОГРНИП (15 цифр, начинается с 3, модуль 13)"""
+    rng = get_rng(seed)
+    if is_legal_entity:
+        digits = random_digits(rng, n, 13)
+        digits[:, 0] = rng.integers(1, 10, n)
+        digits[:, 12] = control_digit(digits, OGRN_WEIGHTS, 11)
+    else:
+        digits = random_digits(rng, n, 15)
+        digits[:, 0] = 3
+        digits[:, 14] = control_digit(digits, OGRNIP_WEIGHTS, 13)
+    return format_digits(digits)
+
+
+def generate_kpp_batch(n, region_code="77", seed=None):
+    """n КПП: код региона, инспекция, причина постановки из KPP_REASONS, номер 001-999"""
+    rng = get_rng(seed)
+    region = [int(char) for char in region_code.zfill(2)]
+
+    digits = random_digits(rng, n, 9)
+    digits[:, 0:2] = region
+    inspectorate = rng.integers(1, 100, n)
+    digits[:, 2], digits[:, 3] = inspectorate // 10, inspectorate % 10
+    reasons = np.array([[int(char) for char in reason] for reason in KPP_REASONS], dtype=np.uint8)
+    digits[:, 4:6] = reasons[rng.integers(0, len(KPP_REASONS), n)]
+    serial = rng.integers(1, 1000, n)
+    digits[:, 6], digits[:, 7], digits[:, 8] = serial // 100, serial // 10 % 10, serial % 10
+    return format_digits(digits)
+
+
+def generate_okpo_batch(n, seed=None):
+    """n кодов ОКПО юр. лиц: 8 цифр, контрольная цифра по весам 1..7"""
+    rng = get_rng(seed)
+    digits = random_digits(rng, n, 8)
+    digits[:, 7] = control_digit(digits, OKPO_WEIGHTS)
+    return format_digits(digits)
+
+
+def generate_identifiers_batch(mode='inn', n=1, is_legal_entity=False, seed=None):
+    """Пакетный вариант generate_identifiers: массив из n идентификаторов типа mode"""
+    if mode == 'inn':
+        return generate_inn_batch(n, is_legal_entity, seed)
+    elif mode == 'okpo':
+        return generate_okpo_batch(n, seed)
+    elif mode == 'ogrn':
+        return generate_ogrn_batch(n, True, seed)
+    elif mode == 'ogrnip':
+        return generate_ogrn_batch(n, False, seed)
+    elif mode == 'snils':
+        return generate_snils_batch(n, seed)
+    elif mode == 'kpp':
+        return generate_kpp_batch(n, seed=seed)
+    raise ValueError("Invalid mode. Choose from 'inn', 'okpo', 'ogrn', 'ogrnip', 'snils', 'kpp'.")
+
 async def generate_identifiers(mode='inn', is_legal_entity=False):
     try:
-        fake = Faker()
+        fake = get_faker()
 
         if mode == 'inn':
             return generate_inn(is_legal_entity)
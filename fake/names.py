@@ -1,11 +1,17 @@
 import asyncio
-from faker import Faker
+from functools import lru_cache
+import numpy as np
+from .batch import get_rng
+from .pool import get_faker
+
+GENDERS = ('male', 'female')
+NAME_MODES = ('all', 'first_name', 'last_name', 'middle_name')
+PERSON_PROVIDER = 'faker.providers.person'
 
 
 async def generate_full_name(mode='all', gender=None, locale='ru_RU'):
     try:
-        print(gender)
-        fake = Faker(locale)
+        fake = get_faker(locale)
         if gender is None:
             gender = 'male' if fake.random_int(0, 1) == 0 else 'female'
 
@@ -33,6 +39,73 @@ async def generate_full_name(mode='all', gender=None, locale='ru_RU'):
     except Exception as e:
         return f"Ошибка: {e}"
 
+@lru_cache(maxsize=None)
+def _name_options(locale, part, gender):
+    """
+    Варианты части имени из провайдера person локали: (массив, веса или None).
+    None, если в локали нет такого списка (например, отчеств в en_US).
+    """
+    provider = next(p for p in get_faker(locale).get_providers() if type(p).__module__.startswith(PERSON_PROVIDER))
+    values = getattr(provider, f"{part}s_{gender}", None)
+    if not values:
+        return None
+    if isinstance(values, dict):
+        weights = np.array(list(values.values()), dtype=float)
+        return np.array(list(values), dtype=object), weights / weights.sum()
+    return np.array(values, dtype=object), None
+
+
+def _resolve_genders(n, gender, rng):
+    """Пол каждой строки: None - случайный, строка - общий, список - свой у каждой строки"""
+    random_genders = np.array(GENDERS, dtype=object)[rng.integers(0, 2, n)]
+    if gender is None:
+        return random_genders
+    if isinstance(gender, str):
+        if gender not in GENDERS:
+            raise ValueError("Пол должен быть 'male' или 'female'")
+        return np.full(n, gender, dtype=object)
+
+    # Неизвестный пол в строке (None, 'unknown') заменяется случайным
+    given = np.asarray(gender, dtype=object)
+    return np.where(np.isin(given, GENDERS), given, random_genders)
+
+
+def _name_parts(part, genders, locale, rng):
+    """Часть имени (first_name, last_name, middle_name) для каждой строки с учётом пола"""
+    result = np.empty(len(genders), dtype=object)
+    for gender in GENDERS:
+        rows = np.flatnonzero(genders == gender)
+        if not len(rows):
+            continue
+        options = _name_options(locale, part, gender)
+        if options is not None:
+            values, weights = options
+            result[rows] = values[rng.choice(len(values), size=len(rows), p=weights)]
+        else:
+            method = getattr(get_faker(locale), f"{part}_{gender}")
+            result[rows] = [method() for _ in range(len(rows))]
+    return result
+
+
+def generate_full_name_batch(n, mode='all', gender=None, locale='ru_RU', seed=None):
+    """
+    Пакетный вариант generate_full_name: массив из n имён.
+    gender - None, 'male'/'female' или список полов по строкам.
+    """
+    if mode not in NAME_MODES:
+        raise ValueError("Неверный режим. Допустимые значения: 'all', 'first_name', 'last_name', 'middle_name'")
+
+    rng = get_rng(seed)
+    genders = _resolve_genders(n, gender, rng)
+
+    if mode != 'all':
+        return _name_parts(mode, genders, locale, rng)
+
+    last_name = _name_parts('last_name', genders, locale, rng)
+    first_name = _name_parts('first_name', genders, locale, rng)
+    middle_name = _name_parts('middle_name', genders, locale, rng)
+    return last_name + ' ' + first_name + ' ' + middle_name
+
 # async def main():
 #     print(await generate_full_name(mode='all', gender='male'))  
 #     print(await generate_full_name(mode='all', gender='female', locale='ru_RU'))
@@ -1,20 +1,46 @@
-from faker import Faker
+from .pool import get_faker
+from .templates import escape, generate_from_template, generate_from_templates
+from functools import lru_cache
 import asyncio
+import numpy as np
+
+PHONE_PROVIDER = 'faker.providers.phone_number'
+
+@lru_cache(maxsize=None)
+def phone_templates(locale='ru_RU'):
+    """
+    Форматы номеров Faker для локали, переведённые в шаблоны fake/templates.py.
+    None, если формат ссылается на другие провайдеры ({{...}}) - тогда номер
+    генерирует сам Faker.
+    """
+    provider = next(p for p in get_faker(locale).get_providers() if type(p).__module__.startswith(PHONE_PROVIDER))
+    templates = []
+    for phone_format in provider.formats:
+        if '{{' in phone_format:
+            return None
+        templates.append(''.join(char if char in '#%!@' else '[2-9]' if char == '$' else escape(char)
+                                 for char in phone_format))
+    return tuple(templates)
+
+
+def generate_phone_number_batch(n, locale='ru_RU', numerify=False, ex='79', seed=None):
+    """n номеров телефона: по шаблону ex + 9 цифр или по форматам локали"""
+    if numerify:
+        return generate_from_template(escape(ex) + '#########', n, seed)
+
+    templates = phone_templates(locale)
+    if templates is None:
+        fake = get_faker(locale, seed)
+        return np.array([fake.phone_number() for _ in range(n)], dtype=str)
+    return generate_from_templates(templates, n, seed)
+
 
 async def generate_phone_number(locale='ru_RU', numerify=False, ex='79'):
     try:
-        fake = Faker(locale)
-        
-        if numerify:
-            # Кастомный шаблон с переданным префиксом (ex)
-            # Например: ex='79' => '790' => +7 90# ### ## ##
-            template = ex + '#########'
-            phone = fake.numerify(template)
-        else:
-            # Стандартный формат из локали
-            phone = fake.phone_number()
-        
-        return phone
+        # Кастомный шаблон с переданным префиксом (ex)
+        # Например: ex='79' => '790' => +7 90# ### ## ##
+        # иначе - стандартный формат из локали
+        return str(generate_phone_number_batch(1, locale, numerify, ex)[0])
 
     except Exception as e:
         return f"Ошибка: {e}"
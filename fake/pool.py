@@ -0,0 +1,55 @@
+import os
+import threading
+import faker.generator
+from faker import Faker
+
+# Экземпляры Faker по потокам: {(locale, seeded): Faker}
+_local = threading.local()
+
+
+def _reseed_after_fork():
+    """
+    Новое состояние общего генератора Faker в дочернем процессе.
+
+    Экземпляры без seed_instance используют модульный faker.generator.random.
+    Python после fork заново инициализирует только генератор модуля random,
+    поэтому без этого все рабочие процессы gunicorn (preload_app) выдавали бы
+    одинаковые подменные значения.
+    """
+    faker.generator.random.seed()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+
+def get_faker(locale=None, seed=None):
+    """
+    Общий экземпляр Faker для локали.
+
+    Создание Faker загружает все провайдеры локали и стоит в сотни раз дороже
+    генерации одного значения, поэтому экземпляр создаётся один раз и
+    переиспользуется. Faker хранит состояние генератора случайных чисел,
+    поэтому у каждого потока свой набор экземпляров.
+
+    С seed возвращается отдельный экземпляр локали (один на все seed), генератор
+    которого заново инициализируется seed_instance при каждом вызове: значения
+    воспроизводимы от вызова get_faker, а число экземпляров не растёт с числом seed.
+    Общий экземпляр без seed при этом не затрагивается.
+    """
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        pool = _local.pool = {}
+
+    key = (locale, seed is not None)
+    fake = pool.get(key)
+    if fake is None:
+        fake = pool[key] = Faker(locale) if locale else Faker()
+    if seed is not None:
+        fake.seed_instance(seed)
+    return fake
+
+
+def clear_faker_pool():
+    """Сброс экземпляров Faker текущего потока"""
+    _local.pool = {}
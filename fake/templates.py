@@ -0,0 +1,164 @@
+import string
+from functools import lru_cache
+import numpy as np
+from .batch import codes_to_strings, get_rng
+
+# Заглавные кириллические буквы серий документов
+DOC_LETTERS = "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЭЮЯ"
+# Серии свидетельств о рождении и трудовых книжек
+ROMAN_NUMERALS = ['II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
+
+# Однобуквенные классы символов (как в Faker.numerify/bothify); '' - пустой символ
+CHAR_CLASSES = {
+    '#': string.digits,
+    '%': string.digits[1:],
+    '!': [''] * 10 + list(string.digits),
+    '@': [''] * 9 + list(string.digits[1:]),
+    '?': string.ascii_letters,
+}
+SPECIAL_CHARS = set(CHAR_CLASSES) | set('[]{}|\\')
+
+
+def escape(text):
+    """Экранирование текста, чтобы он вошёл в шаблон как есть"""
+    return ''.join('\\' + char if char in SPECIAL_CHARS else char for char in text)
+
+
+def _char_set(body):
+    """Содержимое [...] -> список символов; поддерживаются диапазоны вида А-Я"""
+    chars = []
+    i = 0
+    while i < len(body):
+        if i + 2 < len(body) and body[i + 1] == '-':
+            chars.extend(chr(code) for code in range(ord(body[i]), ord(body[i + 2]) + 1))
+            i += 3
+        else:
+            chars.append(body[i])
+            i += 1
+    if not chars:
+        raise ValueError("Пустой класс символов []")
+    return chars
+
+
+def _parse(pattern):
+    """
+    Шаблон -> список элементов, каждый элемент - список вариантов строк:
+    у символа или класса это отдельные символы, у {a|b} - варианты целиком.
+    """
+    elements = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern):
+                raise ValueError("Шаблон заканчивается на '\\'")
+            elements.append([pattern[i + 1]])
+            i += 2
+        elif char in CHAR_CLASSES:
+            elements.append(list(CHAR_CLASSES[char]))
+            i += 1
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end < 0:
+                raise ValueError(f"Не закрыт класс символов в шаблоне: {pattern}")
+            elements.append(_char_set(pattern[i + 1:end]))
+            i = end + 1
+        elif char == '{':
+            end = pattern.find('}', i + 1)
+            if end < 0:
+                raise ValueError(f"Не закрыт список вариантов в шаблоне: {pattern}")
+            body = pattern[i + 1:end]
+            if body.isdigit():
+                # {n} - повтор предыдущего элемента n раз
+                if not elements:
+                    raise ValueError(f"Повтор {{{body}}} в начале шаблона: {pattern}")
+                elements.extend([elements[-1]] * (int(body) - 1))
+            else:
+                elements.append(body.split('|'))
+            i = end + 1
+        elif char in ']}|':
+            raise ValueError(f"Лишний символ '{char}' в шаблоне: {pattern}")
+        else:
+            elements.append([char])
+            i += 1
+    return elements
+
+
+class Template:
+    """
+    Шаблон строки, скомпилированный в таблицы кодов символов.
+
+    Синтаксис:
+      #  цифра 0-9            %  цифра 1-9
+      !  цифра или пусто      @  цифра 1-9 или пусто
+      ?  латинская буква      [АВЕ], [A-Z0-9]  символ из набора
+      {II|III|IV}  один из вариантов         {n}  повтор предыдущего элемента n раз
+      \\x  символ x как есть   остальные символы копируются как есть
+
+    generate(n) строит матрицу кодов (n, ширина) выборкой индексов NumPy
+    и возвращает массив из n строк.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.blocks = []  # (первый столбец, таблица вариантов (k, ширина))
+        self.variable = False
+
+        width = 0
+        for options in _parse(pattern):
+            size = max(len(option) for option in options)
+            table = np.zeros((len(options), size), dtype=np.uint32)
+            for row, option in enumerate(options):
+                table[row, :len(option)] = [ord(char) for char in option]
+            self.variable |= any(len(option) != size for option in options)
+            self.blocks.append((width, table))
+            width += size
+        self.width = width
+
+    def generate(self, n, seed=None):
+        """Массив из n строк по шаблону; seed - число или np.random.Generator"""
+        rng = get_rng(seed)
+        codes = np.empty((n, self.width), dtype=np.uint32)
+
+        for start, table in self.blocks:
+            size = table.shape[1]
+            if len(table) == 1:
+                codes[:, start:start + size] = table[0]
+            else:
+                codes[:, start:start + size] = table[rng.integers(0, len(table), n)]
+
+        if self.variable:
+            # Пустые позиции (коды 0) сдвигаются в конец строки
+            order = np.argsort(codes == 0, axis=1, kind='stable')
+            codes = np.take_along_axis(codes, order, axis=1)
+
+        return codes_to_strings(codes)
+
+    def one(self, seed=None):
+        """Одна строка по шаблону"""
+        return str(self.generate(1, seed)[0])
+
+
+@lru_cache(maxsize=256)
+def compile_template(pattern):
+    """Скомпилированный шаблон (компилируется один раз на процесс)"""
+    return Template(pattern)
+
+
+def generate_from_template(pattern, n, seed=None):
+    """n строк по шаблону pattern"""
+    return compile_template(pattern).generate(n, seed)
+
+
+def generate_from_templates(patterns, n, seed=None):
+    """n строк, у каждой строки шаблон выбирается случайно из patterns"""
+    rng = get_rng(seed)
+    choice = rng.integers(0, len(patterns), n)
+
+    width = max(compile_template(pattern).width for pattern in patterns)
+    result = np.empty(n, dtype=f'<U{max(width, 1)}')
+    for index, pattern in enumerate(patterns):
+        rows = np.flatnonzero(choice == index)
+        if len(rows):
+            result[rows] = compile_template(pattern).generate(len(rows), rng)
+    return result
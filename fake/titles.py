@@ -1,12 +1,13 @@
 from logging import raiseExceptions
 
-from faker import Faker
+from .pool import get_faker
+from .batch import get_rng
 import asyncio
 import string
 
 async def generate_login(local='ru_RU'):
     try:
-        fake = Faker(local)
+        fake = get_faker(local)
         login = fake.user_name()
         return login
     except Exception as e:
@@ -14,13 +15,13 @@ async def generate_login(local='ru_RU'):
 
 async def generate_legal_entity(local='ru_RU', opfs=None):
     try:
-        fake = Faker(local)
+        fake = get_faker(local)
         if opfs is None:
             company_name = fake.company()
             return company_name
         else:
             if isinstance(opfs, list):
-                company_name = f"{fake.random_element(opfs)} {fake.company().split(" ",1)[1]}"
+                company_name = f"{fake.random_element(opfs)} {fake.company().split(' ', 1)[1]}"
                 return company_name
             elif isinstance(opfs, str):
                 company_name = f"{opfs} '{fake.company()}'"
@@ -47,7 +48,7 @@ async def generate_address(mode='all', local='ru_RU'):
       'settlement' - населенный пункт (посёлок, деревня, село)
     """
     try:
-        fake = Faker(local)
+        fake = get_faker(local)
 
         if mode == 'all':
             return fake.address()
@@ -77,7 +78,7 @@ async def generate_address(mode='all', local='ru_RU'):
 
 async def generate_geografic_coordinates():
     try:
-        fake = Faker('ru_RU')
+        fake = get_faker('ru_RU')
         latitude = fake.latitude()
         longitude = fake.longitude()
         return latitude, longitude
@@ -86,7 +87,7 @@ async def generate_geografic_coordinates():
 
 async def generate_uri():
     try:
-        fake = Faker()
+        fake = get_faker()
         uri = fake.uri()
         return uri
     except Exception as e:
@@ -94,7 +95,7 @@ async def generate_uri():
 
 async def generate_ip(mode='v4'):
     try:
-        fake = Faker('ru_RU')
+        fake = get_faker('ru_RU')
         if mode == 'v4':
             ipv4 = fake.ipv4()
             return ipv4
@@ -107,6 +108,39 @@ async def generate_ip(mode='v4'):
         print(f"Произошла ошибка при генерации IP: {e}")
 
 
+def generate_login_batch(n, local='ru_RU', seed=None):
+    """Пакетный вариант generate_login: список из n логинов"""
+    fake = get_faker(local, seed)
+    return [fake.user_name() for _ in range(n)]
+
+
+def generate_address_batch(n, mode='all', local='ru_RU', seed=None):
+    """Пакетный вариант generate_address для режимов 'all', 'city', 'street' и 'postcode'"""
+    fake = get_faker(local, seed)
+    methods = {'all': fake.address, 'city': fake.city, 'street': fake.street_address, 'postcode': fake.postcode}
+    if mode not in methods:
+        raise ValueError(f"Неверный режим для пакетной генерации адреса: {mode}")
+    method = methods[mode]
+    return [method() for _ in range(n)]
+
+
+def generate_uri_batch(n, seed=None):
+    """Пакетный вариант generate_uri: список из n URI"""
+    fake = get_faker(None, seed)
+    return [fake.uri() for _ in range(n)]
+
+
+def generate_ip_batch(n, mode='v4', seed=None):
+    """Пакетный вариант generate_ip: октеты IPv4 выбираются матрицей NumPy, IPv6 - через Faker"""
+    if mode == 'v4':
+        octets = get_rng(seed).integers(1, 255, size=(n, 4))
+        return ['.'.join(map(str, row)) for row in octets.tolist()]
+    elif mode == 'v6':
+        fake = get_faker('ru_RU', seed)
+        return [fake.ipv6() for _ in range(n)]
+    raise ValueError("Неверный режим для генерации IP")
+
+
 # async def main():
 #     print(await generate_login())
 #     print(await generate_legal_entity())
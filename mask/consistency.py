@@ -1,50 +1,91 @@
 from fake import *
 import asyncio
+import numpy as np
 
-# Словарь генераторов, где каждый генератор - это функция
+NAME_TYPES = ("first_name", "last_name", "middle_name", "full_name")
+
+
+class FakeGenerator:
+    """
+    Генератор фейковых значений одного типа данных.
+
+    generate(n, **context) синхронно возвращает n значений (список или массив).
+    Контекст передаётся только тем генераторам, которые его понимают
+    (context_keys), например gender для имён - один пол или список по строкам.
+
+    Вызов generator(**context) оставлен для совместимости: возвращает корутину
+    с одним значением, как раньше возвращали асинхронные функции fake.
+    """
+
+    def __init__(self, generate, context_keys=()):
+        self._generate = generate
+        self.context_keys = set(context_keys) | {'seed'}
+
+    def generate(self, n, **context):
+        kwargs = {key: value for key, value in context.items() if key in self.context_keys}
+        return self._generate(n, **kwargs)
+
+    def generate_list(self, n, **context):
+        """generate(), приведённый к списку обычных значений Python"""
+        values = self.generate(n, **context)
+        return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+    async def __call__(self, **context):
+        return self.generate_list(1, **context)[0]
+
+
+def _names(mode):
+    return FakeGenerator(lambda n, gender=None, seed=None: generate_full_name_batch(n, mode=mode, gender=gender,
+                                                                                   seed=seed),
+                         context_keys=('gender',))
+
+
+# Словарь генераторов по типам данных
 consistency = {
-    "first_name": lambda gender=None: generate_full_name(mode="first_name", gender=gender),
-    "last_name": lambda gender=None: generate_full_name(mode="last_name", gender=gender),
-    "middle_name": lambda gender=None: generate_full_name(mode="middle_name", gender=gender),
-    "full_name": lambda gender=None: generate_full_name(mode="all", gender=gender),
-
-    "snils": lambda: generate_identifiers(mode="snils"),
-    "inn": lambda: generate_identifiers(mode="inn"),
-    "ogrn": lambda: generate_identifiers(mode="ogrn"),
-    "kpp": lambda: generate_identifiers(mode="kpp"),
-    "okpo": lambda: generate_identifiers(mode="okpo"),
-    "ogrnip": lambda: generate_identifiers(mode="ogrnip"),
-
-    "phone": lambda: generate_phone_number(),
-
-    "email": lambda: generate_email(),
-
-    "passport_number": lambda: generate_passport_number(),
-    "passport_series": lambda: generate_passport_series(),
-    "international_passport_number": lambda: generate_interpass_series_number(),
-    "military_ticket_num": lambda: generate_military_ticket_number(),
-    "sailor_ticket_num": lambda: generate_military_ticket_number(),
-    "birth_certificate_num": lambda: generate_birth_certificate_number(),
-    "work_book_num": lambda: generate_work_book_number(),
-    "vehicle_number": lambda: generate_car_license(),
-
-    "nr_credit_account": lambda: generate_credit_agreement_number(),
-    "nr_bank_contract": lambda: generate_bank_contract_number(),
-    "nr_dep_contract": lambda: generate_depository_contract_number(),
-    "card_number": lambda: generate_valid_card_number(),
-    "bank_account_number": lambda: generate_bank_account_number(),
-    "investor_code": lambda: generate_investor_code(),
-
-    "birth_date": lambda: generate_birth_date,
-
-    "login": lambda: generate_login(),
-    "address": lambda: generate_address(mode='all'),
-    "ip": lambda: generate_ip(),
-    "uri": lambda: generate_uri(),
+    "first_name": _names("first_name"),
+    "last_name": _names("last_name"),
+    "middle_name": _names("middle_name"),
+    "full_name": _names("all"),
+
+    "snils": FakeGenerator(lambda n, seed=None: generate_identifiers_batch("snils", n, seed=seed)),
+    "inn": FakeGenerator(lambda n, seed=None: generate_identifiers_batch("inn", n, seed=seed)),
+    "ogrn": FakeGenerator(lambda n, seed=None: generate_identifiers_batch("ogrn", n, seed=seed)),
+    "kpp": FakeGenerator(lambda n, seed=None: generate_identifiers_batch("kpp", n, seed=seed)),
+    "okpo": FakeGenerator(lambda n, seed=None: generate_identifiers_batch("okpo", n, seed=seed)),
+    "ogrnip": FakeGenerator(lambda n, seed=None: generate_identifiers_batch("ogrnip", n, seed=seed)),
+
+    "phone": FakeGenerator(lambda n, seed=None: generate_phone_number_batch(n, seed=seed)),
+
+    "email": FakeGenerator(lambda n, seed=None: generate_email_batch(n, seed=seed)),
+
+    "passport_number": FakeGenerator(lambda n, seed=None: generate_doc_number_batch("passport_number", n, seed)),
+    "passport_series": FakeGenerator(lambda n, seed=None: generate_doc_number_batch("passport_series", n, seed)),
+    "international_passport_number": FakeGenerator(
+        lambda n, seed=None: generate_doc_number_batch("international_passport_number", n, seed)),
+    "military_ticket_num": FakeGenerator(
+        lambda n, seed=None: generate_doc_number_batch("military_ticket_num", n, seed)),
+    "sailor_ticket_num": FakeGenerator(lambda n, seed=None: generate_doc_number_batch("military_ticket_num", n, seed)),
+    "birth_certificate_num": FakeGenerator(
+        lambda n, seed=None: generate_doc_number_batch("birth_certificate_num", n, seed)),
+    "work_book_num": FakeGenerator(lambda n, seed=None: generate_doc_number_batch("work_book_num", n, seed)),
+    "vehicle_number": FakeGenerator(lambda n, seed=None: generate_car_license_batch(n, seed=seed)),
+
+    "nr_credit_account": FakeGenerator(lambda n, seed=None: generate_credit_agreement_number_batch(n, seed=seed)),
+    "nr_bank_contract": FakeGenerator(lambda n, seed=None: generate_bank_contract_number_batch(n, seed=seed)),
+    "nr_dep_contract": FakeGenerator(lambda n, seed=None: generate_depository_contract_number_batch(n, seed=seed)),
+    "card_number": FakeGenerator(lambda n, seed=None: generate_card_number_batch(n, seed=seed)),
+    "bank_account_number": FakeGenerator(lambda n, seed=None: generate_bank_account_number_batch(n, seed=seed)),
+    "investor_code": FakeGenerator(lambda n, seed=None: generate_investor_code_batch(n, seed=seed)),
+
+    "birth_date": FakeGenerator(lambda n, seed=None: generate_birth_date_batch(n, seed=seed)),
+
+    "login": FakeGenerator(lambda n, seed=None: generate_login_batch(n, seed=seed)),
+    "address": FakeGenerator(lambda n, seed=None: generate_address_batch(n, mode='all', seed=seed)),
+    "ip": FakeGenerator(lambda n, seed=None: generate_ip_batch(n, seed=seed)),
+    "uri": FakeGenerator(lambda n, seed=None: generate_uri_batch(n, seed=seed)),
 
 }
 
 def get_generator(data_type):
-    print(data_type)
-    """Возвращает функцию-генератор для указанного типа данных"""
-    return consistency.get(data_type)
\ No newline at end of file
+    """Возвращает генератор (FakeGenerator) для указанного типа данных"""
+    return consistency.get(data_type)
@@ -1,28 +1,27 @@
-from mask.consistency import consistency
+from mask.consistency import NAME_TYPES, consistency
 import pandas as pd
 import asyncio
 import chardet
 from detect.detect_columns import column_detect
+from detect.gender import gender_label
 
 
-async def generate_fake_data(data_type, count, gender=None):
+def generate_fake_values(data_type, count, gender=None):
+    """
+    n фейковых значений типа data_type одним синхронным вызовом генератора.
+    gender - пол для имён: 'male'/'female' или список полов по строкам.
+    """
     generator = consistency.get(data_type)
     if generator is None:
         return [None] * count
 
-    results = []
-    for _ in range(count):
-        if gender is not None and data_type in ["first_name", "last_name", "middle_name", "full_name"]:
-            result = generator(gender=gender)
-        else:
-            result = generator()
+    context = {'gender': gender} if gender is not None and data_type in NAME_TYPES else {}
+    return generator.generate_list(count, **context)
 
-        if asyncio.iscoroutine(result):
-            results.append(result)
-        else:
-            results.append(asyncio.sleep(0, result))
 
-    return await asyncio.gather(*results)
+async def generate_fake_data(data_type, count, gender=None):
+    """Асинхронная обёртка generate_fake_values (для совместимости)"""
+    return generate_fake_values(data_type, count, gender)
 
 
 def detect_file_encoding(csv_path):
@@ -51,17 +50,13 @@ async def fake_confident_columns(csv_path, output_path="fake_data5.csv"):
         for col_type, col_idx, _ in confidential_columns:
             if col_type in consistency:
                 print(f"Обработка колонки {col_idx} ({col_type})...")
-                if col_type in ["first_name", "last_name", "middle_name", "full_name"]:
-                    # Генерируем данные с учетом гендера для каждой строки
-                    fake_data = []
-                    for row_idx in range(len(df)):
-                        gender = gender_rel.get(row_idx + 1)  # +1 потому что gender_rel использует 1-based индексы
-                        data = await generate_fake_data(col_type, 1, gender)
-                        fake_data.append(data[0])
-                    df.iloc[:, col_idx] = fake_data
+                if col_type in NAME_TYPES:
+                    # Пол для каждой строки (gender_rel выровнен по строкам df)
+                    genders = [gender_label(code) for code in gender_rel[:len(df)]]
+                    fake_data = generate_fake_values(col_type, len(df), genders)
                 else:
-                    fake_data = await generate_fake_data(col_type, len(df))
-                    df.iloc[:, col_idx] = fake_data
+                    fake_data = generate_fake_values(col_type, len(df))
+                df.iloc[:, col_idx] = fake_data
 
         df.to_csv(output_path, index=False, encoding='utf-8')
         print(f"Файл успешно сохранен: {output_path}")
@@ -7,29 +7,19 @@ import shutil
 import asyncio
 
 from mask import router
+from detect.artifacts import warm_up
+from detect.preload import preload_shared_state
 
 # Определяем путь к папке uploads относительно текущего файла
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 
-# Очищаем папку uploads ДО создания Flask-приложения
-if os.path.exists(UPLOAD_FOLDER):
-    shutil.rmtree(UPLOAD_FOLDER)
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-print(f"Папка {UPLOAD_FOLDER} успешно очищена.")
-
 # Создаем Flask-приложение
 app = Flask(__name__)
 app.secret_key = 'smart_masking'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 ALLOWED_EXTENSIONS = {'xlsx', 'csv'}
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-
-# Очищаем папку при старте приложения (работает и для `flask run`)
-if os.path.exists(UPLOAD_FOLDER):
-    shutil.rmtree(UPLOAD_FOLDER)
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-print(f"Папка {UPLOAD_FOLDER} успешно очищена.")
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -65,6 +55,31 @@ def clear_upload_folder():
 
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+
+def create_app():
+    """
+    Подготовка приложения к запуску: очистка uploads и загрузка модели.
+
+    Вызывается из точки запуска (python app.py, gunicorn "app:create_app()"),
+    а не при импорте модуля: процессы пула NLP (detect.nlp_pool, spawn)
+    импортируют главный модуль заново и не должны чистить uploads во время
+    запроса и загружать модель.
+    """
+    clear_upload_folder()
+
+    # Под gunicorn (serv/gunicorn.conf.py) create_app вызывается в главном процессе
+    # до fork: модель и словари загружаются там и делятся рабочими процессами.
+    if os.environ.get('MASKING_PREFORK'):
+        preload_shared_state()
+    else:
+        try:
+            warm_up()
+            print("Артефакты модели загружены.")
+        except Exception as e:
+            print(f"Не удалось предзагрузить артефакты модели: {e}")
+    return app
+
+
 @app.route('/files')
 def list_files():
     files = []
@@ -155,4 +170,4 @@ def download_file(filename):
     return send_from_directory(app.config['UPLOAD_FOLDER'], filename, as_attachment=True)
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
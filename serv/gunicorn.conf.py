@@ -0,0 +1,37 @@
+# Запуск с общими для рабочих процессов моделью и словарями:
+#   cd serv && gunicorn -c gunicorn.conf.py "app:create_app()"
+import gc
+import multiprocessing
+import os
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Пути артефактов (./detect/res/...) заданы от корня репозитория
+chdir = ROOT
+pythonpath = f"{ROOT},{os.path.join(ROOT, 'serv')}"
+
+bind = os.environ.get('MASKING_BIND', '0.0.0.0:5000')
+# По умолчанию не больше двух рабочих процессов: каждый обрабатывает файлы целиком
+# и держит их в памяти. Больше - явно через MASKING_WORKERS.
+workers = int(os.environ.get('MASKING_WORKERS', min(2, multiprocessing.cpu_count())))
+timeout = 600
+
+# Приложение создаётся (create_app) один раз в главном процессе, рабочие процессы получают
+# загруженные модель и словари через fork (copy-on-write)
+preload_app = True
+os.environ['MASKING_PREFORK'] = '1'
+
+
+def pre_fork(server, worker):
+    # Объекты, созданные после preload (например, при перезапуске рабочего процесса),
+    # тоже переносятся в постоянное поколение, чтобы сборщик мусора не трогал их страницы
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Рабочие процессы наследуют состояние генераторов главного процесса.
+    # Генератор Faker переинициализируется в fake/pool.py (os.register_at_fork),
+    # здесь - общий генератор NumPy (np.random.*), которым пользуется маскирование.
+    np.random.seed()
@@ -0,0 +1,92 @@
+import asyncio
+import datetime
+import re
+
+import pandas as pd
+import pytest
+
+from detect.checksum import luhn_mask
+from detect.valid import VALIDATION_RULES, validate_card_number, validate_investor_code
+from fake.bank import (BALANCE_ACCOUNTS, CURRENCY_CODE, generate_bank_account_number_batch, generate_bik_batch,
+                       generate_card_number_batch, generate_investor_code, generate_investor_code_batch,
+                       generate_valid_card_number, generate_bank_contract_number_batch,
+                       generate_credit_agreement_number_batch, generate_depository_contract_number_batch)
+
+N = 500
+# Веса контрольного ключа счёта по 3 последним цифрам БИК и 20 цифрам счёта
+KEY_WEIGHTS = [7, 1, 3] * 8
+
+
+def _vector_check(column_type, values):
+    """Доля значений, прошедших векторную проверку VALIDATION_RULES"""
+    return VALIDATION_RULES[column_type]['vector'](pd.Series(values, dtype=str)).mean()
+
+
+def test_investor_code_batch_passes_validation():
+    codes = generate_investor_code_batch(N, seed=1)
+    assert _vector_check('investor_code', codes) == 1.0
+    assert all(validate_investor_code(code) for code in codes)
+
+
+def test_investor_code_passes_validation():
+    assert validate_investor_code(generate_investor_code())
+
+
+@pytest.mark.parametrize('length', [13, 16, 19])
+def test_card_number_batch_passes_validation(length):
+    cards = generate_card_number_batch(N, length=length, seed=1)
+    assert _vector_check('card_number', cards) == 1.0
+    assert all(validate_card_number(card) for card in cards)
+
+
+@pytest.mark.parametrize('length', [13, 16, 19])
+def test_card_number_passes_validation(length):
+    assert validate_card_number(asyncio.run(generate_valid_card_number(length=length)))
+
+
+@pytest.mark.parametrize('length', [13, 16, 19])
+def test_card_number_batch_luhn(length):
+    cards = generate_card_number_batch(N, length=length, seed=2)
+    assert luhn_mask(pd.Series(cards, dtype=str)).all()
+
+
+def test_bik_batch_format():
+    biks = generate_bik_batch(N, seed=3)
+    assert all(re.fullmatch(r'04\d{7}', bik) for bik in biks)
+    assert all(50 <= int(bik[-3:]) <= 999 for bik in biks)
+
+
+def _account_key_ok(bik, account):
+    digits = [int(char) for char in bik[-3:] + account]
+    return sum(digit * weight % 10 for digit, weight in zip(digits, KEY_WEIGHTS)) % 10 == 0
+
+
+@pytest.mark.parametrize('agreement_type', ['ФЛ', 'ЮЛ'])
+def test_bank_account_control_key(agreement_type):
+    biks = generate_bik_batch(N, seed=4)
+    accounts = generate_bank_account_number_batch(N, agreement_type, bik=biks, seed=5)
+    for bik, account in zip(biks, accounts):
+        assert re.fullmatch(r'\d{20}', account)
+        assert account[:5] in BALANCE_ACCOUNTS[agreement_type]
+        assert account[5:8] == CURRENCY_CODE
+        assert _account_key_ok(bik, account)
+
+
+def test_bank_account_control_key_single_bik():
+    bik = str(generate_bik_batch(1, seed=6)[0])
+    accounts = generate_bank_account_number_batch(N, bik=bik, seed=7)
+    assert all(_account_key_ok(bik, account) for account in accounts)
+
+
+@pytest.mark.parametrize('generate, prefix', [
+    (generate_credit_agreement_number_batch, 'КД'),
+    (generate_bank_contract_number_batch, 'НБ'),
+    (generate_depository_contract_number_batch, 'НД'),
+])
+@pytest.mark.parametrize('agreement_type', ['ФЛ', 'ЮЛ'])
+def test_contract_number_batch_format(generate, prefix, agreement_type):
+    year = datetime.datetime.now().year
+    for number in generate(N, agreement_type, seed=8):
+        match = re.fullmatch(rf'{prefix}-(\d{{6}})-{agreement_type}-(\d{{4}})', number)
+        assert match
+        assert year - 5 <= int(match.group(2)) <= year